@@ -0,0 +1,154 @@
+"""
+Compiled single-position backtest loop (run_simple_backtest).
+
+The whole per-candle loop - crossover signal, spread, SL/TP levels,
+observer early exits and PnL - runs on the market's column arrays in one
+kernel. Only the resulting trades go back to Python for the tracker and
+the printout.
+
+This is the fused exit pass for backtests: every TradeObserver rule
+(core._fast.observer_step) and the close-based SL/TP checks are applied
+in one loop over the preloaded arrays, instead of one Python call per
+rule per candle.
+
+Columns may be float32 (MT5MarketData storage); every value is widened
+to float64 as it is read, so results match the float64 path.
+"""
+
+import numpy as np
+
+from utils._njit import njit
+from core._fast import (
+    observer_step, crossover_signal, stop_loss_take_profit,
+    EXIT_NONE, EXIT_SL, EXIT_TP, EXIT_END,
+    OBS_STATE_SIZE, OBS_ENTRY, OBS_HIGHEST, OBS_LOWEST, OBS_WIN_LEN, OBS_WIN_HEAD,
+    OBS_WIN_SUM,
+    CFG_MOMENTUM, CFG_STALL, CFG_MAX_DURATION, CFG_TRAIL_ACTIVATION, CFG_TRAIL_DISTANCE,
+)
+
+
+@njit(cache=True)
+def _run_loop(open_, high, low, close, ema200, start, end,
+              spread, pos_size, rr, thr, cfg):
+    """
+    Run the simple backtest over candles [start, end).
+
+    Same rules and order as the original per-candle loop: the observer
+    update, then close-based SL/TP (which take priority), then the observer
+    exit; a candle that closes a trade can open the next one.
+
+    Args:
+        open_, high, low, close, ema200: float32 or float64 candle arrays
+        start, end: Candle range
+        spread: Spread in pips (entry moves by spread / 100)
+        pos_size: Position size in lots
+        rr: Risk-reward ratio
+        thr: TradingStrategy.TOUCH_THRESHOLD
+        cfg: float64[CFG_SIZE] observer settings (backtest.batch.observer_cfg)
+
+    Returns:
+        Tuple of per-trade arrays (entry_idx, exit_idx, direction, entry_px,
+        stop_loss, take_profit, exit_px, exit_code, exit_pnl_pct, pnl). A
+        trade still open at end has exit_idx -1, EXIT_END and pnl 0.
+    """
+    cap = max(end - start, 0)
+    entry_idx = np.empty(cap, dtype=np.int64)
+    exit_idx = np.empty(cap, dtype=np.int64)
+    direction = np.empty(cap, dtype=np.int8)
+    entry_px = np.empty(cap, dtype=np.float64)
+    stop_loss = np.empty(cap, dtype=np.float64)
+    take_profit = np.empty(cap, dtype=np.float64)
+    exit_px = np.empty(cap, dtype=np.float64)
+    exit_code = np.empty(cap, dtype=np.int8)
+    exit_pnl_pct = np.empty(cap, dtype=np.float64)
+    pnl = np.empty(cap, dtype=np.float64)
+
+    state = np.zeros(OBS_STATE_SIZE)
+    window = np.zeros(int(cfg[CFG_STALL]))
+
+    n = 0
+    in_trade = False
+    sell = 0
+    entry = 0.0
+    sl = 0.0
+    tp = 0.0
+
+    for i in range(start, end):
+        price = float(close[i])
+        ema = float(ema200[i])
+
+        if in_trade:
+            code, pnl_pct = observer_step(
+                state, window, sell, float(open_[i]), float(high[i]), float(low[i]), price, ema,
+                cfg[CFG_MOMENTUM], cfg[CFG_MAX_DURATION],
+                cfg[CFG_TRAIL_ACTIVATION], cfg[CFG_TRAIL_DISTANCE]
+            )
+
+            if sell:
+                if price >= sl:
+                    code, out = EXIT_SL, sl
+                elif price <= tp:
+                    code, out = EXIT_TP, tp
+                else:
+                    out = price
+            else:
+                if price <= sl:
+                    code, out = EXIT_SL, sl
+                elif price >= tp:
+                    code, out = EXIT_TP, tp
+                else:
+                    out = price
+
+            if code != EXIT_NONE:
+                t = n - 1
+                exit_idx[t] = i
+                exit_code[t] = code
+                exit_px[t] = out
+                exit_pnl_pct[t] = pnl_pct
+                if sell:
+                    pnl[t] = (entry - out) * pos_size * 100
+                else:
+                    pnl[t] = (out - entry) * pos_size * 100
+                in_trade = False
+
+        if in_trade:
+            continue
+
+        signal = crossover_signal(price, ema, float(close[i - 1]), float(ema200[i - 1]), thr)
+        if signal == 0:
+            continue
+
+        sell = 1 if signal == -1 else 0
+        entry = price - spread / 100 if sell else price + spread / 100
+        sl, tp = stop_loss_take_profit(signal, entry, float(low[i - 1]), float(high[i - 1]), rr)
+
+        entry_idx[n] = i
+        direction[n] = signal
+        entry_px[n] = entry
+        stop_loss[n] = sl
+        take_profit[n] = tp
+        n += 1
+        in_trade = True
+
+        # TradeObserver.start_trade
+        state[:] = 0.0
+        state[OBS_ENTRY] = entry
+        state[OBS_HIGHEST] = entry
+        state[OBS_LOWEST] = entry
+        state[OBS_WIN_LEN] = 1
+        state[OBS_WIN_HEAD] = 1
+        state[OBS_WIN_SUM] = entry
+        window[:] = 0.0
+        window[0] = entry
+
+    if in_trade:
+        t = n - 1
+        exit_idx[t] = -1
+        exit_code[t] = EXIT_END
+        exit_px[t] = float(close[end - 1])
+        exit_pnl_pct[t] = 0.0
+        pnl[t] = 0.0
+
+    return (entry_idx[:n], exit_idx[:n], direction[:n], entry_px[:n],
+            stop_loss[:n], take_profit[:n], exit_px[:n], exit_code[:n],
+            exit_pnl_pct[:n], pnl[:n])
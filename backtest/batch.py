@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Batch backtest helpers - glue between the Python classes and the compiled
+kernels in core._fast.
+"""
+
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from core import _fast
+from core.observer import TradeObserver
+
+
+def observer_cfg(observer: TradeObserver) -> np.ndarray:
+    """
+    Pack a TradeObserver's settings into the cfg vector the kernels expect.
+
+    Returns:
+        float64[_fast.CFG_SIZE] array
+    """
+    cfg = np.empty(_fast.CFG_SIZE)
+    cfg[_fast.CFG_MOMENTUM] = observer.config['momentum_threshold']
+    cfg[_fast.CFG_STALL] = observer.config['stall_candles']
+    cfg[_fast.CFG_MAX_DURATION] = observer.config['max_trade_duration']
+    cfg[_fast.CFG_TRAIL_ACTIVATION] = observer.config['trailing_stop_activation']
+    cfg[_fast.CFG_TRAIL_DISTANCE] = observer.config['trailing_stop_distance']
+    return cfg
+
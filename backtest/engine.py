@@ -2,11 +2,14 @@ import time
 import MetaTrader5 as mt5
 from datetime import datetime
 from utils.status_writer import write_status
+from utils.tick_log import TickLogger
 
 
 # ================= CONFIG =================
 SYMBOL = "XAUUSD"
 EMA_PERIOD = 200
+_EMA200_MULT = 2.0 / (EMA_PERIOD + 1)  # smoothing factor, computed once
+_EMA200_DECAY = 1.0 - _EMA200_MULT
 TIMEFRAME_SLEEP = 0.1
 COOLDOWN_SECONDS = 60
 
@@ -26,6 +29,11 @@ prices = []
 
 # critical flag: confirms at least one tick after entry
 post_entry_tick_seen = False
+
+# per-tick status line, formatted and written off the tick loop
+tick_log = TickLogger(
+    lambda now, price, ema, state: f"{now} | PRICE={price:.2f} | EMA200={ema:.2f} | STATE={state}"
+)
 # ==========================================
 
 
@@ -45,10 +53,14 @@ def get_price():
 
 
 def calculate_ema(values, period):
-    k = 2 / (period + 1)
+    if period == EMA_PERIOD:
+        k, decay = _EMA200_MULT, _EMA200_DECAY
+    else:
+        k = 2 / (period + 1)
+        decay = 1 - k
     ema = values[0]
     for v in values[1:]:
-        ema = v * k + ema * (1 - k)
+        ema = v * k + ema * decay
     return ema
 
 
@@ -123,7 +135,7 @@ def main():
         ema = calculate_ema(prices[-EMA_PERIOD:], EMA_PERIOD)
         now = datetime.now().strftime("%Y.%m.%d %H:%M:%S")
 
-        print(f"{now} | PRICE={price:.2f} | EMA200={ema:.2f} | STATE={state}")
+        tick_log.log(now, price, ema, state)
 
         write_status(
     market=SYMBOL,
@@ -12,13 +12,21 @@ from core.strategy import TradingStrategy
 from core.risk_manager import RiskManager
 from core.observer import TradeObserver
 from core.tracker import TradeTracker
+from core._fast import NUMBA_AVAILABLE
 import pandas as pd
+import numpy as np
+import weakref
 from datetime import datetime
 
+# Entry signals depend only on the market data, so engines sharing one
+# MT5MarketData (parameter sweeps) compute them once. Values are
+# (ema array, signals); a recalculated EMA gives a new array and a miss
+_signal_cache = weakref.WeakKeyDictionary()
+
 class FixedBacktestEngine:
     """Backtest engine with fixed tracking"""
     
-    def __init__(self, config=None):
+    def __init__(self, config=None, log_file="logs/fixed_backtest.csv"):
         self.config = config or {
             'initial_balance': 10000.0,
             'risk_per_trade': 1.0,
@@ -31,9 +39,8 @@ class FixedBacktestEngine:
         }
         
         self.market = None
-        self.strategy = TradingStrategy()
-        self.risk_manager = RiskManager()
-        self.tracker = TradeTracker("logs/fixed_backtest.csv")
+        self.risk_manager = RiskManager(self.config['risk_reward_ratio'])
+        self.tracker = TradeTracker(log_file)
         
         # State
         self.balance = self.config['initial_balance']
@@ -41,14 +48,48 @@ class FixedBacktestEngine:
         self.observer = None
         self.trade_counter = 0
         
+        # Loop-invariant config values (hoisted out of the per-signal path)
+        self._cfg_spread_adj = self.config['spread'] / 100
+        self._cfg_position_size = self.config['position_size']
+        
     def load_data(self, data_path):
         """Load market data"""
         print(f"📂 Loading data from: {data_path}")
-        self.market = MT5MarketData(data_path)
-        if not self.market.load_data():
+        market = MT5MarketData(data_path)
+        if not market.load_data():
             return False
-        if not self.market.calculate_ema_mt5():
+        if not market.calculate_ema_mt5():
             return False
+        return self.load_market(market)
+    
+    def load_market(self, market):
+        """
+        Use already loaded market data (with EMA200) without re-reading it.
+        
+        Lets parameter sweeps share one MT5MarketData between engines; the
+        engine only reads from it.
+        """
+        self.market = market
+        
+        # Raw column arrays for the per-bar hot path (no Series lookups)
+        arr = self.market.as_arrays()
+        self._open_arr = arr['open']
+        self._high_arr = arr['high']
+        self._low_arr = arr['low']
+        self._close_arr = arr['close']
+        self._ema_arr = arr['ema_200']
+        # Entry signals for every candle in one pass (+1 BUY, -1 SELL, 0 HOLD)
+        cached = _signal_cache.get(market)
+        if cached is not None and cached[0] is self._ema_arr:
+            self._signals = cached[1]
+        else:
+            self._signals = TradingStrategy.signals_from_arrays(
+                self._close_arr, self._ema_arr, market._ema_up, market._ema_dn
+            )
+            _signal_cache[market] = (self._ema_arr, self._signals)
+        # Body/range metrics for the observer's strong-candle check
+        self._candle_metrics = self.market.precompute_candle_metrics()
+        
         print(f"✅ Loaded {self.market.get_candle_count()} candles")
         return True
     
@@ -66,36 +107,50 @@ class FixedBacktestEngine:
         print(f"   Initial balance: ${self.balance:.2f}")
         print("-" * 60)
         
+        close_arr = self._close_arr
+        ema_arr = self._ema_arr
+        signals = self._signals
+        open_arr = self._open_arr
+        high_arr = self._high_arr
+        low_arr = self._low_arr
+        # Compiled observer path only pays off when numba is present
+        use_jit = NUMBA_AVAILABLE
+        
         for i in range(start_idx, end_idx):
-            current = self.market.get_candle(i)
-            previous = self.market.get_candle(i-1)
-            
             # Manage open trade
             if self.open_trade:
+                price = close_arr[i]
+                timestamp = self.market.get_timestamp(i)
+                
                 # Update tracker with current price (THIS WAS MISSING!)
-                self.tracker.update_trade(current['close'], current['timestamp'])
+                self.tracker.update_trade(price, timestamp)
                 
                 # Get observer recommendation
-                ema_value = current.get('ema_200')
-                observer_exit = self.observer.update(current, ema_value)
+                ema_value = ema_arr[i]
+                if use_jit:
+                    observer_exit = self.observer.update_arrays(
+                        open_arr[i], high_arr[i], low_arr[i], price, ema_value
+                    )
+                else:
+                    observer_exit = self.observer.update(self.market.get_candle(i), ema_value, i)
                 
                 # Check exit conditions
                 exit_reason = None
-                exit_price = current['close']  # Default to current price
+                exit_price = price  # Default to current price
                 
                 # Check SL/TP
                 if self.open_trade['direction'] == 'BUY':
-                    if current['close'] <= self.open_trade['sl']:
+                    if price <= self.open_trade['sl']:
                         exit_reason = "SL hit"
                         exit_price = self.open_trade['sl']
-                    elif current['close'] >= self.open_trade['tp']:
+                    elif price >= self.open_trade['tp']:
                         exit_reason = "TP hit"
                         exit_price = self.open_trade['tp']
                 else:  # SELL
-                    if current['close'] >= self.open_trade['sl']:
+                    if price >= self.open_trade['sl']:
                         exit_reason = "SL hit"
                         exit_price = self.open_trade['sl']
-                    elif current['close'] <= self.open_trade['tp']:
+                    elif price <= self.open_trade['tp']:
                         exit_reason = "TP hit"
                         exit_price = self.open_trade['tp']
                 
@@ -106,48 +161,43 @@ class FixedBacktestEngine:
                 
                 # Close trade if needed
                 if exit_reason:
-                    self._close_trade(exit_price, exit_reason, current['timestamp'])
+                    self._close_trade(exit_price, exit_reason, timestamp)
             
-            # Check for new entry (if no open trade)
-            if not self.open_trade:
-                signal = self.strategy.get_signal(current, previous)
-                
-                if signal != 'HOLD':
-                    self._enter_trade(signal, current, previous)
+            # Check for new entry (if no open trade) - signals[i] is the
+            # vectorized get_signal result for this candle
+            if not self.open_trade and signals[i]:
+                self._enter_trade('BUY' if signals[i] == 1 else 'SELL', i)
     
-    def _enter_trade(self, signal, current_candle, previous_candle):
-        """Enter a new trade"""
+    def _enter_trade(self, signal, i):
+        """Enter a new trade on candle i"""
         self.trade_counter += 1
         trade_id = f"T{self.trade_counter:03d}"
+        entry_time = self.market.get_timestamp(i)
         
-        # Calculate entry with spread
-        entry_price = current_candle['close']
+        # Entry with spread, then SL/TP (direction-specialized, RR fixed at init)
+        entry_price = float(self._close_arr[i])
         if signal == 'BUY':
-            entry_price += self.config['spread'] / 100
+            entry_price += self._cfg_spread_adj
+            sl, tp = self.risk_manager.sl_tp_buy(entry_price, float(self._low_arr[i-1]))
         else:
-            entry_price -= self.config['spread'] / 100
-        
-        # Calculate SL/TP
-        sl = self.risk_manager.calculate_stop_loss(signal, entry_price, previous_candle)
-        tp = self.risk_manager.calculate_take_profit(
-            signal, entry_price, sl, 
-            risk_reward=self.config['risk_reward_ratio']
-        )
+            entry_price -= self._cfg_spread_adj
+            sl, tp = self.risk_manager.sl_tp_sell(entry_price, float(self._high_arr[i-1]))
         
         # Create open trade record
         self.open_trade = {
             'id': trade_id,
             'direction': signal,
             'entry_price': entry_price,
-            'entry_time': current_candle['timestamp'],
+            'entry_time': entry_time,
             'sl': sl,
             'tp': tp,
-            'position_size': self.config['position_size']
+            'position_size': self._cfg_position_size
         }
         
         # Start observer
         self.observer = TradeObserver()
-        self.observer.start_trade(signal, entry_price, current_candle['timestamp'])
+        self.observer.candle_metrics = self._candle_metrics
+        self.observer.start_trade(signal, entry_price, entry_time)
         
         # Start tracker
         self.tracker.start_trade(
@@ -156,8 +206,8 @@ class FixedBacktestEngine:
             entry_price=entry_price,
             stop_loss=sl,
             take_profit=tp,
-            position_size=self.config['position_size'],
-            entry_time=current_candle['timestamp']
+            position_size=self._cfg_position_size,
+            entry_time=entry_time
         )
         
         print(f"\n🎯 {signal} #{trade_id} at {entry_price:.2f}")
@@ -228,7 +278,9 @@ class FixedBacktestEngine:
     def _analyze_exit_reasons(self):
         """Analyze exit reasons from trade log"""
         try:
-            log_file = "logs/fixed_backtest.csv"
+            # Make sure buffered trades are on disk before reading the log
+            self.tracker.flush()
+            log_file = self.tracker.log_file
             if os.path.exists(log_file):
                 df = pd.read_csv(log_file)
                 if not df.empty and 'exit_reason' in df.columns:
@@ -1,12 +1,20 @@
 import time
 import MetaTrader5 as mt5
+import numpy as np
 from datetime import datetime
 
+try:
+    from scipy.signal import lfilter
+except ImportError:  # scipy is optional - fall back to the Python recurrence
+    lfilter = None
+
 # ================= CONFIG =================
 SYMBOL = "XAUUSD"
 TIMEFRAME = mt5.TIMEFRAME_M1
 
 EMA_PERIOD = 200
+_EMA200_MULT = 2.0 / (EMA_PERIOD + 1)  # smoothing factor, computed once
+_EMA200_DECAY = 1.0 - _EMA200_MULT
 ATR_PERIOD = 14
 
 SLEEP_TIME = 0.2
@@ -64,13 +72,33 @@ def get_positions():
 
 
 def calculate_ema(values, period):
-    k = 2 / (period + 1)
+    if period == EMA_PERIOD:
+        k, decay = _EMA200_MULT, _EMA200_DECAY
+    else:
+        k = 2 / (period + 1)
+        decay = 1 - k
+    if lfilter is not None:
+        # Whole recurrence ema = v*k + ema*(1-k) in one C pass; zi seeds
+        # the filter so the first output equals values[0]
+        x = np.asarray(values, dtype=np.float64)
+        ema, _ = lfilter([k], [1.0, -decay], x, zi=[decay * x[0]])
+        return float(ema[-1])
+
     ema = values[0]
     for v in values[1:]:
-        ema = v * k + ema * (1 - k)
+        ema = v * k + ema * decay
     return ema
 
 
+def to_cents(price):
+    # XAUUSD quotes in cents; SL/TP are compared and sent on that grid
+    return int(price * 100 + 0.5)
+
+
+def from_cents(cents):
+    return cents / 100.0
+
+
 def send_order(order_type):
     tick = mt5.symbol_info_tick(SYMBOL)
     price = tick.ask if order_type == mt5.ORDER_TYPE_BUY else tick.bid
@@ -96,11 +124,12 @@ def send_order(order_type):
     return True
 
 
-def modify_sl(position, new_sl):
+def modify_sl(position, new_sl_cents):
+    new_sl = from_cents(new_sl_cents)
     request = {
         "action": mt5.TRADE_ACTION_SLTP,
         "position": position.ticket,
-        "sl": round(new_sl, 2),
+        "sl": new_sl,
     }
 
     result = mt5.order_send(request)
@@ -113,14 +142,14 @@ def trail_stop_loss(position, atr):
 
     if position.type == mt5.ORDER_TYPE_BUY:
         price = tick.bid
-        new_sl = price - atr * TRAIL_ATR_MULTIPLIER
-        if position.sl == 0 or new_sl > position.sl:
+        new_sl = to_cents(price - atr * TRAIL_ATR_MULTIPLIER)
+        if position.sl == 0 or new_sl > to_cents(position.sl):
             modify_sl(position, new_sl)
 
     elif position.type == mt5.ORDER_TYPE_SELL:
         price = tick.ask
-        new_sl = price + atr * TRAIL_ATR_MULTIPLIER
-        if position.sl == 0 or new_sl < position.sl:
+        new_sl = to_cents(price + atr * TRAIL_ATR_MULTIPLIER)
+        if position.sl == 0 or new_sl < to_cents(position.sl):
             modify_sl(position, new_sl)
 # =========================================
 
@@ -143,7 +172,7 @@ while True:
         continue
     last_candle_time = last_closed["time"]
 
-    closes = [r["close"] for r in rates]
+    closes = rates["close"]
     ema = calculate_ema(closes[-EMA_PERIOD:], EMA_PERIOD)
 
     atr_values = [
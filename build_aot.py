@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Build nur_fast, an ahead-of-time compiled copy of the scalar hot-path kernels.
+
+Short-running scripts (validate_phase1.py, the live engines) otherwise pay
+numba's JIT compile on first call. Importing the prebuilt extension skips
+LLVM entirely; callers fall back to core._fast when it is not built.
+
+Usage: python build_aot.py   (needs numba and a C compiler)
+"""
+
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from numba.pycc import CC
+
+from core import _fast
+
+cc = CC('nur_fast')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Same source as the JIT kernels (py_func is the undecorated function)
+cc.export('ema_step_and_signal', 'Tuple((f8, i8))(f8, f8, f8, f8, f8)')(_fast.ema_step_and_signal.py_func)
+cc.export('simulate_signals', 'Tuple((i8[:], i1[:], f8[:]))(f8[:], i8[:], i8[:], f8[:], f8[:], i8)')(
+    _fast.simulate_signals.py_func)
+
+if __name__ == "__main__":
+    print("🔧 Compiling nur_fast...")
+    cc.compile()
+    print(f"✅ Built nur_fast in {cc.output_dir}")
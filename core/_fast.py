@@ -0,0 +1,397 @@
+"""
+Compiled numeric kernels for Nur's hot paths.
+
+Kernels are decorated through utils._njit, so they are JIT-compiled when
+numba is installed and fall back to plain Python otherwise. Callers should
+check NUMBA_AVAILABLE before preferring a kernel over a vectorized NumPy
+path.
+"""
+
+import numpy as np
+
+from utils._njit import njit, prange, NUMBA_AVAILABLE
+
+
+@njit(cache=True)
+def ema_mt5(close, period, alpha):
+    """
+    MT5-style EMA: SMA seed at period-1, then the alpha recursion.
+
+    Args:
+        close: float64 array of closes
+        period: EMA period
+        alpha: Smoothing factor, 2 / (period + 1)
+
+    Returns:
+        float64 array, NaN before the seed candle
+    """
+    n = close.shape[0]
+    out = np.empty_like(close)
+    out[:period - 1] = np.nan
+    out[period - 1] = close[:period].mean()
+    one_minus_alpha = 1.0 - alpha
+    for i in range(period, n):
+        out[i] = close[i] * alpha + out[i - 1] * one_minus_alpha
+    return out
+
+
+@njit(cache=True)
+def clamped_walk(growth, start_price, low, high):
+    """
+    Compound a random walk, clamping the price into [low, high] every step.
+
+    The walk continues from the bound, so it can drift back into the band
+    (a clip after np.cumprod would leave it pinned there).
+
+    Args:
+        growth: float64 array of per-step multipliers (1 + change)
+        start_price: Price before the first step
+        low, high: Price band
+
+    Returns:
+        float64 array of prices, one per step
+    """
+    n = growth.shape[0]
+    out = np.empty(n)
+    price = start_price
+    for i in range(n):
+        price *= growth[i]
+        if price < low:
+            price = low
+        elif price > high:
+            price = high
+        out[i] = price
+    return out
+
+
+@njit(cache=True)
+def ema_step_and_signal(prev_close, prev_ema, close, ema_prev, alpha):
+    """
+    One candle-close EMA update plus the EMA cross check.
+
+    Args:
+        prev_close: Previous candle close (NaN if none yet)
+        prev_ema: EMA at the previous candle (NaN if none yet)
+        close: Closed candle's close
+        ema_prev: EMA before this candle
+        alpha: Smoothing factor, 2 / (period + 1)
+
+    Returns:
+        Tuple of (new EMA, signal) where signal is 1 for a cross above,
+        -1 for a cross below, 0 otherwise
+    """
+    ema = alpha * close + (1 - alpha) * ema_prev
+    # Branchless: side of the EMA now and one candle ago (+1 above, -1
+    # below, 0 on it); a cross is a non-zero side that differs from the
+    # previous one (NaN previous values compare False and never signal)
+    side = int(close > ema) - int(close < ema)
+    prev_side = int(prev_close > prev_ema) - int(prev_close < prev_ema)
+    return ema, side * int(side != prev_side) * int(prev_close == prev_close)
+
+
+@njit(cache=True)
+def crossover_signal(close, ema, prev_close, prev_ema, thr):
+    """
+    TradingStrategy.get_signal on scalars, for use inside kernels.
+
+    Returns:
+        +1 = BUY, -1 = SELL, 0 = HOLD (a NaN EMA never signals)
+    """
+    if close > ema and prev_close <= prev_ema + thr:
+        return 1
+    if close < ema and prev_close >= prev_ema - thr:
+        return -1
+    return 0
+
+
+# Stop-loss rule constants, shared with RiskManager
+SL_BUFFER = 0.05  # 0.5 pips for XAUUSD
+MAX_SL_FRACTION = 0.01  # Max 1% risk
+
+
+@njit(cache=True)
+def stop_loss_take_profit(direction, entry, prev_low, prev_high, risk_reward):
+    """
+    RiskManager.sl_tp_buy / sl_tp_sell on scalars, for use inside kernels.
+
+    Args:
+        direction: +1 (BUY) / -1 (SELL)
+        entry: Entry price (spread included)
+        prev_low, prev_high: Previous candle's low and high
+        risk_reward: Risk-reward ratio
+
+    Returns:
+        Tuple of (stop_loss, take_profit)
+    """
+    max_sl_distance = entry * MAX_SL_FRACTION
+    if direction == 1:
+        sl = prev_low - SL_BUFFER
+        if entry - sl > max_sl_distance:
+            sl = entry - max_sl_distance
+        return sl, entry + ((entry - sl) * risk_reward)
+    sl = prev_high + SL_BUFFER
+    if sl - entry > max_sl_distance:
+        sl = entry + max_sl_distance
+    return sl, entry - ((sl - entry) * risk_reward)
+
+
+@njit(parallel=True, cache=True)
+def collect_signals(close, ema, thr):
+    """
+    EMA200 crossover signal per candle (TradingStrategy rules).
+
+    Each candle only reads itself and the previous candle, so the loop
+    is split across cores with prange.
+
+    Args:
+        close: float64 array of closes
+        ema: float64 array of EMA values (NaN never signals)
+        thr: Touch threshold added/subtracted from the previous EMA
+
+    Returns:
+        int8 array: +1 = BUY, -1 = SELL, 0 = HOLD (first candle is 0)
+    """
+    n = close.shape[0]
+    out = np.zeros(n, dtype=np.int8)
+    for i in prange(1, n):
+        out[i] = crossover_signal(close[i], ema[i], close[i - 1], ema[i - 1], thr)
+    return out
+
+
+@njit(cache=True)
+def find_exit(close, stop_loss, take_profit, start, stop, is_buy):
+    """
+    First candle in close[start:stop] whose close hits SL or TP.
+
+    Args:
+        close: float64 array of closes
+        stop_loss: Stop loss price
+        take_profit: Take profit price
+        start: First index to check
+        stop: One past the last index to check
+        is_buy: 1 for BUY, 0 for SELL
+
+    Returns:
+        Index of the exit candle, or -1 if neither level is hit
+    """
+    for j in range(start, stop):
+        price = close[j]
+        if is_buy:
+            if price <= stop_loss or price >= take_profit:
+                return j
+        else:
+            if price >= stop_loss or price <= take_profit:
+                return j
+    return -1
+
+
+# Observer exit codes returned by observer_step (mapped to strings in
+# core.observer)
+EXIT_NONE = 0
+EXIT_EMA_CROSSBACK = 1
+EXIT_STRONG_OPPOSITE = 2
+EXIT_STALL = 3
+EXIT_MAX_DURATION = 4
+EXIT_TRAILING = 5
+
+# Layout of the observer state vector
+OBS_ENTRY = 0
+OBS_HIGHEST = 1
+OBS_LOWEST = 2
+OBS_MAX_PROFIT = 3
+OBS_MAX_LOSS = 4
+OBS_CANDLES = 5
+OBS_WIN_LEN = 6
+OBS_WIN_HEAD = 7
+OBS_WIN_SUM = 8
+OBS_STATE_SIZE = 9
+
+
+@njit(cache=True)
+def observer_step(state, window, is_sell, open_, high, low, close, ema,
+                  momentum_threshold, max_duration,
+                  trail_activation, trail_distance):
+    """
+    One TradeObserver.update on numeric state, all exit checks fused.
+
+    Evaluates the same conditions in the same order as TradeObserver.update.
+    No fastmath here: the stall window's running sum must update in the
+    same order as TradeObserver._push_price so results match exactly.
+
+    Args:
+        state: float64[OBS_STATE_SIZE] state vector (updated in place)
+        window: float64 ring buffer of the last stall_candles closes
+        is_sell: 0 for BUY, 1 for SELL
+        open_, high, low, close: Current candle
+        ema: Current EMA (NaN disables the crossback check)
+        momentum_threshold: Body size threshold as a fraction of entry
+        max_duration: Max candles in trade
+        trail_activation: Profit fraction that arms the trailing stop
+        trail_distance: Trailing distance as a fraction of the extreme
+
+    Returns:
+        Tuple of (exit code, current pnl %)
+    """
+    entry = state[OBS_ENTRY]
+    state[OBS_CANDLES] += 1.0
+
+    if high > state[OBS_HIGHEST]:
+        state[OBS_HIGHEST] = high
+    if low < state[OBS_LOWEST]:
+        state[OBS_LOWEST] = low
+
+    if is_sell:
+        pnl_pct = (entry - close) / entry * 100
+    else:
+        pnl_pct = (close - entry) / entry * 100
+
+    if pnl_pct > state[OBS_MAX_PROFIT]:
+        state[OBS_MAX_PROFIT] = pnl_pct
+    if pnl_pct < state[OBS_MAX_LOSS]:
+        state[OBS_MAX_LOSS] = pnl_pct
+
+    # 1. EMA crossback
+    if is_sell:
+        if close > ema:
+            return EXIT_EMA_CROSSBACK, pnl_pct
+    elif close < ema:
+        return EXIT_EMA_CROSSBACK, pnl_pct
+
+    # 2. Strong opposite momentum candle
+    candle_range = high - low
+    if candle_range != 0:
+        body_size = abs(close - open_)
+        if body_size / candle_range >= 0.7 and body_size > entry * momentum_threshold:
+            if is_sell:
+                if close > open_:
+                    return EXIT_STRONG_OPPOSITE, pnl_pct
+            elif close < open_:
+                return EXIT_STRONG_OPPOSITE, pnl_pct
+
+    # 3. Price stall over the window (excludes the current close)
+    size = window.shape[0]
+    win_len = int(state[OBS_WIN_LEN])
+    if win_len >= size:
+        head = int(state[OBS_WIN_HEAD])
+        hi = -np.inf
+        lo = np.inf
+        for k in range(win_len):
+            v = window[(head - win_len + k) % size]
+            if v > hi:
+                hi = v
+            if v < lo:
+                lo = v
+        avg_price = state[OBS_WIN_SUM] / win_len
+        if avg_price != 0 and hi - lo < avg_price * 0.001:
+            return EXIT_STALL, pnl_pct
+
+    # 4. Time-based exit
+    if state[OBS_CANDLES] >= max_duration:
+        return EXIT_MAX_DURATION, pnl_pct
+
+    # 5. Trailing stop
+    if abs(pnl_pct) >= trail_activation * 100:
+        if is_sell:
+            if close >= state[OBS_LOWEST] * (1 + trail_distance):
+                return EXIT_TRAILING, pnl_pct
+        elif close <= state[OBS_HIGHEST] * (1 - trail_distance):
+            return EXIT_TRAILING, pnl_pct
+
+    # No exit: push the close into the stall window (dropping the oldest)
+    head = int(state[OBS_WIN_HEAD])
+    if win_len == size:
+        state[OBS_WIN_SUM] -= window[head % size]
+    state[OBS_WIN_SUM] += close
+    window[head % size] = close
+    state[OBS_WIN_HEAD] = (head + 1) % size
+    if win_len < size:
+        state[OBS_WIN_LEN] = win_len + 1
+
+    return EXIT_NONE, pnl_pct
+
+
+# Extra exit codes for the backtest loop (after the observer codes)
+EXIT_SL = 6
+EXIT_TP = 7
+EXIT_END = 8
+# Observer exit whose specific rule is not known (parsed from a reason string)
+EXIT_EARLY = 9
+
+
+@njit(cache=True)
+def terminal_reward(direction, entry, current, reason_code):
+    """
+    Learner reward for a closed trade.
+
+    Args:
+        direction: +1 (BUY) / -1 (SELL)
+        entry: Entry price
+        current: Exit price
+        reason_code: EXIT_TP, EXIT_SL, an observer code or EXIT_EARLY
+
+    Returns:
+        1.0 for TP, -1.0 for SL, -0.2 / 0.5 for a losing / winning early
+        exit, 0.0 otherwise
+    """
+    if reason_code == EXIT_TP:
+        return 1.0
+    if reason_code == EXIT_SL:
+        return -1.0
+    if reason_code == EXIT_EARLY or (EXIT_NONE < reason_code <= EXIT_TRAILING):
+        if (current - entry) * direction < 0.0:
+            return -0.2  # Small penalty for early exit loss
+        return 0.5  # Reward for taking profit early
+    return 0.0
+
+
+@njit(cache=True)
+def simulate_signals(close, sig_idx, sig_dir, stop_loss, take_profit, max_hold):
+    """
+    Close-based SL/TP resolution for a batch of signals.
+
+    Each trade is scanned for at most max_hold - 1 candles after entry
+    (same window as validate_phase1). SL wins when both levels are
+    crossed on the exit candle.
+
+    Args:
+        close: float64 array of closes
+        sig_idx: int64 entry candle per trade
+        sig_dir: int64 +1 (BUY) / -1 (SELL) per trade
+        stop_loss: float64 stop loss per trade
+        take_profit: float64 take profit per trade
+        max_hold: Look-ahead window in candles
+
+    Returns:
+        (exit index or -1, EXIT_SL / EXIT_TP / EXIT_NONE code, exit price)
+    """
+    n = close.shape[0]
+    m = sig_idx.shape[0]
+    exit_idx = np.full(m, -1, dtype=np.int64)
+    codes = np.zeros(m, dtype=np.int8)
+    exit_price = np.full(m, np.nan)
+
+    for k in range(m):
+        i = sig_idx[k]
+        is_buy = 1 if sig_dir[k] == 1 else 0
+        j = find_exit(close, stop_loss[k], take_profit[k], i + 1, min(i + max_hold, n), is_buy)
+        if j < 0:
+            continue
+
+        exit_idx[k] = j
+        if (close[j] <= stop_loss[k]) if is_buy else (close[j] >= stop_loss[k]):
+            codes[k] = EXIT_SL
+            exit_price[k] = stop_loss[k]
+        else:
+            codes[k] = EXIT_TP
+            exit_price[k] = take_profit[k]
+
+    return exit_idx, codes, exit_price
+
+
+# Layout of the observer cfg vector (backtest.batch.observer_cfg)
+CFG_MOMENTUM = 0
+CFG_STALL = 1
+CFG_MAX_DURATION = 2
+CFG_TRAIL_ACTIVATION = 3
+CFG_TRAIL_DISTANCE = 4
+CFG_SIZE = 5
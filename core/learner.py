@@ -9,9 +9,17 @@ import numpy as np
 import pandas as pd
 import json
 import os
-from collections import defaultdict
+import weakref
 import pickle
 
+# Delta log lines before append_delta folds them back into the pickle
+COMPACT_EVERY = 5000
+
+
+def deltas_path(filename):
+    """Delta log that sits next to a learning state pickle."""
+    return os.path.splitext(filename)[0] + ".deltas.jsonl"
+
 class NurLearner:
     """
     Lightweight Q-learning for trading decisions.
@@ -28,7 +36,7 @@ class NurLearner:
     - Reward: Based on trade outcome (+1 for TP, -1 for SL, -0.2 for early exit loss)
     """
     
-    def __init__(self, config=None):
+    def __init__(self, config=None, state_file="nur_learning_state.pkl"):
         self.config = config or {
             'learning_rate': 0.1,      # Alpha - how quickly to learn
             'discount_factor': 0.9,    # Gamma - importance of future rewards
@@ -44,10 +52,16 @@ class NurLearner:
             # Memory limits (for 4GB RAM)
             'max_states': 1000,        # Maximum unique states to remember
             'max_memory': 10000,       # Maximum experiences to store
+            
+            # Q-values as int8 with a per-state scale (large state spaces)
+            'quantize_q': False,
         }
         
-        # Q-table: state -> action -> value
-        self.q_table = defaultdict(lambda: defaultdict(float))
+        # Q-table: Q[state_id, action_id], ids interned on first sight.
+        # _seen marks entries that exist (read or written), so "known
+        # actions for a state" keeps its dict-of-dicts meaning.
+        self._quantized = bool(self.config.get('quantize_q', False))
+        self._reset_q_table()
         
         # Experience memory for batch learning
         self.memory = []
@@ -63,9 +77,114 @@ class NurLearner:
             'negative_rewards': 0,
         }
         
+        # Q-value changes since the last compaction go to an append-only log
+        self.state_file = state_file
+        self._delta_fd = None
+        self._delta_lines = 0
+        
         # Load previous learning if exists
         self.load()
     
+    # =========================
+    # Q-TABLE STORAGE
+    # =========================
+    def _reset_q_table(self):
+        self.state_ids = {}
+        self.action_ids = {}
+        # Quantized mode: Q holds int8 codes, the value is Q[s, a] * scales[s]
+        self.Q = np.zeros((64, 8), dtype=np.int8 if self._quantized else np.float32)
+        self.scales = np.zeros(64, dtype=np.float32)
+        self._seen = np.zeros((64, 8), dtype=bool)
+    
+    def _grow(self, rows, cols):
+        """Double Q/_seen capacity until (rows, cols) fits"""
+        r, c = self.Q.shape
+        if rows <= r and cols <= c:
+            return
+        while r < rows:
+            r *= 2
+        while c < cols:
+            c *= 2
+        Q = np.zeros((r, c), dtype=self.Q.dtype)
+        seen = np.zeros((r, c), dtype=bool)
+        scales = np.zeros(r, dtype=np.float32)
+        Q[:self.Q.shape[0], :self.Q.shape[1]] = self.Q
+        seen[:self.Q.shape[0], :self.Q.shape[1]] = self._seen
+        scales[:len(self.scales)] = self.scales
+        self.Q, self._seen, self.scales = Q, seen, scales
+    
+    def _row(self, sid):
+        """Q-values of one state as float32"""
+        if self._quantized:
+            return self.Q[sid].astype(np.float32) * self.scales[sid]
+        return self.Q[sid]
+    
+    def _get_q(self, sid, aid):
+        if self._quantized:
+            return float(self.Q[sid, aid]) * float(self.scales[sid])
+        return float(self.Q[sid, aid])
+    
+    def _put_q(self, sid, aid, value):
+        if self._quantized:
+            # Requantize the touched row so its largest |Q| maps to 127
+            row = self._row(sid)
+            row[aid] = value
+            scale = np.abs(row).max() / 127.0
+            self.scales[sid] = scale
+            self.Q[sid] = np.round(row / scale) if scale > 0 else 0
+        else:
+            self.Q[sid, aid] = value
+        self._seen[sid, aid] = True
+    
+    def _state_id(self, state):
+        sid = self.state_ids.setdefault(state, len(self.state_ids))
+        if sid >= self.Q.shape[0]:
+            self._grow(sid + 1, self.Q.shape[1])
+        return sid
+    
+    def _action_id(self, action):
+        aid = self.action_ids.setdefault(action, len(self.action_ids))
+        if aid >= self.Q.shape[1]:
+            self._grow(self.Q.shape[0], aid + 1)
+        return aid
+    
+    def _set_q(self, state, action, value):
+        self._put_q(self._state_id(state), self._action_id(action), value)
+    
+    def _max_q(self, state):
+        """Best known Q-value for a state (0 if the state has none)"""
+        sid = self.state_ids.get(state)
+        if sid is None:
+            return 0
+        n = len(self.action_ids)
+        seen = self._seen[sid, :n]
+        return float(self._row(sid)[:n][seen].max()) if seen.any() else 0
+    
+    def _action_values(self, state):
+        """Known {action: Q} for a state, in action-id order"""
+        sid = self.state_ids.get(state)
+        if sid is None:
+            return {}
+        row = self._row(sid)
+        return {a: float(row[aid]) for a, aid in self.action_ids.items()
+                if self._seen[sid, aid]}
+    
+    def _drop_states(self, states):
+        """Remove states and renumber the remaining rows densely"""
+        drop = {self.state_ids[s] for s in states if s in self.state_ids}
+        if not drop:
+            return
+        keep = [(s, i) for s, i in self.state_ids.items() if i not in drop]
+        rows = [i for _, i in keep]
+        n = len(keep)
+        self.Q[:n] = self.Q[rows]
+        self._seen[:n] = self._seen[rows]
+        self.scales[:n] = self.scales[rows]
+        self.Q[n:] = 0
+        self._seen[n:] = False
+        self.scales[n:] = 0
+        self.state_ids = {s: new for new, (s, _) in enumerate(keep)}
+    
     def get_state(self, market_data, current_idx):
         """
         Convert complex market data into a simplified state for Q-learning.
@@ -153,7 +272,7 @@ class NurLearner:
             state = f"{distance_state}_{volatility_state}_{volume_trend}_{trend_state}"
             
             # Limit number of unique states
-            if len(self.q_table) > self.config['max_states']:
+            if len(self.state_ids) > self.config['max_states']:
                 # Remove least used states
                 self._prune_states()
             
@@ -186,12 +305,17 @@ class NurLearner:
             print(f"🔍 Exploring: {action} (state: {state})")
         else:
             # Exploit: choose best known action
-            action_values = {a: self.q_table[state][a] for a in available_actions}
-            if action_values:
-                # Get action with highest Q-value
-                action = max(action_values, key=action_values.get)
+            sid = self._state_id(state)
+            aids = [self._action_id(a) for a in available_actions]
+            self._seen[sid, aids] = True
+            # int8 codes share the row's scale, so argmax needs no dequantize
+            values = self.Q[sid, aids]
+            if len(values):
+                # Get action with highest Q-value (first one on ties)
+                best = int(np.argmax(values))
+                action = available_actions[best]
                 self.stats['exploitation_used'] += 1
-                print(f"🎯 Exploiting: {action} (value: {action_values[action]:.3f})")
+                print(f"🎯 Exploiting: {action} (value: {self._get_q(sid, aids[best]):.3f})")
             else:
                 # No Q-values yet, explore
                 action = np.random.choice(available_actions)
@@ -244,8 +368,11 @@ class NurLearner:
         if state is None or action is None:
             return
         
+        sid = self._state_id(state)
+        aid = self._action_id(action)
+        
         # Current Q-value
-        current_q = self.q_table[state][action]
+        current_q = self._get_q(sid, aid)
         
         # Maximum future Q-value
         if is_terminal:
@@ -253,10 +380,7 @@ class NurLearner:
             max_future_q = 0
         else:
             # Get max Q-value for next state
-            if next_state in self.q_table:
-                max_future_q = max(self.q_table[next_state].values(), default=0)
-            else:
-                max_future_q = 0
+            max_future_q = self._max_q(next_state)
         
         # Calculate new Q-value
         new_q = current_q + self.config['learning_rate'] * (
@@ -264,7 +388,8 @@ class NurLearner:
         )
         
         # Update Q-table
-        self.q_table[state][action] = new_q
+        self._put_q(sid, aid, new_q)
+        self.append_delta(state, action, new_q)
         
         # Store experience for batch learning
         experience = {
@@ -315,22 +440,25 @@ class NurLearner:
                 continue
             
             # Re-update with possibly new Q-values
-            current_q = self.q_table[exp['state']][exp['action']]
+            sid = self._state_id(exp['state'])
+            aid = self._action_id(exp['action'])
+            current_q = self._get_q(sid, aid)
             
             if exp['is_terminal']:
                 max_future_q = 0
             else:
-                max_future_q = max(self.q_table[exp['next_state']].values(), default=0)
+                max_future_q = self._max_q(exp['next_state'])
             
             new_q = current_q + self.config['learning_rate'] * (
                 exp['reward'] + self.config['discount_factor'] * max_future_q - current_q
             )
             
-            self.q_table[exp['state']][exp['action']] = new_q
+            self._put_q(sid, aid, new_q)
+            self.append_delta(exp['state'], exp['action'], new_q)
     
     def _prune_states(self):
         """Remove least used states to control memory usage"""
-        if len(self.q_table) <= self.config['max_states']:
+        if len(self.state_ids) <= self.config['max_states']:
             return
         
         # Count state usage (approximate)
@@ -344,10 +472,11 @@ class NurLearner:
         sorted_states = sorted(state_usage.items(), key=lambda x: x[1])
         
         # Remove least used states
-        states_to_remove = len(self.q_table) - self.config['max_states']
-        for state, _ in sorted_states[:states_to_remove]:
-            if state in self.q_table:
-                del self.q_table[state]
+        states_to_remove = len(self.state_ids) - self.config['max_states']
+        removed = [state for state, _ in sorted_states[:states_to_remove] if state in self.state_ids]
+        self._drop_states(removed)
+        for state in removed:
+            self.append_delta(state, None, None)
         
         print(f"🧹 Pruned {states_to_remove} least used states")
     
@@ -360,7 +489,8 @@ class NurLearner:
         - action: Recommended action
         - explanation: Why this action is recommended
         """
-        if state not in self.q_table or not self.q_table[state]:
+        action_values = self._action_values(state)
+        if not action_values:
             return {
                 'confidence': 0.0,
                 'action': 'hold',
@@ -368,7 +498,6 @@ class NurLearner:
             }
         
         # Get best action for this state
-        action_values = self.q_table[state]
         best_action = max(action_values, key=action_values.get)
         best_value = action_values[best_action]
         
@@ -404,51 +533,154 @@ class NurLearner:
             'state_visits': len([exp for exp in self.memory if exp.get('state') == state])
         }
     
-    def save(self, filename="nur_learning_state.pkl"):
-        """Save learning state to file"""
+    def append_delta(self, state, action, new_q):
+        """
+        Append one Q-table change to the delta log.
+        
+        One JSON line per change instead of re-pickling the whole table.
+        action=None records that the state was pruned. The log is folded
+        into the pickle every COMPACT_EVERY lines.
+        """
+        if self._delta_fd is None:
+            self._delta_fd = os.open(
+                deltas_path(self.state_file),
+                os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644
+            )
+            self._delta_finalizer = weakref.finalize(self, os.close, self._delta_fd)
+        
+        # A single O_APPEND write lands whole, even with several writers
+        line = json.dumps([state, action, new_q]) + "\n"
+        os.write(self._delta_fd, line.encode())
+        self._delta_lines += 1
+        
+        if self._delta_lines >= COMPACT_EVERY:
+            self.compact()
+    
+    def _write_state(self, filename):
+        """Pickle the full learning state to filename (atomic rename)"""
+        save_data = {
+            'states': list(self.state_ids),
+            'actions': list(self.action_ids),
+            'Q': self.Q[:len(self.state_ids), :len(self.action_ids)].copy(),
+            'scales': self.scales[:len(self.state_ids)].copy() if self._quantized else None,
+            'seen': self._seen[:len(self.state_ids), :len(self.action_ids)].copy(),
+            'memory': self.memory,
+            'stats': self.stats,
+            'config': self.config
+        }
+        
+        tmp = filename + ".tmp"
+        with open(tmp, 'wb') as f:
+            pickle.dump(save_data, f)
+        os.replace(tmp, filename)
+    
+    def compact(self):
+        """Fold the delta log into state_file and drop the log"""
         try:
-            save_data = {
-                'q_table': dict(self.q_table),
-                'memory': self.memory,
-                'stats': self.stats,
-                'config': self.config
-            }
+            self._write_state(self.state_file)
             
-            with open(filename, 'wb') as f:
-                pickle.dump(save_data, f)
+            # The deltas are now in the pickle
+            if self._delta_fd is not None:
+                self._delta_finalizer()
+                self._delta_fd = None
+            if os.path.exists(deltas_path(self.state_file)):
+                os.remove(deltas_path(self.state_file))
+            self._delta_lines = 0
             
-            print(f"💾 Saved learning state to {filename}")
-            print(f"  States: {len(self.q_table)}, Memories: {len(self.memory)}")
+            print(f"💾 Saved learning state to {self.state_file}")
+            print(f"  States: {len(self.state_ids)}, Memories: {len(self.memory)}")
             
         except Exception as e:
             print(f"❌ Error saving learning state: {e}")
     
-    def load(self, filename="nur_learning_state.pkl"):
-        """Load learning state from file"""
+    def save(self, filename=None):
+        """
+        Save learning state to file.
+        
+        Saving to state_file compacts it (see compact). Any other filename
+        is a plain export: the live state_file and its delta log are left
+        alone, so later updates keep going to state_file.
+        """
+        if filename is None or os.path.abspath(filename) == os.path.abspath(self.state_file):
+            self.compact()
+            return
+        
+        try:
+            self._write_state(filename)
+            # A stale log next to the export would be replayed over it on load
+            if os.path.exists(deltas_path(filename)):
+                os.remove(deltas_path(filename))
+            
+            print(f"💾 Exported learning state to {filename}")
+            print(f"  States: {len(self.state_ids)}, Memories: {len(self.memory)}")
+            
+        except Exception as e:
+            print(f"❌ Error saving learning state: {e}")
+    
+    def load(self, filename=None):
+        """Load learning state from file, then replay its delta log"""
+        filename = filename or self.state_file
         try:
             if os.path.exists(filename):
                 with open(filename, 'rb') as f:
                     save_data = pickle.load(f)
                 
-                # Convert back to defaultdict
-                self.q_table = defaultdict(lambda: defaultdict(float))
-                for state, actions in save_data.get('q_table', {}).items():
-                    for action, value in actions.items():
-                        self.q_table[state][action] = value
+                self._reset_q_table()
+                if 'Q' in save_data:
+                    self.state_ids = {s: i for i, s in enumerate(save_data['states'])}
+                    self.action_ids = {a: i for i, a in enumerate(save_data['actions'])}
+                    self._grow(len(self.state_ids), len(self.action_ids))
+                    Q = np.asarray(save_data['Q'], dtype=np.float32)
+                    if save_data.get('scales') is not None:
+                        Q = Q * save_data['scales'][:, None]
+                    for (sid, aid) in zip(*np.nonzero(save_data['seen'])):
+                        self._put_q(sid, aid, Q[sid, aid])
+                else:
+                    # Older files store a dict of dicts
+                    for state, actions in save_data.get('q_table', {}).items():
+                        self._state_id(state)
+                        for action, value in actions.items():
+                            self._set_q(state, action, value)
                 
                 self.memory = save_data.get('memory', [])
                 self.stats = save_data.get('stats', self.stats.copy())
                 self.config.update(save_data.get('config', {}))
                 
                 print(f"📂 Loaded learning state from {filename}")
-                print(f"  States: {len(self.q_table)}, Memories: {len(self.memory)}")
+                print(f"  States: {len(self.state_ids)}, Memories: {len(self.memory)}")
+            
+            replayed = self._replay_deltas(deltas_path(filename))
+            if replayed:
+                print(f"📂 Replayed {replayed} Q-value changes from {deltas_path(filename)}")
                 
         except Exception as e:
             print(f"⚠️  Error loading learning state: {e}")
             # Start fresh
-            self.q_table = defaultdict(lambda: defaultdict(float))
+            self._reset_q_table()
             self.memory = []
     
+    def _replay_deltas(self, path):
+        """Apply delta log lines on top of the loaded Q-table"""
+        if not os.path.exists(path):
+            return 0
+        
+        count = 0
+        with open(path, 'r') as f:
+            for line in f:
+                try:
+                    state, action, new_q = json.loads(line)
+                except ValueError:
+                    continue  # torn last line after a crash
+                
+                if action is None:
+                    self._drop_states([state])
+                else:
+                    self._set_q(state, action, new_q)
+                count += 1
+        
+        self._delta_lines += count
+        return count
+    
     def print_stats(self):
         """Print learning statistics"""
         print("\n" + "="*60)
@@ -457,7 +689,7 @@ class NurLearner:
         
         print(f"\n📊 Learning Performance:")
         print(f"   Total Updates: {self.stats['total_updates']}")
-        print(f"   States Learned: {len(self.q_table)}")
+        print(f"   States Learned: {len(self.state_ids)}")
         print(f"   Experiences Stored: {len(self.memory)}")
         
         print(f"\n⚖️  Exploration vs Exploitation:")
@@ -479,12 +711,13 @@ class NurLearner:
         print(f"   Discount Factor: {self.config['discount_factor']}")
         
         # Show top learned states
-        if self.q_table:
+        if self.state_ids:
             print(f"\n🏆 Top Learned States:")
             
             # Calculate average Q-value per state
             state_scores = []
-            for state, actions in self.q_table.items():
+            for state in self.state_ids:
+                actions = self._action_values(state)
                 if actions:
                     avg_q = sum(actions.values()) / len(actions)
                     state_scores.append((state, avg_q, len(actions)))
@@ -505,8 +738,8 @@ def test_learner():
     print("🧪 Testing Nur Learning System")
     print("=" * 50)
     
-    # Create learner
-    learner = NurLearner()
+    # Create learner (own state file, so the live one is untouched)
+    learner = NurLearner(state_file="test_learning.pkl")
     
     # Simulate learning scenarios
     print("\n1. Learning from scratch...")
@@ -551,7 +784,7 @@ def test_learner():
     learner.print_stats()
     
     # Save learning
-    learner.save("test_learning.pkl")
+    learner.save()
     
     print("\n✅ Learning system test complete!")
 
@@ -8,7 +8,27 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 import os
-from typing import Optional, Dict, Any, List
+import sys
+from typing import Optional, Dict, Any, List, Tuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional - fall back to the pandas C parser
+    pa = None
+    pacsv = None
+    pq = None
+
+try:
+    from scipy.signal import lfilter
+except ImportError:  # scipy is optional - fall back to the Python recurrence
+    lfilter = None
+
+# Allow running this module directly (python core/market.py)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core._fast import ema_mt5, NUMBA_AVAILABLE
 
 
 class MT5MarketData:
@@ -17,16 +37,48 @@ class MT5MarketData:
     Calculates EMA exactly as MT5 does.
     """
     
-    def __init__(self, data_path: str) -> None:
+    CSV_COLUMNS: List[str] = ['timestamp', 'open', 'high', 'low', 'close', 'tick_vol', 'real_vol', 'spread']
+    
+    # Volume/spread counters are small non-negative ints (spread in points
+    # can pass 255 around rollover, hence uint16)
+    COUNT_DTYPES: Dict[str, Any] = {'tick_vol': np.uint32, 'real_vol': np.uint32, 'spread': np.uint16}
+    
+    # Column order of the float32 binary cache written by write_bin (counts
+    # are exact in float32 up to 2**24)
+    BIN_COLUMNS: List[str] = ['open', 'high', 'low', 'close', 'tick_vol', 'real_vol', 'spread', 'ema_200']
+    
+    # Prices are stored as float32; widened copies are rounded back to the
+    # instrument's quoted decimals (XAUUSD: 0.01)
+    PRICE_COLUMNS: List[str] = ['open', 'high', 'low', 'close']
+    PRICE_DECIMALS: int = 2
+    
+    def __init__(self, data_path: str, verbose: bool = True) -> None:
         """
         Initialize market data loader.
         
         Args:
             data_path: Path to MT5 exported CSV file
+            verbose: Print load/EMA status lines (errors always print)
         """
         self.data_path: str = data_path
+        self.verbose: bool = verbose
         self.df: Optional[pd.DataFrame] = None
         self.ema_period: int = 200
+        self.touch_threshold: float = 0.05  # Same as TradingStrategy.TOUCH_THRESHOLD
+        
+        # Column arrays cached for fast per-candle access (see _cache_arrays)
+        self._arr: Dict[str, np.ndarray] = {}
+        self._ts: Optional[np.ndarray] = None
+        self._soa: Dict[Any, Dict[str, np.ndarray]] = {}
+        self._candle_metrics: Optional[Dict[str, np.ndarray]] = None
+        
+        # Public float32 column arrays (same buffers as _arr), for
+        # vectorized scans and zero-allocation indexing: market.close[i]
+        self.open: Optional[np.ndarray] = None
+        self.high: Optional[np.ndarray] = None
+        self.low: Optional[np.ndarray] = None
+        self.close: Optional[np.ndarray] = None
+        self.ema_200: Optional[np.ndarray] = None
         
     def load_data(self) -> bool:
         """
@@ -36,30 +88,38 @@ class MT5MarketData:
             bool: True if successful, False otherwise
         """
         try:
-            # MT5 exports with semicolon delimiters and quotes
-            self.df = pd.read_csv(
-                self.data_path, 
-                delimiter=';',
-                names=['timestamp', 'open', 'high', 'low', 'close', 'tick_vol', 'real_vol', 'spread'],
-                skiprows=1  # Skip header row
-            )
-            
-            # Parse the timestamp (format: "2024.01.01 00:00")
-            self.df['timestamp'] = pd.to_datetime(self.df['timestamp'].str.strip('"'), format='%Y.%m.%d %H:%M')
-            
-            # Convert price columns to float
-            price_cols = ['open', 'high', 'low', 'close']
-            for col in price_cols:
-                self.df[col] = pd.to_numeric(self.df[col], errors='coerce')
-            
-            # Set timestamp as index
-            self.df.set_index('timestamp', inplace=True)
+            cache_path = self._parquet_cache_path()
+            if self.bin_is_fresh():
+                # Fastest start: memory-mapped float32 columns, no parsing
+                self.df = self._load_bin()
+            elif self._parquet_cache_fresh(cache_path):
+                # Warm start: typed, indexed (and possibly EMA'd) frame
+                self.df = pd.read_parquet(cache_path)
+            else:
+                self.df = None
+                if pacsv is not None:
+                    try:
+                        self.df = self._read_csv_arrow()
+                    except pa.ArrowInvalid as e:
+                        # Rows pyarrow can't type strictly (stray text, bad
+                        # dates) - pandas coerces them instead of failing
+                        print(f"⚠️  pyarrow CSV parse failed ({e}), falling back to pandas")
+                if self.df is None:
+                    self.df = self._read_csv_pandas()
+                
+                # Set timestamp as index
+                self.df.set_index('timestamp', inplace=True)
+                
+                # Sort by time (just in case)
+                self.df.sort_index(inplace=True)
+                
+                self._write_parquet_cache()
             
-            # Sort by time (just in case)
-            self.df.sort_index(inplace=True)
+            self._cache_arrays()
             
-            print(f"✅ Loaded {len(self.df)} candles from {self.data_path}")
-            print(f"Date range: {self.df.index[0]} to {self.df.index[-1]}")
+            if self.verbose:
+                print(f"✅ Loaded {len(self.df)} candles from {self.data_path}")
+                print(f"Date range: {self.df.index[0]} to {self.df.index[-1]}")
             
             return True
             
@@ -67,6 +127,162 @@ class MT5MarketData:
             print(f"❌ Error loading data: {e}")
             return False
     
+    def _parquet_cache_path(self) -> str:
+        """Path of the Parquet cache that sits next to the CSV."""
+        return self.data_path + '.parquet'
+    
+    def _parquet_cache_fresh(self, cache_path: str) -> bool:
+        """True if a Parquet cache exists and is not older than the CSV."""
+        return (
+            pa is not None
+            and os.path.exists(cache_path)
+            and os.path.getmtime(cache_path) >= os.path.getmtime(self.data_path)
+        )
+    
+    def _write_parquet_cache(self) -> None:
+        """Save self.df as Parquet (snappy) so later loads skip CSV parsing."""
+        if pa is None:
+            return
+        try:
+            # Small row groups let load_columns(nrows=...) decode only the head
+            self.df.to_parquet(self._parquet_cache_path(), compression='snappy', row_group_size=10_000)
+        except Exception as e:  # cache is best-effort (read-only dir, etc.)
+            if self.verbose:
+                print(f"⚠️ Could not write Parquet cache: {e}")
+    
+    def load_columns(self, columns: List[str], nrows: Optional[int] = None) -> pd.DataFrame:
+        """
+        Read only some columns (and optionally the first nrows candles).
+        
+        Served from the Parquet cache with column projection, so previews
+        that need e.g. the first thousand closes skip the full CSV parse.
+        The cache is built from the CSV on first use. self.df is left as is
+        when the cache is fresh.
+        
+        Args:
+            columns: Column names to read (timestamp is always the index)
+            nrows: Only return the first nrows candles
+            
+        Returns:
+            DataFrame indexed by timestamp (empty on load failure)
+        """
+        cache_path = self._parquet_cache_path()
+        if not self._parquet_cache_fresh(cache_path):
+            if not self.load_data():
+                return pd.DataFrame()
+            if not self._parquet_cache_fresh(cache_path):  # no pyarrow / unwritable dir
+                df = self.df[columns]
+                return df if nrows is None else df.iloc[:nrows]
+        
+        if nrows is None:
+            return pd.read_parquet(cache_path, columns=columns)
+        
+        batches = pq.ParquetFile(cache_path).iter_batches(batch_size=nrows, columns=['timestamp', *columns])
+        return next(batches).to_pandas()  # pandas metadata restores the index
+    
+    def _bin_paths(self) -> Tuple[str, str]:
+        """Paths of the float32 column file and int64 timestamp file."""
+        stem = os.path.splitext(self.data_path)[0]
+        return stem + '.f32.bin', stem + '.ts.bin'
+    
+    def bin_is_fresh(self) -> bool:
+        """True if binary caches exist and are not older than the CSV."""
+        csv_mtime = os.path.getmtime(self.data_path)
+        return all(
+            os.path.exists(path) and os.path.getmtime(path) >= csv_mtime
+            for path in self._bin_paths()
+        )
+    
+    def _load_bin(self) -> pd.DataFrame:
+        """
+        Map the binary caches written by write_bin.
+        
+        Columns are views into a read-only np.memmap, so pages are read
+        on demand and nothing is parsed.
+        """
+        values_path, ts_path = self._bin_paths()
+        ts = np.memmap(ts_path, dtype=np.int64, mode='r')
+        values = np.memmap(values_path, dtype=np.float32, mode='r').reshape(len(self.BIN_COLUMNS), len(ts))
+        
+        data = {
+            col: values[i].astype(self.COUNT_DTYPES[col]) if col in self.COUNT_DTYPES else values[i]
+            for i, col in enumerate(self.BIN_COLUMNS)
+        }
+        index = pd.DatetimeIndex(ts.view('datetime64[us]'), name='timestamp')
+        df = pd.DataFrame(data, index=index, copy=False)
+        df.attrs['ema_period'] = 200  # the cached column is ema_200
+        return df
+    
+    def write_bin(self) -> bool:
+        """
+        Save the loaded data (with EMA200) as binary column caches.
+        
+        Writes <csv stem>.f32.bin, the BIN_COLUMNS as contiguous float32
+        rows (one per column), and <csv stem>.ts.bin, int64 microseconds.
+        load_data maps them while they are newer than the CSV.
+        
+        Returns:
+            bool: True if written
+        """
+        if self.df is None or self.df.attrs.get('ema_period') != 200:
+            print("❌ Load data and calculate EMA200 before writing the binary cache")
+            return False
+        
+        values_path, ts_path = self._bin_paths()
+        self.df[self.BIN_COLUMNS].to_numpy(dtype=np.float32).T.tofile(values_path)
+        self.df.index.to_numpy(dtype='datetime64[us]').view(np.int64).tofile(ts_path)
+        
+        if self.verbose:
+            print(f"✅ Wrote binary cache: {values_path}, {ts_path}")
+        return True
+    
+    def _read_csv_pandas(self) -> pd.DataFrame:
+        """Parse the MT5 export with pandas (no pyarrow, or pyarrow rejected it)."""
+        # MT5 exports with semicolon delimiters and quotes
+        df = pd.read_csv(
+            self.data_path, 
+            delimiter=';',
+            names=self.CSV_COLUMNS,
+            dtype=self.COUNT_DTYPES,
+            skiprows=1  # Skip header row
+        )
+        
+        # Parse the timestamp (format: "2024.01.01 00:00")
+        df['timestamp'] = pd.to_datetime(df['timestamp'].str.strip('"'), format='%Y.%m.%d %H:%M')
+        
+        # Convert price columns to float32 (XAUUSD needs ~6 significant
+        # digits; halves memory/bandwidth vs float64)
+        price_cols = ['open', 'high', 'low', 'close']
+        for col in price_cols:
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype(np.float32)
+        return df
+    
+    def _read_csv_arrow(self) -> pd.DataFrame:
+        """
+        Parse the MT5 export with pyarrow's multithreaded reader.
+        
+        Columns come out already typed (float32 prices, parsed timestamps),
+        so there is no second coercion pass.
+        """
+        price_type = pa.float32()
+        table = pacsv.read_csv(
+            self.data_path,
+            read_options=pacsv.ReadOptions(column_names=self.CSV_COLUMNS, skip_rows=1),
+            parse_options=pacsv.ParseOptions(delimiter=';'),
+            convert_options=pacsv.ConvertOptions(
+                column_types={
+                    'timestamp': pa.timestamp('us'),
+                    'open': price_type,
+                    'high': price_type,
+                    'low': price_type,
+                    'close': price_type,
+                    **{col: pa.from_numpy_dtype(dt) for col, dt in self.COUNT_DTYPES.items()},
+                },
+                timestamp_parsers=['%Y.%m.%d %H:%M'],
+            ),
+        )
+        return table.to_pandas(self_destruct=True)
+    
     def calculate_ema_mt5(self) -> bool:
         """
         Calculate EMA in the exact same way MT5 does.
@@ -84,35 +300,177 @@ class MT5MarketData:
             print(f"❌ Not enough data for {self.ema_period}-period EMA")
             return False
         
-        alpha: float = 2 / (self.ema_period + 1)
+        # EMA already loaded from the Parquet cache for this period
+        cached = 'ema_200' in self.df.columns and self.df.attrs.get('ema_period') == self.ema_period
         
-        # Calculate SMA for the first EMA value
-        sma_initial = self.df['close'].rolling(window=self.ema_period).mean()
-        
-        # Calculate EMA using the recursive formula
-        ema_values: List[float] = []
-        
-        for i in range(len(self.df)):
-            if i < self.ema_period - 1:
-                # Not enough data yet
-                ema_values.append(np.nan)
-            elif i == self.ema_period - 1:
-                # First EMA value = SMA
-                ema_values.append(sma_initial.iloc[i])
+        if not cached:
+            alpha: float = 2 / (self.ema_period + 1)
+            
+            if NUMBA_AVAILABLE:
+                close = self.df['close'].to_numpy(dtype=np.float64)
+                ema_values = ema_mt5(close, self.ema_period, alpha)
+            elif lfilter is not None:
+                ema_values = self._ema_lfilter(alpha)
             else:
-                # EMA = (Close * alpha) + (Previous EMA * (1 - alpha))
-                current_close: float = self.df['close'].iloc[i]
-                prev_ema: float = ema_values[-1]
-                current_ema: float = (current_close * alpha) + (prev_ema * (1 - alpha))
-                ema_values.append(current_ema)
+                ema_values = self._ema_loop(alpha)
+            
+            # Recursion runs in float64 (error accumulates); store as float32
+            self.df['ema_200'] = np.asarray(ema_values, dtype=np.float64).astype(np.float32)
+            self.df.attrs['ema_period'] = self.ema_period
+            self._write_parquet_cache()
+        
+        # Prices and timestamps were cached at load; only the EMA is new
+        self._arr['ema_200'] = self.df['ema_200'].to_numpy()
+        self.ema_200 = self._arr['ema_200']
+        self._soa = {}
         
-        self.df['ema_200'] = ema_values
+        # Touch bands for signals_from_arrays, built from the stored EMA so
+        # they match get_candle()['ema_200'] +/- threshold exactly
+        ema = self._arr['ema_200'].astype(np.float64)
+        self._ema_up = ema + self.touch_threshold
+        self._ema_dn = ema - self.touch_threshold
         
-        print(f"✅ Calculated EMA{self.ema_period} for {len(self.df)} candles")
-        print(f"First EMA value: {self.df['ema_200'].iloc[self.ema_period]}")
+        if self.verbose:
+            source = "Loaded cached" if cached else "Calculated"
+            print(f"✅ {source} EMA{self.ema_period} for {len(self.df)} candles")
+            print(f"First EMA value: {self.df['ema_200'].iloc[self.ema_period]}")
         
         return True
     
+    def _ema_lfilter(self, alpha: float) -> np.ndarray:
+        """
+        MT5 EMA as a first-order IIR filter (compiled C recursion).
+        
+        y[n] = alpha * x[n] + (1 - alpha) * y[n-1], seeded with the SMA of
+        the first period closes so the output matches the MT5 recursion.
+        """
+        close = self.df['close'].to_numpy(dtype=np.float64)
+        period = self.ema_period
+        
+        ema = np.full(len(close), np.nan)
+        ema[period - 1] = close[:period].mean()
+        
+        b = np.array([alpha])
+        a = np.array([1.0, -(1.0 - alpha)])
+        zi = np.array([(1.0 - alpha) * ema[period - 1]])
+        ema[period:], _ = lfilter(b, a, close[period:], zi=zi)
+        
+        return ema
+    
+    def _ema_loop(self, alpha: float) -> np.ndarray:
+        """Pure-Python EMA recursion (used when scipy is unavailable)."""
+        close = self.df['close'].to_numpy(dtype=np.float64)
+        period = self.ema_period
+        
+        # NaN until the seed candle, then First EMA value = SMA of the first
+        # period closes (only this one SMA value is ever needed)
+        ema_values = np.full(len(close), np.nan)
+        ema_values[period - 1] = close[:period].mean()
+        
+        # EMA = (Close * alpha) + (Previous EMA * (1 - alpha)), warmup skipped
+        one_minus_alpha = 1 - alpha
+        prev_ema = ema_values[period - 1]
+        for i in range(period, len(close)):
+            prev_ema = (close[i] * alpha) + (prev_ema * one_minus_alpha)
+            ema_values[i] = prev_ema
+        
+        return ema_values
+    
+    def _cache_arrays(self) -> None:
+        """Cache OHLC/EMA columns and timestamps as raw numpy arrays."""
+        self._arr = {col: self.df[col].to_numpy() for col in ('open', 'high', 'low', 'close')}
+        if 'ema_200' in self.df.columns:
+            self._arr['ema_200'] = self.df['ema_200'].to_numpy()
+        # datetime64; get_timestamp() boxes one Timestamp on demand
+        self._ts = self.df.index.to_numpy()
+        
+        self.open = self._arr['open']
+        self.high = self._arr['high']
+        self.low = self._arr['low']
+        self.close = self._arr['close']
+        self.ema_200 = self._arr.get('ema_200')
+        self._soa = {}
+        self._candle_metrics = None
+    
+    def as_arrays(self, dtype: Any = np.float64) -> Dict[str, np.ndarray]:
+        """
+        Contiguous column arrays for per-bar loops and kernels.
+        
+        Materialized once per dtype (after calculate_ema_mt5) and reused.
+        float64 values equal get_candle()'s fields, so code indexing
+        close[i], ema_200[i-1], ... gets the same numbers without building
+        a dict per candle. Their prices are rounded back to PRICE_DECIMALS,
+        i.e. exactly the CSV values, so use them for anything that ends up
+        in a trade (entry, SL/TP, exit).
+        
+        float32 returns the stored columns themselves (no copy, half the
+        memory traffic) for scans such as signal detection. Consumers must
+        still do their arithmetic in float64 - numba kernels widen on read,
+        NumPy code should not mix float32 arrays with Python floats (NEP 50
+        keeps those float32).
+        
+        Args:
+            dtype: np.float64 (default, widened copies) or np.float32
+        
+        Returns:
+            Dictionary of arrays: open, high, low, close, ema_200 (if
+            calculated) and ts (datetime64; use get_timestamp(i) where a
+            Timestamp is needed)
+        """
+        dtype = np.dtype(dtype)
+        if dtype not in self._soa:
+            soa = {
+                col: np.ascontiguousarray(values, dtype=dtype)
+                for col, values in self._arr.items()
+            }
+            if dtype != np.float32:
+                for col in self.PRICE_COLUMNS:
+                    np.round(soa[col], self.PRICE_DECIMALS, out=soa[col])
+            soa['ts'] = self._ts
+            self._soa[dtype] = soa
+        return self._soa[dtype]
+    
+    def precompute_candle_metrics(self) -> Dict[str, np.ndarray]:
+        """
+        Compute candle body/range metrics for every candle in one pass.
+        
+        Used by TradeObserver's strong-opposite-candle check so backtests
+        don't redo the arithmetic per candle. The 0.7 body-ratio test is
+        evaluated in float64 before body_ratio is narrowed to float32, so
+        exit decisions are unchanged. Computed once and reused, so engines
+        sharing this market don't repeat the pass.
+        
+        Returns:
+            Dictionary of arrays: body, body_ratio, strong, bearish, bullish
+        """
+        if self._candle_metrics is not None:
+            return self._candle_metrics
+        
+        open_ = self.df['open'].to_numpy(np.float64)
+        close = self.df['close'].to_numpy(np.float64)
+        high = self.df['high'].to_numpy(np.float64)
+        low = self.df['low'].to_numpy(np.float64)
+        
+        body = np.abs(close - open_)
+        rng = high - low
+        body_ratio = np.zeros_like(body)
+        np.divide(body, rng, out=body_ratio, where=rng != 0)
+        
+        self._body = body
+        self._body_ratio = body_ratio.astype(np.float32)
+        self._strong = body_ratio >= 0.7
+        self._bearish = close < open_
+        self._bullish = close > open_
+        
+        self._candle_metrics = {
+            'body': self._body,
+            'body_ratio': self._body_ratio,
+            'strong': self._strong,
+            'bearish': self._bearish,
+            'bullish': self._bullish,
+        }
+        return self._candle_metrics
+    
     def get_candle(self, index: int) -> Optional[Dict[str, Any]]:
         """
         Get candle data at specific index.
@@ -126,23 +484,38 @@ class MT5MarketData:
         if self.df is None or index >= len(self.df):
             return None
         
+        # Widen the float32 storage so downstream arithmetic (spread,
+        # SL/TP, PnL) runs in double precision, rounding prices back to
+        # the exported 2 decimals (2028.3 rather than 2028.300048828125)
+        arr = self._arr
+        ema = arr.get('ema_200')
+        digits = self.PRICE_DECIMALS
         return {
-            'timestamp': self.df.index[index],
-            'open': self.df['open'].iloc[index],
-            'high': self.df['high'].iloc[index],
-            'low': self.df['low'].iloc[index],
-            'close': self.df['close'].iloc[index],
-            'ema_200': self.df['ema_200'].iloc[index] if 'ema_200' in self.df.columns else None
+            'timestamp': self.get_timestamp(index),
+            'open': round(float(arr['open'][index]), digits),
+            'high': round(float(arr['high'][index]), digits),
+            'low': round(float(arr['low'][index]), digits),
+            'close': round(float(arr['close'][index]), digits),
+            'ema_200': float(ema[index]) if ema is not None else None
         }
     
-    def get_dataframe(self) -> pd.DataFrame:
+    def get_timestamp(self, index: int) -> pd.Timestamp:
+        """Timestamp of the candle at index (same value as df.index[index])."""
+        return pd.Timestamp(self._ts[index])
+    
+    def get_dataframe(self, copy: bool = False) -> pd.DataFrame:
         """
         Return the full DataFrame.
         
+        Args:
+            copy: Return a deep copy (only needed if the caller mutates it)
+            
         Returns:
-            Copy of the market data DataFrame
+            The market data DataFrame (or a copy)
         """
-        return self.df.copy() if self.df is not None else pd.DataFrame()
+        if self.df is None:
+            return pd.DataFrame()
+        return self.df.copy() if copy else self.df
     
     def get_candle_count(self) -> int:
         """
@@ -7,7 +7,31 @@ and decides when to exit early based on candle behavior, giving Nur agency
 beyond just waiting for SL/TP.
 """
 
-from typing import Optional, Dict, Any, List
+import os
+import sys
+from collections import deque
+from dataclasses import dataclass, asdict
+from typing import Optional, Dict, Any, Deque, Tuple
+
+import numpy as np
+
+# Allow running this module directly (python core/observer.py)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import _fast
+
+
+@dataclass(slots=True)
+class TradeState:
+    """Per-trade statistics tracked by TradeObserver (slotted for fast access)."""
+    entry_price: Optional[float] = None
+    entry_time: Any = None
+    highest_price: Optional[float] = None
+    lowest_price: Optional[float] = None
+    candles_in_trade: int = 0
+    direction: Optional[str] = None  # 'BUY' or 'SELL'
+    max_profit_pct: float = 0
+    max_loss_pct: float = 0
 
 
 class TradeObserver:
@@ -21,6 +45,15 @@ class TradeObserver:
     4. Time-based exit (optional)
     """
     
+    DEFAULT_CONFIG: Dict[str, Any] = {
+        'momentum_threshold': 0.001,  # 0.1% for strong opposite candle
+        'stall_candles': 10,          # Exit if price doesn't move for 10 candles
+        'max_trade_duration': 60,     # Max 60 minutes per trade
+        'trailing_stop_activation': 0.005,  # 0.5% profit to activate trailing
+        'trailing_stop_distance': 0.002,    # 0.2% trailing distance
+        'verbose': False,             # Print tracking/exit messages (slow in backtests)
+    }
+    
     def __init__(self, config: Optional[Dict[str, Any]] = None) -> None:
         """
         Initialize trade observer.
@@ -28,27 +61,42 @@ class TradeObserver:
         Args:
             config: Configuration dictionary with observer parameters
         """
-        self.config: Dict[str, Any] = config or {
-            'momentum_threshold': 0.001,  # 0.1% for strong opposite candle
-            'stall_candles': 10,          # Exit if price doesn't move for 10 candles
-            'max_trade_duration': 60,     # Max 60 minutes per trade
-            'trailing_stop_activation': 0.005,  # 0.5% profit to activate trailing
-            'trailing_stop_distance': 0.002,    # 0.2% trailing distance
-        }
+        # Missing keys fall back to the defaults (partial configs are allowed)
+        self.config: Dict[str, Any] = {**self.DEFAULT_CONFIG, **(config or {})}
+        
+        self.verbose: bool = self.config['verbose']
+        
+        # Config-derived constants, evaluated once instead of per candle
+        self._stall_candles: int = self.config['stall_candles']
+        self._max_duration: int = self.config['max_trade_duration']
+        self._momentum_thresh: float = self.config['momentum_threshold']
+        self._trail_activate_pct: float = self.config['trailing_stop_activation'] * 100.0
+        self._trail_dn_mult: float = 1.0 - self.config['trailing_stop_distance']
+        self._trail_up_mult: float = 1.0 + self.config['trailing_stop_distance']
+        self._stall_thresh_ratio: float = 0.001  # 0.1% of average price
+        self._momentum_body_min: float = 0.0  # entry_price * momentum_threshold
         
         # Track trade statistics
-        self.trade_stats: Dict[str, Any] = {
-            'entry_price': None,
-            'entry_time': None,
-            'highest_price': None,
-            'lowest_price': None,
-            'candles_in_trade': 0,
-            'direction': None,  # 'BUY' or 'SELL'
-        }
+        self.trade_stats: TradeState = TradeState()
+        
+        # Price movement tracking (bounded windows for stall detection)
+        self.price_history: Deque[float] = deque(maxlen=self._stall_candles)
+        self.ema_history: Deque[float] = deque(maxlen=self._stall_candles)
+        self._price_sum: float = 0.0  # Running sum of price_history
+        
+        # Monotonic (index, price) deques giving the window max/min in O(1)
+        self._max_dq: Deque[Tuple[int, float]] = deque()
+        self._min_dq: Deque[Tuple[int, float]] = deque()
+        self._tick: int = 0
         
-        # Price movement tracking
-        self.price_history: List[float] = []
-        self.ema_history: List[float] = []
+        # Numeric state for the compiled update_arrays() path
+        self._state: np.ndarray = np.zeros(_fast.OBS_STATE_SIZE)
+        self._window: np.ndarray = np.zeros(self._stall_candles)
+        self._is_sell: int = 0
+        self._arrays_mode: bool = False
+        
+        # Optional per-candle arrays from MT5MarketData.precompute_candle_metrics
+        self.candle_metrics: Optional[Dict[str, np.ndarray]] = None
         
     def start_trade(self, direction: str, entry_price: float, entry_time: Any) -> None:
         """
@@ -59,25 +107,42 @@ class TradeObserver:
             entry_price: Entry price of the trade
             entry_time: Entry timestamp
         """
-        self.trade_stats = {
-            'entry_price': entry_price,
-            'entry_time': entry_time,
-            'highest_price': entry_price,
-            'lowest_price': entry_price,
-            'candles_in_trade': 0,
-            'direction': direction,
-            'max_profit_pct': 0,
-            'max_loss_pct': 0,
-        }
-        self.price_history = [entry_price]
-        self.ema_history = []
-        
-        print(f"🔍 Observer started tracking {direction} trade at {entry_price:.2f}")
+        self.trade_stats = TradeState(
+            entry_price=entry_price,
+            entry_time=entry_time,
+            highest_price=entry_price,
+            lowest_price=entry_price,
+            direction=direction,
+        )
+        self._momentum_body_min = entry_price * self._momentum_thresh
+        self.price_history = deque([entry_price], maxlen=self._stall_candles)
+        self.ema_history = deque(maxlen=self._stall_candles)
+        self._price_sum = entry_price
+        self._max_dq = deque()
+        self._min_dq = deque()
+        self._tick = 0
+        self._push_extremes(entry_price)
+        
+        self._state = np.zeros(_fast.OBS_STATE_SIZE)
+        self._state[_fast.OBS_ENTRY] = entry_price
+        self._state[_fast.OBS_HIGHEST] = entry_price
+        self._state[_fast.OBS_LOWEST] = entry_price
+        self._state[_fast.OBS_WIN_LEN] = 1
+        self._state[_fast.OBS_WIN_HEAD] = 1
+        self._state[_fast.OBS_WIN_SUM] = entry_price
+        self._window = np.zeros(self._stall_candles)
+        self._window[0] = entry_price
+        self._is_sell = 1 if direction == 'SELL' else 0
+        self._arrays_mode = False
+        
+        if self.verbose:
+            print(f"🔍 Observer started tracking {direction} trade at {entry_price:.2f}")
     
     def update(
         self,
         current_candle: Dict[str, Any],
-        current_ema: Optional[float] = None
+        current_ema: Optional[float] = None,
+        index: Optional[int] = None
     ) -> Optional[Dict[str, Any]]:
         """
         Update observer with new candle data.
@@ -85,88 +150,198 @@ class TradeObserver:
         Args:
             current_candle: dict with 'close', 'high', 'low', 'open'
             current_ema: Current EMA value (optional)
+            index: Candle index into candle_metrics (optional)
             
         Returns:
             dict with exit recommendation or None if no exit
         """
-        if self.trade_stats['entry_price'] is None:
+        if self.trade_stats.entry_price is None:
             return None
         
-        self.trade_stats['candles_in_trade'] += 1
+        st = self.trade_stats
+        st.candles_in_trade += 1
         current_price: float = current_candle['close']
         
-        # Update price extremes
-        if self.trade_stats['direction'] == 'BUY':
-            self.trade_stats['highest_price'] = max(
-                self.trade_stats['highest_price'], 
-                current_candle['high']
-            )
-            self.trade_stats['lowest_price'] = min(
-                self.trade_stats['lowest_price'], 
-                current_candle['low']
-            )
-        else:  # SELL
-            self.trade_stats['highest_price'] = max(
-                self.trade_stats['highest_price'], 
-                current_candle['high']
-            )
-            self.trade_stats['lowest_price'] = min(
-                self.trade_stats['lowest_price'], 
-                current_candle['low']
-            )
+        # Update price extremes (same for BUY and SELL)
+        high = current_candle['high']
+        low = current_candle['low']
+        if high > st.highest_price:
+            st.highest_price = high
+        if low < st.lowest_price:
+            st.lowest_price = low
         
         # Calculate current profit/loss percentage
-        if self.trade_stats['direction'] == 'BUY':
-            current_pnl_pct: float = (current_price - self.trade_stats['entry_price']) / self.trade_stats['entry_price'] * 100
+        entry_price = st.entry_price
+        if st.direction == 'BUY':
+            current_pnl_pct: float = (current_price - entry_price) / entry_price * 100
         else:  # SELL
-            current_pnl_pct = (self.trade_stats['entry_price'] - current_price) / self.trade_stats['entry_price'] * 100
+            current_pnl_pct = (entry_price - current_price) / entry_price * 100
         
         # Update max profit/loss
-        self.trade_stats['max_profit_pct'] = max(
-            self.trade_stats['max_profit_pct'], 
-            current_pnl_pct
-        )
-        self.trade_stats['max_loss_pct'] = min(
-            self.trade_stats['max_loss_pct'], 
-            current_pnl_pct
-        )
+        if current_pnl_pct > st.max_profit_pct:
+            st.max_profit_pct = current_pnl_pct
+        if current_pnl_pct < st.max_loss_pct:
+            st.max_loss_pct = current_pnl_pct
         
         # Check exit conditions
-        exit_reason = self._check_exit_conditions(current_candle, current_ema, current_pnl_pct)
+        exit_reason = self._check_exit_conditions(current_candle, current_ema, current_pnl_pct, index)
         
         if exit_reason:
-            print(f"🔍 Observer recommends exit: {exit_reason}")
-            print(f"   Trade duration: {self.trade_stats['candles_in_trade']} candles")
-            print(f"   Max profit: {self.trade_stats['max_profit_pct']:.2f}%, "
-                  f"Current: {current_pnl_pct:.2f}%")
+            if self.verbose:
+                print(f"🔍 Observer recommends exit: {exit_reason}")
+                print(f"   Trade duration: {self.trade_stats.candles_in_trade} candles")
+                print(f"   Max profit: {self.trade_stats.max_profit_pct:.2f}%, "
+                      f"Current: {current_pnl_pct:.2f}%")
             
             return {
                 'exit_price': current_price,
                 'exit_reason': exit_reason,
                 'pnl_pct': current_pnl_pct,
-                'candles_in_trade': self.trade_stats['candles_in_trade'],
-                'max_profit_pct': self.trade_stats['max_profit_pct'],
-                'max_loss_pct': self.trade_stats['max_loss_pct'],
+                'candles_in_trade': self.trade_stats.candles_in_trade,
+                'max_profit_pct': self.trade_stats.max_profit_pct,
+                'max_loss_pct': self.trade_stats.max_loss_pct,
             }
         
-        # Store price and EMA for stall detection
-        self.price_history.append(current_price)
+        # Store price and EMA for stall detection (deques drop the oldest)
+        self._push_price(current_price)
         if current_ema is not None:
             self.ema_history.append(current_ema)
         
-        # Keep only last N prices for stall detection
-        if len(self.price_history) > self.config['stall_candles']:
-            self.price_history.pop(0)
-            if self.ema_history:
-                self.ema_history.pop(0)
-        
         return None
     
+    def update_arrays(
+        self,
+        open_: float,
+        high: float,
+        low: float,
+        close: float,
+        ema: Optional[float] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Compiled equivalent of update() for backtests.
+        
+        Takes the candle as scalars and runs every exit check in one
+        core._fast.observer_step call. trade_stats is only synced when an
+        exit fires (or via get_trade_stats), so don't mix this with update()
+        on the same trade.
+        
+        Returns:
+            Same exit dict as update(), or None
+        """
+        if self.trade_stats.entry_price is None:
+            return None
+        
+        self._arrays_mode = True
+        cfg = self.config
+        code, current_pnl_pct = _fast.observer_step(
+            self._state, self._window, self._is_sell,
+            open_, high, low, close, np.nan if ema is None else ema,
+            cfg['momentum_threshold'], cfg['max_trade_duration'],
+            cfg['trailing_stop_activation'], cfg['trailing_stop_distance']
+        )
+        
+        if code == _fast.EXIT_NONE:
+            return None
+        
+        self._sync_stats()
+        
+        exit_reason = self.reason_for_code(code, current_pnl_pct)
+        
+        if self.verbose:
+            print(f"🔍 Observer recommends exit: {exit_reason}")
+            print(f"   Trade duration: {self.trade_stats.candles_in_trade} candles")
+            print(f"   Max profit: {self.trade_stats.max_profit_pct:.2f}%, "
+                  f"Current: {current_pnl_pct:.2f}%")
+        
+        return {
+            'exit_price': close,
+            'exit_reason': exit_reason,
+            'pnl_pct': current_pnl_pct,
+            'candles_in_trade': self.trade_stats.candles_in_trade,
+            'max_profit_pct': self.trade_stats.max_profit_pct,
+            'max_loss_pct': self.trade_stats.max_loss_pct,
+        }
+    
+    def reason_for_code(self, code: int, pnl_pct: float) -> str:
+        """
+        Exit reason text for a core._fast observer exit code.
+        
+        Args:
+            code: One of the _fast.EXIT_* observer codes
+            pnl_pct: PnL % at the exit candle (used by the trailing message)
+            
+        Returns:
+            Same reason string the dict-based checks produce
+        """
+        cfg = self.config
+        if code == _fast.EXIT_EMA_CROSSBACK:
+            return "EMA crossback"
+        if code == _fast.EXIT_STRONG_OPPOSITE:
+            return "Strong opposite momentum"
+        if code == _fast.EXIT_STALL:
+            return f"Price stalled for {cfg['stall_candles']} candles"
+        if code == _fast.EXIT_MAX_DURATION:
+            return f"Max duration reached ({cfg['max_trade_duration']} candles)"
+        return f"Trailing stop hit ({pnl_pct:.2f}% profit)"
+    
+    def _sync_stats(self) -> None:
+        """Copy the numeric update_arrays() state back into trade_stats."""
+        state = self._state
+        self.trade_stats.highest_price = float(state[_fast.OBS_HIGHEST])
+        self.trade_stats.lowest_price = float(state[_fast.OBS_LOWEST])
+        self.trade_stats.max_profit_pct = float(state[_fast.OBS_MAX_PROFIT])
+        self.trade_stats.max_loss_pct = float(state[_fast.OBS_MAX_LOSS])
+        self.trade_stats.candles_in_trade = int(state[_fast.OBS_CANDLES])
+    
+    def _push_price(self, price: float) -> None:
+        """
+        Append a price to the stall window, keeping its running sum.
+        
+        Same subtract-then-add order as _fast.observer_step, so both paths
+        compute the same average.
+        
+        Args:
+            price: Current close
+        """
+        if len(self.price_history) == self._stall_candles:
+            self._price_sum -= self.price_history[0]
+        self._price_sum += price
+        self.price_history.append(price)
+        self._push_extremes(price)
+    
+    def _push_extremes(self, price: float) -> None:
+        """
+        Add a price to the rolling max/min deques (pandas Rolling.max style).
+        
+        Args:
+            price: Price just appended to price_history
+        """
+        i = self._tick
+        self._tick += 1
+        
+        max_dq = self._max_dq
+        while max_dq and max_dq[-1][1] <= price:
+            max_dq.pop()
+        max_dq.append((i, price))
+        
+        min_dq = self._min_dq
+        while min_dq and min_dq[-1][1] >= price:
+            min_dq.pop()
+        min_dq.append((i, price))
+        
+        # Drop entries that have slid out of the stall window
+        oldest = i - self._stall_candles
+        while max_dq[0][0] <= oldest:
+            max_dq.popleft()
+        while min_dq[0][0] <= oldest:
+            min_dq.popleft()
+    
     def _check_exit_conditions(
         self,
         candle: Dict[str, Any],
         ema: Optional[float],
-        current_pnl_pct: float
+        current_pnl_pct: float,
+        index: Optional[int] = None
     ) -> Optional[str]:
         """
         Check all exit conditions.
@@ -175,6 +350,7 @@ class TradeObserver:
             candle: Current candle data
             ema: Current EMA value
             current_pnl_pct: Current profit/loss percentage
+            index: Candle index into candle_metrics (optional)
             
         Returns:
             Exit reason string or None
@@ -184,7 +360,7 @@ class TradeObserver:
             return "EMA crossback"
         
         # 2. Strong opposite momentum candle
-        if self._check_strong_opposite_candle(candle):
+        if self._check_strong_opposite_candle(candle, index):
             return "Strong opposite momentum"
         
         # 3. Price stalls for N candles
@@ -221,7 +397,7 @@ class TradeObserver:
             return False
         
         current_close: float = candle['close']
-        direction: str = self.trade_stats['direction']
+        direction: str = self.trade_stats.direction
         
         if direction == 'BUY':
             # For BUY trade, exit if closes below EMA
@@ -230,17 +406,30 @@ class TradeObserver:
             # For SELL trade, exit if closes above EMA
             return current_close > ema
     
-    def _check_strong_opposite_candle(self, candle: Dict[str, Any]) -> bool:
+    def _check_strong_opposite_candle(
+        self,
+        candle: Dict[str, Any],
+        index: Optional[int] = None
+    ) -> bool:
         """
         Check for strong opposite momentum candle.
         
         Args:
             candle: Current candle data
+            index: Candle index; uses precomputed candle_metrics when set
             
         Returns:
             True if strong opposite candle detected
         """
-        direction: str = self.trade_stats['direction']
+        direction: str = self.trade_stats.direction
+        
+        metrics = self.candle_metrics
+        if index is not None and metrics is not None:
+            if not metrics['strong'][index]:
+                return False
+            opposite = metrics['bearish'][index] if direction == 'BUY' else metrics['bullish'][index]
+            return bool(opposite) and metrics['body'][index] > self._momentum_body_min
+        
         body_size: float = abs(candle['close'] - candle['open'])
         candle_range: float = candle['high'] - candle['low']
         
@@ -259,11 +448,11 @@ class TradeObserver:
         if direction == 'BUY':
             # Strong bearish candle (close < open)
             is_bearish: bool = candle['close'] < candle['open']
-            return is_bearish and body_size > (self.trade_stats['entry_price'] * self.config['momentum_threshold'])
+            return is_bearish and body_size > self._momentum_body_min
         else:  # SELL
             # Strong bullish candle (close > open)
             is_bullish: bool = candle['close'] > candle['open']
-            return is_bullish and body_size > (self.trade_stats['entry_price'] * self.config['momentum_threshold'])
+            return is_bullish and body_size > self._momentum_body_min
     
     def _check_price_stall(self) -> bool:
         """
@@ -272,18 +461,18 @@ class TradeObserver:
         Returns:
             True if price has stalled
         """
-        if len(self.price_history) < self.config['stall_candles']:
+        if len(self.price_history) < self._stall_candles:
             return False
         
-        # Calculate price range over last N candles
-        price_range: float = max(self.price_history) - min(self.price_history)
-        avg_price: float = sum(self.price_history) / len(self.price_history)
+        # Calculate price range over last N candles (all O(1))
+        price_range: float = self._max_dq[0][1] - self._min_dq[0][1]
+        avg_price: float = self._price_sum / len(self.price_history)
         
         # If range is less than 0.1% of average price, consider it stalled
         if avg_price == 0:
             return False
         
-        stall_threshold: float = avg_price * 0.001  # 0.1%
+        stall_threshold: float = avg_price * self._stall_thresh_ratio
         return price_range < stall_threshold
     
     def _check_time_exit(self) -> bool:
@@ -293,7 +482,7 @@ class TradeObserver:
         Returns:
             True if max duration reached
         """
-        return self.trade_stats['candles_in_trade'] >= self.config['max_trade_duration']
+        return self.trade_stats.candles_in_trade >= self._max_duration
     
     def _check_trailing_stop(
         self,
@@ -310,22 +499,22 @@ class TradeObserver:
         Returns:
             Exit reason string or None
         """
-        direction: str = self.trade_stats['direction']
+        direction: str = self.trade_stats.direction
         current_price: float = candle['close']
         
         # Only activate trailing stop after certain profit
-        if abs(current_pnl_pct) < self.config['trailing_stop_activation'] * 100:
+        if abs(current_pnl_pct) < self._trail_activate_pct:
             return None
         
         # Calculate trailing stop level
         if direction == 'BUY':
             # For BUY, trailing stop is below highest price
-            trail_stop_price: float = self.trade_stats['highest_price'] * (1 - self.config['trailing_stop_distance'])
+            trail_stop_price: float = self.trade_stats.highest_price * self._trail_dn_mult
             if current_price <= trail_stop_price:
                 return f"Trailing stop hit ({current_pnl_pct:.2f}% profit)"
         else:  # SELL
             # For SELL, trailing stop is above lowest price
-            trail_stop_price = self.trade_stats['lowest_price'] * (1 + self.config['trailing_stop_distance'])
+            trail_stop_price = self.trade_stats.lowest_price * self._trail_up_mult
             if current_price >= trail_stop_price:
                 return f"Trailing stop hit ({current_pnl_pct:.2f}% profit)"
         
@@ -336,9 +525,11 @@ class TradeObserver:
         Get current trade statistics.
         
         Returns:
-            Copy of trade statistics dictionary
+            Copy of trade statistics as a dictionary
         """
-        return self.trade_stats.copy()
+        if self._arrays_mode:
+            self._sync_stats()
+        return asdict(self.trade_stats)
 
 
 # Test function - FIXED VERSION
@@ -347,7 +538,7 @@ def test_observer() -> None:
     print("🧪 Testing Trade Observer")
     print("=" * 50)
     
-    observer = TradeObserver()
+    observer = TradeObserver({'verbose': True})
     
     # Simulate a BUY trade
     print("\n1. Starting BUY trade at 2050.00")
@@ -367,7 +558,7 @@ def test_observer() -> None:
     
     # Start new trade for EMA crossback test
     print("\n4. Starting new BUY trade at 2050.00")
-    observer2 = TradeObserver()
+    observer2 = TradeObserver({'verbose': True})
     observer2.start_trade('BUY', 2050.00, '2024-01-01 10:00:00')
     
     # Test 3: EMA crossback
@@ -378,7 +569,7 @@ def test_observer() -> None:
     
     # Test stall detection
     print("\n6. Testing stall detection (simulate 10 similar candles):")
-    observer3 = TradeObserver({'stall_candles': 3})  # Shorter for test
+    observer3 = TradeObserver({'stall_candles': 3, 'verbose': True})  # Shorter for test
     observer3.start_trade('BUY', 2050.00, '2024-01-01 10:00:00')
     
     for i in range(5):
@@ -6,7 +6,16 @@ This module provides risk management functions for calculating appropriate
 stop loss and take profit levels based on market conditions and risk parameters.
 """
 
-from typing import Optional, Dict, Any
+import os
+import sys
+from typing import Optional, Dict, Any, Callable, Tuple
+
+import numpy as np
+
+# Allow running this module directly (python core/risk_manager.py)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core._fast import stop_loss_take_profit, SL_BUFFER, MAX_SL_FRACTION
 
 
 class RiskManager:
@@ -22,6 +31,40 @@ class RiskManager:
     - Later can be extended with RR or ATR
     """
     
+    def __init__(self, risk_reward: float = 1.5) -> None:
+        """
+        Args:
+            risk_reward: Risk-reward ratio baked into sl_tp_buy / sl_tp_sell
+        """
+        self.sl_tp_buy, self.sl_tp_sell = RiskManager.make_sl_tp(risk_reward)
+    
+    @staticmethod
+    def make_sl_tp(
+        risk_reward: float = 1.5
+    ) -> Tuple[Callable[[float, float], Tuple[float, float]], Callable[[float, float], Tuple[float, float]]]:
+        """
+        Build direction-specialized SL/TP functions for per-signal loops.
+        
+        Same results as calculate_stop_loss followed by calculate_take_profit
+        (no swing), with the direction and RR fixed up front instead of
+        dispatching on the signal string on every call. Both call the
+        _fast.stop_loss_take_profit kernel the backtest loop uses.
+        
+        Args:
+            risk_reward: Risk-reward ratio
+            
+        Returns:
+            (sl_tp_buy(entry_price, prev_low), sl_tp_sell(entry_price, prev_high)),
+            each returning (stop_loss, take_profit)
+        """
+        def sl_tp_buy(entry_price: float, prev_low: float) -> Tuple[float, float]:
+            return stop_loss_take_profit(1, entry_price, prev_low, prev_low, risk_reward)
+        
+        def sl_tp_sell(entry_price: float, prev_high: float) -> Tuple[float, float]:
+            return stop_loss_take_profit(-1, entry_price, prev_high, prev_high, risk_reward)
+        
+        return sl_tp_buy, sl_tp_sell
+    
     @staticmethod
     def calculate_stop_loss(
         signal: str,
@@ -49,11 +92,10 @@ class RiskManager:
             sl: float = previous_candle['low']
             
             # Optional: Add buffer (e.g., 0.5 pips below)
-            buffer: float = 0.05  # 0.5 pips for XAUUSD
-            sl = sl - buffer
+            sl = sl - SL_BUFFER  # 0.5 pips for XAUUSD
             
             # Ensure SL is reasonable (not too far)
-            max_sl_distance: float = entry_price * 0.01  # Max 1% risk
+            max_sl_distance: float = entry_price * MAX_SL_FRACTION  # Max 1% risk
             if entry_price - sl > max_sl_distance:
                 sl = entry_price - max_sl_distance
             
@@ -64,11 +106,10 @@ class RiskManager:
             sl = previous_candle['high']
             
             # Optional: Add buffer
-            buffer = 0.05
-            sl = sl + buffer
+            sl = sl + SL_BUFFER
             
             # Ensure SL is reasonable
-            max_sl_distance = entry_price * 0.01
+            max_sl_distance = entry_price * MAX_SL_FRACTION
             if sl - entry_price > max_sl_distance:
                 sl = entry_price + max_sl_distance
             
@@ -182,6 +223,81 @@ class RiskManager:
         
         return position_size
 
+    
+    # =========================
+    # BATCH (VECTORIZED) VERSIONS
+    # =========================
+    # Array counterparts of the scalar methods above for parameter sweeps and
+    # walk-forward runs. Signals use the TradingStrategy.signals_vectorized
+    # convention: +1 = BUY, -1 = SELL.
+    
+    @staticmethod
+    def calculate_stop_loss_batch(
+        signals: np.ndarray,
+        entries: np.ndarray,
+        prev_lows: np.ndarray,
+        prev_highs: np.ndarray
+    ) -> np.ndarray:
+        """
+        Stop losses for many signals at once (same rules as calculate_stop_loss).
+        
+        Args:
+            signals: +1 (BUY) / -1 (SELL) per trade
+            entries: Entry prices
+            prev_lows: Previous candle lows
+            prev_highs: Previous candle highs
+            
+        Returns:
+            float64 array of stop loss prices
+        """
+        entries = np.asarray(entries, dtype=np.float64)
+        is_buy = np.asarray(signals) == 1
+        max_sl_distance = entries * MAX_SL_FRACTION
+        
+        buy_sl = np.asarray(prev_lows, dtype=np.float64) - SL_BUFFER
+        buy_sl = np.where(entries - buy_sl > max_sl_distance, entries - max_sl_distance, buy_sl)
+        
+        sell_sl = np.asarray(prev_highs, dtype=np.float64) + SL_BUFFER
+        sell_sl = np.where(sell_sl - entries > max_sl_distance, entries + max_sl_distance, sell_sl)
+        
+        return np.where(is_buy, buy_sl, sell_sl)
+    
+    @staticmethod
+    def calculate_take_profit_batch(
+        signals: np.ndarray,
+        entries: np.ndarray,
+        stop_losses: np.ndarray,
+        risk_reward: float = 1.5,
+        swings: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Take profits for many signals at once (same rules as calculate_take_profit).
+        
+        Args:
+            signals: +1 (BUY) / -1 (SELL) per trade
+            entries: Entry prices
+            stop_losses: Stop loss prices
+            risk_reward: Risk-reward ratio (default: 1.5)
+            swings: Optional swing high (BUY) / low (SELL) per trade, NaN = none
+            
+        Returns:
+            float64 array of take profit prices
+        """
+        entries = np.asarray(entries, dtype=np.float64)
+        stop_losses = np.asarray(stop_losses, dtype=np.float64)
+        is_buy = np.asarray(signals) == 1
+        
+        buy_tp = entries + ((entries - stop_losses) * risk_reward)
+        sell_tp = entries - ((stop_losses - entries) * risk_reward)
+        
+        if swings is not None:
+            # NaN swings compare False, so the RR target is kept
+            swings = np.asarray(swings, dtype=np.float64)
+            buy_tp = np.where(swings > buy_tp, swings, buy_tp)
+            sell_tp = np.where(swings < sell_tp, swings, sell_tp)
+        
+        return np.where(is_buy, buy_tp, sell_tp)
+
 
 # Test the risk manager
 def test_risk_manager() -> None:
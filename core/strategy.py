@@ -8,8 +8,17 @@ Implements the exact 200 EMA crossover strategy:
 - Candle-close only (no repainting)
 """
 
+import os
+import sys
 from typing import Optional, Dict, Any
 
+import numpy as np
+
+# Allow running this module directly (python core/strategy.py)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core._fast import collect_signals, crossover_signal, NUMBA_AVAILABLE
+
 
 class TradingStrategy:
     """
@@ -23,6 +32,7 @@ class TradingStrategy:
     """
 
     TOUCH_THRESHOLD: float = 0.05  # XAUUSD tolerance
+    VERBOSE: bool = False  # Print each signal (noisy/slow in backtests)
 
     # =========================
     # BUY CHECK
@@ -43,12 +53,12 @@ class TradingStrategy:
         prev_close = previous_candle["close"]
         prev_ema = previous_candle["ema_200"]
 
-        closes_above = current_close > current_ema
-        prev_below_or_touching = prev_close <= (prev_ema + TradingStrategy.TOUCH_THRESHOLD)
+        # Closes above AND previous candle below/touching (same kernel as the backtests)
+        buy_signal = crossover_signal(
+            current_close, current_ema, prev_close, prev_ema, TradingStrategy.TOUCH_THRESHOLD
+        ) == 1
 
-        buy_signal = closes_above and prev_below_or_touching
-
-        if buy_signal:
+        if buy_signal and TradingStrategy.VERBOSE:
             print(
                 f"📈 BUY Signal | "
                 f"close={current_close:.2f} > ema={current_ema:.2f} | "
@@ -76,12 +86,12 @@ class TradingStrategy:
         prev_close = previous_candle["close"]
         prev_ema = previous_candle["ema_200"]
 
-        closes_below = current_close < current_ema
-        prev_above_or_touching = prev_close >= (prev_ema - TradingStrategy.TOUCH_THRESHOLD)
-
-        sell_signal = closes_below and prev_above_or_touching
+        # Closes below AND previous candle above/touching (same kernel as the backtests)
+        sell_signal = crossover_signal(
+            current_close, current_ema, prev_close, prev_ema, TradingStrategy.TOUCH_THRESHOLD
+        ) == -1
 
-        if sell_signal:
+        if sell_signal and TradingStrategy.VERBOSE:
             print(
                 f"📉 SELL Signal | "
                 f"close={current_close:.2f} < ema={current_ema:.2f} | "
@@ -105,6 +115,68 @@ class TradingStrategy:
         else:
             return "HOLD"
 
+    # =========================
+    # VECTORIZED SIGNALS (BACKTEST)
+    # =========================
+    @staticmethod
+    def signals_vectorized(
+        close: np.ndarray,
+        ema: np.ndarray,
+        thr: float = TOUCH_THRESHOLD
+    ) -> np.ndarray:
+        """
+        Evaluate the crossover rules for every candle at once.
+
+        Same conditions as check_buy_signal / check_sell_signal, without
+        the per-signal prints. Candles with a NaN EMA never signal.
+
+        Returns:
+            int8 array: +1 = BUY, -1 = SELL, 0 = HOLD
+        """
+        if NUMBA_AVAILABLE:
+            # One fused multi-core pass instead of six temporary arrays.
+            # float32 columns go in as they are: the kernel compares them
+            # against the float64 thr bands, so signals are unchanged
+            close = np.ascontiguousarray(close)
+            ema = np.ascontiguousarray(ema)
+            if close.dtype != np.float32 or ema.dtype != np.float32:
+                close = close.astype(np.float64, copy=False)
+                ema = ema.astype(np.float64, copy=False)
+            return collect_signals(close, ema, thr)
+        ema = np.asarray(ema, dtype=np.float64)
+        return TradingStrategy.signals_from_arrays(close, ema, ema + thr, ema - thr)
+
+    @staticmethod
+    def signals_from_arrays(
+        close: np.ndarray,
+        ema: np.ndarray,
+        ema_up: np.ndarray,
+        ema_dn: np.ndarray
+    ) -> np.ndarray:
+        """
+        Vectorized signals against precomputed touch bands.
+
+        Args:
+            close: Close prices
+            ema: EMA200 values
+            ema_up: ema + TOUCH_THRESHOLD
+            ema_dn: ema - TOUCH_THRESHOLD
+
+        Returns:
+            int8 array: +1 = BUY, -1 = SELL, 0 = HOLD
+        """
+        close = np.asarray(close, dtype=np.float64)
+        ema = np.asarray(ema, dtype=np.float64)
+
+        # Candle i compares against candle i-1; the first candle never signals
+        prev_close = close[:-1]
+        buy = np.zeros(close.shape, dtype=bool)
+        sell = np.zeros(close.shape, dtype=bool)
+        buy[1:] = (close[1:] > ema[1:]) & (prev_close <= ema_up[:-1])
+        sell[1:] = (close[1:] < ema[1:]) & (prev_close >= ema_dn[:-1])
+
+        return buy.astype(np.int8) - sell.astype(np.int8)
+
     # =========================
     # EXPLANATION (NO LOGIC CHANGE)
     # =========================
@@ -148,6 +220,8 @@ def test_strategy() -> None:
     print("🧪 Testing Strategy Logic")
     print("=" * 50)
 
+    TradingStrategy.VERBOSE = True
+
     tests = [
         (
             "BUY case",
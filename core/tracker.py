@@ -10,12 +10,261 @@ Tracks exactly what you asked for:
 - Net profit
 """
 
-import pandas as pd
 import numpy as np
 from datetime import datetime
+import csv
 import json
 import os
-from typing import Optional, Dict, Any, List, Tuple
+import queue
+import threading
+import time
+import weakref
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List, Tuple, Callable
+
+try:
+    import orjson
+except ImportError:  # orjson is optional - fall back to the stdlib encoder
+    orjson = None
+
+
+# One closed trade per row; exit_reason holds a code into
+# TradeRecords.reason_labels. trade_id and the times are object fields so
+# ids of any length/type and timezone-aware datetimes come back unchanged
+TRADE_DTYPE = np.dtype([
+    ('trade_id', 'O'),
+    ('direction', 'U4'),
+    ('entry_time', 'O'),
+    ('exit_time', 'O'),
+    ('duration', 'f8'),
+    ('entry_price', 'f8'),
+    ('exit_price', 'f8'),
+    ('stop_loss', 'f8'),
+    ('take_profit', 'f8'),
+    ('exit_reason', 'i4'),
+    ('pnl', 'f8'),
+    ('pnl_pct', 'f8'),
+    ('rr_achieved', 'f8'),
+    ('max_profit', 'f8'),
+    ('max_loss', 'f8'),
+    ('candles', 'i8'),
+    ('position_size', 'f8'),
+    ('commission', 'f8'),
+    ('swap', 'f8'),
+    ('net_pnl', 'f8'),
+])
+
+
+@dataclass
+class TradeRecords:
+    """
+    Closed trades as a preallocated NumPy struct array (TRADE_DTYPE).
+    
+    One row is written per close_trade (doubling when full) instead of
+    keeping a dict per trade; statistics run as NumPy passes over fields.
+    """
+    capacity: int = 256
+    size: int = 0
+    rows: np.ndarray = field(init=False)
+    
+    # exit_reason dictionary-encoded: codes index into reason_labels, which
+    # grows in first-seen order (observer reasons can embed numbers, so the
+    # set is open-ended)
+    reason_labels: List[str] = field(default_factory=list)
+    _reason_index: Dict[str, int] = field(default_factory=dict)
+    
+    # Running aggregates, updated on append
+    sum_pnl: float = 0.0
+    n_wins: int = 0
+    sum_wins: float = 0.0
+    
+    def __post_init__(self) -> None:
+        self.rows = np.empty(self.capacity, dtype=TRADE_DTYPE)
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    @property
+    def filled(self) -> np.ndarray:
+        """The written rows."""
+        return self.rows[:self.size]
+    
+    def append(self, record: Dict[str, Any]) -> None:
+        """Write one closed trade into the next slot (doubling when full)."""
+        if self.size == self.capacity:
+            self.capacity *= 2
+            rows = np.empty(self.capacity, dtype=TRADE_DTYPE)
+            rows[:self.size] = self.rows
+            self.rows = rows
+        
+        row = self.rows[self.size]
+        row['trade_id'] = record['trade_id']
+        row['direction'] = record['direction']
+        row['entry_time'] = record['entry_time']
+        row['exit_time'] = record['exit_time']
+        row['duration'] = record['duration_minutes']
+        row['entry_price'] = record['entry_price']
+        row['exit_price'] = record['exit_price']
+        row['stop_loss'] = record['stop_loss']
+        row['take_profit'] = record['take_profit']
+        row['exit_reason'] = self._intern_reason(record['exit_reason'])
+        row['pnl'] = record['pnl']
+        row['pnl_pct'] = record['pnl_pct']
+        row['rr_achieved'] = record['risk_reward_achieved']
+        row['max_profit'] = record['max_profit_pct']
+        row['max_loss'] = record['max_loss_pct']
+        row['candles'] = record['candles_in_trade']
+        row['position_size'] = record['position_size']
+        row['commission'] = record['commission']
+        row['swap'] = record['swap']
+        row['net_pnl'] = record['net_pnl']
+        self.size += 1
+        
+        pnl = record['pnl']
+        self.sum_pnl += pnl
+        if pnl > 0:
+            self.n_wins += 1
+            self.sum_wins += pnl
+    
+    def _intern_reason(self, reason: str) -> int:
+        """Return the code for an exit reason, adding it if unseen."""
+        code = self._reason_index.get(reason)
+        if code is None:
+            code = self._reason_index[reason] = len(self.reason_labels)
+            self.reason_labels.append(reason)
+        return code
+    
+    def exit_reason_counts(self) -> List[Tuple[str, int]]:
+        """
+        Count closed trades per exit reason with one bincount over the codes.
+        
+        Returns:
+            (reason, count) pairs, most frequent first (ties in first-seen order)
+        """
+        counts = np.bincount(self.filled['exit_reason'], minlength=len(self.reason_labels))
+        order = np.argsort(-counts, kind='stable')
+        return [(self.reason_labels[i], int(counts[i])) for i in order if counts[i]]
+    
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Rebuild the closed trades as CSV_HEADERS-keyed dicts (for reports)."""
+        labels = self.reason_labels
+        trades = []
+        # tolist() converts each row to Python str/float/int/datetime values
+        for (trade_id, direction, entry_time, exit_time, duration, entry_price,
+             exit_price, stop_loss, take_profit, reason, pnl, pnl_pct, rr_achieved,
+             max_profit, max_loss, candles, position_size, commission, swap,
+             net_pnl) in self.filled.tolist():
+            trades.append({
+                'trade_id': trade_id,
+                'entry_time': entry_time,
+                'exit_time': exit_time,
+                'duration_minutes': duration,
+                'direction': direction,
+                'entry_price': entry_price,
+                'exit_price': exit_price,
+                'stop_loss': stop_loss,
+                'take_profit': take_profit,
+                'exit_reason': labels[reason],
+                'pnl': pnl,
+                'pnl_pct': pnl_pct,
+                'risk_reward_achieved': rr_achieved,
+                'max_profit_pct': max_profit,
+                'max_loss_pct': max_loss,
+                'candles_in_trade': candles,
+                'position_size': position_size,
+                'commission': commission,
+                'swap': swap,
+                'net_pnl': net_pnl
+            })
+        return trades
+
+
+class TradeHistory:
+    """
+    Per-candle price/PnL history of the open trade.
+    
+    Preallocated NumPy columns (doubling when full) instead of one dict per
+    candle. The tracker reuses a single instance across trades. Timestamps
+    are kept as objects so timezone-aware datetimes are stored unchanged.
+    """
+    
+    def __init__(self, capacity: int = 128) -> None:
+        self.size: int = 0
+        self.timestamp: np.ndarray = np.empty(capacity, dtype=object)
+        self.price: np.ndarray = np.empty(capacity, dtype=np.float64)
+        self.pnl: np.ndarray = np.empty(capacity, dtype=np.float64)
+        self.pnl_pct: np.ndarray = np.empty(capacity, dtype=np.float64)
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    def reset(self) -> None:
+        """Forget all entries, keeping the allocated buffers."""
+        self.size = 0
+    
+    def append(self, timestamp: datetime, price: float, pnl: float, pnl_pct: float) -> None:
+        """Write one candle into the next slot."""
+        i = self.size
+        if i == len(self.price):
+            capacity = 2 * i
+            self.timestamp = np.resize(self.timestamp, capacity)
+            self.price = np.resize(self.price, capacity)
+            self.pnl = np.resize(self.pnl, capacity)
+            self.pnl_pct = np.resize(self.pnl_pct, capacity)
+        
+        self.timestamp[i] = timestamp
+        self.price[i] = price
+        self.pnl[i] = pnl
+        self.pnl_pct[i] = pnl_pct
+        self.size = i + 1
+    
+    def to_dict(self) -> Dict[str, np.ndarray]:
+        """Return the filled part of each column."""
+        n = self.size
+        return {
+            'timestamp': self.timestamp[:n],
+            'price': self.price[:n],
+            'pnl': self.pnl[:n],
+            'pnl_pct': self.pnl_pct[:n]
+        }
+
+
+def _csv_writer_loop(batches: queue.Queue, writer: csv.DictWriter, fh) -> None:
+    """
+    TradeTracker's writer thread: append queued row batches to the log.
+    
+    The file is flushed once the queue runs dry, so a burst of batches
+    costs one flush. A None batch stops the thread.
+    """
+    while True:
+        rows = batches.get()
+        try:
+            if rows is None:
+                return
+            writer.writerows(rows)
+            if batches.empty():
+                fh.flush()
+        except Exception as e:
+            print(f"❌ Error saving trade to CSV: {e}")
+        finally:
+            batches.task_done()
+
+
+def _flush_and_close(
+    fh,
+    rows: List[Dict[str, Any]],
+    batches: queue.Queue,
+    thread: threading.Thread
+) -> None:
+    """Finalizer for TradeTracker: queue leftover rows, drain the writer and close the log."""
+    try:
+        if rows:
+            batches.put(list(rows))
+            rows.clear()
+        batches.put(None)
+        thread.join()
+    finally:
+        fh.close()
 
 
 class TradeTracker:
@@ -26,34 +275,78 @@ class TradeTracker:
     PnL, win rate, profit factor, and exit reasons.
     """
     
-    def __init__(self, log_file: str = "logs/trades_log.csv") -> None:
+    CSV_HEADERS: List[str] = [
+        'trade_id', 'entry_time', 'exit_time', 'duration_minutes',
+        'direction', 'entry_price', 'exit_price', 'stop_loss', 'take_profit',
+        'exit_reason', 'pnl', 'pnl_pct', 'risk_reward_achieved',
+        'max_profit_pct', 'max_loss_pct', 'candles_in_trade',
+        'position_size', 'commission', 'swap', 'net_pnl'
+    ]
+    
+    def __init__(
+        self,
+        log_file: str = "logs/trades_log.csv",
+        flush_threshold: int = 32,
+        flush_interval: float = 5.0
+    ) -> None:
         """
         Initialize trade tracker.
         
         Args:
             log_file: Path to CSV file for logging trades
+            flush_threshold: Buffered trades that trigger a CSV write
+            flush_interval: Max seconds a closed trade waits in the buffer
         """
         self.log_file: str = log_file
-        self.trades: List[Dict[str, Any]] = []
+        self.records: TradeRecords = TradeRecords()
         self.current_trade: Optional[Dict[str, Any]] = None
         
-        # Initialize log file if it doesn't exist
+        # Per-trade PnL/reward functions and risk, bound in start_trade
+        self._compute_pnl: Optional[Callable[[float], Tuple[float, float]]] = None
+        self._compute_reward: Optional[Callable[[float], float]] = None
+        self._risk: float = 0.0
+        self._history: TradeHistory = TradeHistory()
+        
+        # get_statistics memo, invalidated by bumping _trades_version
+        self._trades_version: int = 0
+        self._stats_cache: Optional[Dict[str, Any]] = None
+        self._stats_cache_version: int = -1
+        
+        # Closed trades waiting to be handed to the writer thread (see _flush_csv)
+        self._pending_rows: List[Dict[str, Any]] = []
+        self._flush_threshold: int = flush_threshold
+        self._flush_interval: float = flush_interval
+        self._last_flush: float = time.monotonic()
+        
+        # Open the log once for the tracker's lifetime (headers on creation).
+        # A background thread does the writes so closing a trade never waits
+        # on disk; leftovers are written when the tracker is collected or at exit
         self._init_log_file()
+        self._write_queue: queue.Queue = queue.Queue()
+        self._writer_thread = threading.Thread(
+            target=_csv_writer_loop,
+            args=(self._write_queue, self._csv_writer, self._log_fh),
+            name="trade-log-writer",
+            daemon=True
+        )
+        self._writer_thread.start()
+        self._finalizer = weakref.finalize(
+            self, _flush_and_close, self._log_fh, self._pending_rows,
+            self._write_queue, self._writer_thread
+        )
     
     def _init_log_file(self) -> None:
-        """Initialize the log file with headers"""
-        if not os.path.exists(self.log_file):
+        """Open the log file for appending, writing headers if it is new"""
+        is_new = not os.path.exists(self.log_file)
+        if is_new:
             os.makedirs(os.path.dirname(self.log_file), exist_ok=True)
-            
-            headers = [
-                'trade_id', 'entry_time', 'exit_time', 'duration_minutes',
-                'direction', 'entry_price', 'exit_price', 'stop_loss', 'take_profit',
-                'exit_reason', 'pnl', 'pnl_pct', 'risk_reward_achieved',
-                'max_profit_pct', 'max_loss_pct', 'candles_in_trade',
-                'position_size', 'commission', 'swap', 'net_pnl'
-            ]
-            
-            pd.DataFrame(columns=headers).to_csv(self.log_file, index=False)
+        
+        self._log_fh = open(self.log_file, 'a', newline='', buffering=1 << 16)
+        self._csv_writer = csv.DictWriter(self._log_fh, fieldnames=self.CSV_HEADERS, lineterminator='\n')
+        
+        if is_new:
+            self._csv_writer.writeheader()
+            self._log_fh.flush()
             print(f"📝 Initialized trade log: {self.log_file}")
     
     def start_trade(
@@ -78,6 +371,10 @@ class TradeTracker:
             position_size: Position size in lots (default: 0.01)
             entry_time: Entry timestamp (default: current time)
         """
+        self._history.reset()
+        self._compute_pnl, self._compute_reward, self._risk = self._make_trade_fns(
+            direction, entry_price, stop_loss, position_size
+        )
         self.current_trade = {
             'trade_id': trade_id,
             'entry_time': entry_time or datetime.now(),
@@ -91,11 +388,47 @@ class TradeTracker:
             'candles_in_trade': 0,
             'commission': 0,  # Could calculate based on broker
             'swap': 0,        # Could calculate based on holding time
-            'history': []     # Price history during trade
+            'history': self._history  # Price history during trade
         }
         
         print(f"📊 Started tracking trade {trade_id}: {direction} at {entry_price:.2f}")
     
+    @staticmethod
+    def _make_trade_fns(
+        direction: str,
+        entry: float,
+        stop_loss: float,
+        size: float
+    ) -> Tuple[Callable[[float], Tuple[float, float]], Callable[[float], float], float]:
+        """
+        Build PnL/reward functions specialized for one trade's direction.
+        
+        Entry, size and direction are bound once, so update_trade and
+        close_trade run without direction compares or dict lookups.
+        
+        Returns:
+            Tuple of (price -> (pnl, pnl_pct), price -> reward, initial risk)
+        """
+        if direction == 'BUY':
+            def compute_pnl(price: float) -> Tuple[float, float]:
+                diff = price - entry
+                return diff * size * 100, diff / entry * 100
+            
+            def compute_reward(price: float) -> float:
+                return price - entry
+            
+            return compute_pnl, compute_reward, entry - stop_loss
+        
+        # SELL
+        def compute_pnl(price: float) -> Tuple[float, float]:
+            diff = entry - price
+            return diff * size * 100, diff / entry * 100
+        
+        def compute_reward(price: float) -> float:
+            return entry - price
+        
+        return compute_pnl, compute_reward, stop_loss - entry
+    
     def update_trade(
         self,
         current_price: float,
@@ -117,24 +450,16 @@ class TradeTracker:
         self.current_trade['candles_in_trade'] += 1
         
         # Calculate current PnL
-        if self.current_trade['direction'] == 'BUY':
-            pnl: float = (current_price - self.current_trade['entry_price']) * self.current_trade['position_size'] * 100
-            pnl_pct: float = (current_price - self.current_trade['entry_price']) / self.current_trade['entry_price'] * 100
-        else:  # SELL
-            pnl = (self.current_trade['entry_price'] - current_price) * self.current_trade['position_size'] * 100
-            pnl_pct = (self.current_trade['entry_price'] - current_price) / self.current_trade['entry_price'] * 100
+        pnl, pnl_pct = self._compute_pnl(current_price)
         
         # Update max profit/loss
-        self.current_trade['max_profit_pct'] = max(self.current_trade['max_profit_pct'], pnl_pct)
-        self.current_trade['max_loss_pct'] = min(self.current_trade['max_loss_pct'], pnl_pct)
+        if pnl_pct > self.current_trade['max_profit_pct']:
+            self.current_trade['max_profit_pct'] = pnl_pct
+        elif pnl_pct < self.current_trade['max_loss_pct']:
+            self.current_trade['max_loss_pct'] = pnl_pct
         
         # Add to history
-        self.current_trade['history'].append({
-            'timestamp': current_time or datetime.now(),
-            'price': current_price,
-            'pnl': pnl,
-            'pnl_pct': pnl_pct
-        })
+        self._history.append(current_time or datetime.now(), current_price, pnl, pnl_pct)
         
         return pnl, pnl_pct
     
@@ -159,33 +484,9 @@ class TradeTracker:
             print("❌ No active trade to close")
             return None
         
-        # Calculate final PnL
-        if self.current_trade['direction'] == 'BUY':
-            pnl: float = (exit_price - self.current_trade['entry_price']) * self.current_trade['position_size'] * 100
-            pnl_pct: float = (exit_price - self.current_trade['entry_price']) / self.current_trade['entry_price'] * 100
-        else:  # SELL
-            pnl = (self.current_trade['entry_price'] - exit_price) * self.current_trade['position_size'] * 100
-            pnl_pct = (self.current_trade['entry_price'] - exit_price) / self.current_trade['entry_price'] * 100
-        
-        # Calculate risk/reward achieved
-        entry: float = self.current_trade['entry_price']
-        sl: float = self.current_trade['stop_loss']
-        tp: Optional[float] = self.current_trade['take_profit']
-        
-        if self.current_trade['direction'] == 'BUY':
-            risk: float = entry - sl
-            reward: float = tp - entry if tp else 0
-        else:  # SELL
-            risk = sl - entry
-            reward = entry - tp if tp else 0
-        
-        risk_reward_achieved: float = 0
-        if risk > 0:
-            if self.current_trade['direction'] == 'BUY':
-                reward_achieved: float = exit_price - entry
-            else:
-                reward_achieved = entry - exit_price
-            risk_reward_achieved = reward_achieved / risk
+        # Calculate final PnL and risk/reward achieved
+        pnl, pnl_pct = self._compute_pnl(exit_price)
+        rr_achieved: float = self._compute_reward(exit_price) / self._risk if self._risk > 0 else 0
         
         # Calculate net PnL (including commission and swap)
         net_pnl: float = pnl - self.current_trade['commission'] + self.current_trade['swap']
@@ -199,27 +500,27 @@ class TradeTracker:
             'trade_id': self.current_trade['trade_id'],
             'entry_time': self.current_trade['entry_time'],
             'exit_time': exit_time,
-            'duration_minutes': round(duration, 2),
+            'duration_minutes': duration,
             'direction': self.current_trade['direction'],
             'entry_price': self.current_trade['entry_price'],
             'exit_price': exit_price,
             'stop_loss': self.current_trade['stop_loss'],
             'take_profit': self.current_trade['take_profit'],
             'exit_reason': exit_reason,
-            'pnl': round(pnl, 2),
-            'pnl_pct': round(pnl_pct, 2),
-            'risk_reward_achieved': round(risk_reward_achieved, 2),
-            'max_profit_pct': round(self.current_trade['max_profit_pct'], 2),
-            'max_loss_pct': round(self.current_trade['max_loss_pct'], 2),
+            'pnl': pnl,
+            'pnl_pct': pnl_pct,
+            'risk_reward_achieved': rr_achieved,
+            'max_profit_pct': self.current_trade['max_profit_pct'],
+            'max_loss_pct': self.current_trade['max_loss_pct'],
             'candles_in_trade': self.current_trade['candles_in_trade'],
             'position_size': self.current_trade['position_size'],
             'commission': self.current_trade['commission'],
             'swap': self.current_trade['swap'],
-            'net_pnl': round(net_pnl, 2)
+            'net_pnl': net_pnl
         }
         
-        # Add to trades list
-        self.trades.append(trade_record)
+        # Add to the trade records (used for statistics and reports)
+        self.records.append(trade_record)
         
         # Save to CSV
         self._save_to_csv(trade_record)
@@ -229,21 +530,48 @@ class TradeTracker:
         
         # Clear current trade
         self.current_trade = None
+        self._trades_version += 1
         
         return trade_record
     
     def _save_to_csv(self, trade_record: Dict[str, Any]) -> None:
         """
-        Save trade record to CSV file.
+        Queue trade record for the CSV file.
+        
+        Rows are buffered and handed to the writer thread in batches by
+        _flush_csv once flush_threshold trades are pending or
+        flush_interval has passed.
         
         Args:
             trade_record: Dictionary with trade data
         """
-        try:
-            df = pd.DataFrame([trade_record])
-            df.to_csv(self.log_file, mode='a', header=False, index=False)
-        except Exception as e:
-            print(f"❌ Error saving trade to CSV: {e}")
+        if not self._finalizer.alive:
+            print(f"⚠️  Trade log {self.log_file} is closed; trade {trade_record['trade_id']} not written")
+            return
+        
+        self._pending_rows.append(trade_record)
+        
+        if (len(self._pending_rows) >= self._flush_threshold
+                or time.monotonic() - self._last_flush >= self._flush_interval):
+            self._flush_csv()
+    
+    def _flush_csv(self) -> None:
+        """Hand all buffered trade records to the writer thread as one batch."""
+        self._last_flush = time.monotonic()
+        if not self._pending_rows:
+            return
+        
+        self._write_queue.put(list(self._pending_rows))
+        self._pending_rows.clear()
+    
+    def flush(self) -> None:
+        """Write any buffered trades to the CSV log now (waits for the writer)."""
+        self._flush_csv()
+        self._write_queue.join()
+    
+    def close(self) -> None:
+        """Write any buffered trades, stop the writer thread and close the CSV log."""
+        self._finalizer()
     
     def _print_trade_summary(self, trade: Dict[str, Any]) -> None:
         """
@@ -266,10 +594,19 @@ class TradeTracker:
         """
         Calculate and return trade statistics.
         
+        Results are memoized until the next close_trade.
+        
         Returns:
             Dictionary with comprehensive trade statistics
         """
-        if not self.trades:
+        if self._stats_cache_version != self._trades_version:
+            self._stats_cache = self._compute_statistics()
+            self._stats_cache_version = self._trades_version
+        return dict(self._stats_cache)
+    
+    def _compute_statistics(self) -> Dict[str, Any]:
+        """Statistics over all closed trades (uncached, see get_statistics)."""
+        if not self.records.size:
             return {
                 'total_trades': 0,
                 'profitable_trades': 0,
@@ -285,31 +622,32 @@ class TradeTracker:
                 'expectancy': 0
             }
         
-        # Convert to DataFrame for easier analysis
-        df = pd.DataFrame(self.trades)
+        # Counts and sums come from the running aggregates; only the
+        # extremes need a pass over the PnL field
+        cols = self.records
+        pnl = cols.filled['pnl']
         
         # Basic statistics
-        total_trades: int = len(df)
-        profitable_trades: int = len(df[df['pnl'] > 0])
-        losing_trades: int = len(df[df['pnl'] <= 0])
+        total_trades: int = cols.size
+        profitable_trades: int = cols.n_wins
+        losing_trades: int = total_trades - profitable_trades
         win_rate: float = (profitable_trades / total_trades * 100) if total_trades > 0 else 0
         
         # PnL statistics
-        total_pnl: float = df['pnl'].sum()
-        avg_pnl: float = df['pnl'].mean()
+        total_pnl: float = cols.sum_pnl
+        avg_pnl: float = total_pnl / total_trades
         
-        winning_trades = df[df['pnl'] > 0]
-        losing_trades_df = df[df['pnl'] <= 0]
+        gross_profit: float = cols.sum_wins
+        loss_sum: float = total_pnl - gross_profit
         
-        avg_win: float = winning_trades['pnl'].mean() if len(winning_trades) > 0 else 0
-        avg_loss: float = losing_trades_df['pnl'].mean() if len(losing_trades_df) > 0 else 0
+        avg_win: float = gross_profit / profitable_trades if profitable_trades > 0 else 0
+        avg_loss: float = loss_sum / losing_trades if losing_trades > 0 else 0
         
-        largest_win: float = df['pnl'].max()
-        largest_loss: float = df['pnl'].min()
+        largest_win: float = float(pnl.max())
+        largest_loss: float = float(pnl.min())
         
         # Advanced metrics
-        gross_profit: float = winning_trades['pnl'].sum() if len(winning_trades) > 0 else 0
-        gross_loss: float = abs(losing_trades_df['pnl'].sum()) if len(losing_trades_df) > 0 else 0
+        gross_loss: float = abs(loss_sum) if losing_trades > 0 else 0
         
         profit_factor: float = gross_profit / gross_loss if gross_loss > 0 else float('inf')
         
@@ -335,6 +673,7 @@ class TradeTracker:
     
     def print_summary_report(self) -> None:
         """Print a comprehensive summary report"""
+        self.flush()
         stats = self.get_statistics()
         
         print("\n" + "="*60)
@@ -359,12 +698,9 @@ class TradeTracker:
         print(f"   Expectancy: ${stats['expectancy']:.2f}")
         
         if stats['total_trades'] > 0:
-            # Analyze exit reasons
-            df = pd.DataFrame(self.trades)
-            exit_reasons = df['exit_reason'].value_counts()
-            
+            # Analyze exit reasons (counted on the int codes)
             print(f"\n🔍 Exit Reason Analysis:")
-            for reason, count in exit_reasons.items():
+            for reason, count in self.records.exit_reason_counts():
                 percentage = (count / stats['total_trades']) * 100
                 print(f"   {reason}: {count} trades ({percentage:.1f}%)")
         
@@ -377,14 +713,24 @@ class TradeTracker:
         Args:
             filename: Path to output JSON file
         """
+        self.flush()
+        
         report = {
             'summary': self.get_statistics(),
-            'trades': self.trades,
+            'trades': self.records.to_dicts(),
             'generated_at': datetime.now().isoformat()
         }
         
-        with open(filename, 'w') as f:
-            json.dump(report, f, indent=2, default=str)
+        if orjson is not None:
+            # Native datetime/NumPy encoding; default=str only for stragglers
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(
+                    report, default=str,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+                ))
+        else:
+            with open(filename, 'w') as f:
+                json.dump(report, f, indent=2, default=str)
         
         print(f"📄 Detailed report saved to: {filename}")
 
@@ -4,22 +4,29 @@ Generate synthetic XAUUSD M1 data in MT5 CSV format.
 This creates realistic price movements for development and testing.
 """
 
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-import random
+from datetime import datetime
+
+from core._fast import clamped_walk
 
-def generate_xauusd_data(days=30, start_price=2030.0):
+def generate_xauusd_data(days=30, start_price=2030.0, seed=None):
     """
     Generate synthetic XAUUSD M1 data.
     
     Args:
         days: Number of trading days to generate
         start_price: Starting price for XAUUSD
+        seed: Optional seed for reproducible output
     
     Returns:
         DataFrame with MT5-format data
     """
+    rng = np.random.default_rng(seed)
     
     # XAUUSD trades 24/5 (Monday 00:00 to Friday 23:59)
     minutes_per_day = 24 * 60
@@ -27,92 +34,65 @@ def generate_xauusd_data(days=30, start_price=2030.0):
     
     # Generate timestamps
     start_date = datetime(2024, 1, 1, 0, 0, 0)
-    timestamps = [start_date + timedelta(minutes=i) for i in range(total_minutes)]
+    timestamps = pd.date_range(start_date, periods=total_minutes, freq='min')
     
     # Remove weekends (keep only Monday-Friday)
     # In reality, XAUUSD trades Friday 23:59 to Sunday 23:59 is closed, but we'll simplify
-    timestamps = [ts for ts in timestamps if ts.weekday() < 5]
-    
-    # Generate price movements
-    prices = []
-    current_price = start_price
-    
-    for i in range(len(timestamps)):
-        # Time-based volatility (higher during London/NY overlap)
-        hour = timestamps[i].hour
-        if 13 <= hour <= 17:  # London/NY overlap
-            volatility = 0.0015  # 0.15%
-        elif 8 <= hour <= 12:  # London session
-            volatility = 0.0010  # 0.10%
-        elif 18 <= hour <= 22:  # NY session
-            volatility = 0.0012  # 0.12%
-        else:  # Asian session
-            volatility = 0.0005  # 0.05%
-        
-        # Random walk with drift
-        change = np.random.normal(0.00001, volatility)  # Slight upward drift
-        current_price = current_price * (1 + change)
-        
-        # Add some spikes (news events)
-        if random.random() < 0.001:  # 0.1% chance of news spike
-            spike = np.random.choice([-1, 1]) * volatility * 5
-            current_price = current_price * (1 + spike)
-        
-        # Ensure price stays in reasonable range
-        current_price = max(1950.0, min(2100.0, current_price))
-        
-        prices.append(current_price)
-    
-    # Create OHLC data from prices
-    data = []
-    
-    for i in range(len(timestamps)):
-        base_price = prices[i]
-        
-        # Create realistic candle ranges
-        if random.random() < 0.7:  # 70% normal candles
-            candle_range = base_price * 0.0003  # 0.03% range
-        else:  # 30% wider candles
-            candle_range = base_price * 0.0008  # 0.08% range
-        
-        # Generate OHLC
-        open_price = base_price
-        high_price = open_price + abs(np.random.normal(0, candle_range/2))
-        low_price = open_price - abs(np.random.normal(0, candle_range/2))
-        close_price = low_price + abs(high_price - low_price) * random.random()
-        
-        # Ensure proper ordering
-        prices_sorted = sorted([open_price, high_price, low_price, close_price])
-        low_price = prices_sorted[0]
-        high_price = prices_sorted[3]
-        
-        # Adjust open/close to be within range
-        open_price = np.random.uniform(low_price + (high_price - low_price) * 0.3, 
-                                       low_price + (high_price - low_price) * 0.7)
-        close_price = np.random.uniform(low_price + (high_price - low_price) * 0.3, 
-                                        low_price + (high_price - low_price) * 0.7)
-        
-        # Volume (tick volume)
-        if 13 <= hour <= 17:  # High volume during overlap
-            tick_vol = random.randint(100, 300)
-        else:
-            tick_vol = random.randint(20, 150)
-        
-        # Spread (typical XAUUSD spread)
-        spread = random.choice([10, 15, 20, 25, 30])
-        
-        data.append({
-            'timestamp': timestamps[i],
-            'open': round(open_price, 2),
-            'high': round(high_price, 2),
-            'low': round(low_price, 2),
-            'close': round(close_price, 2),
-            'tick_vol': tick_vol,
-            'real_vol': 0,  # MT5 often has 0 for real volume in forex
-            'spread': spread
-        })
-    
-    return pd.DataFrame(data)
+    timestamps = timestamps[timestamps.dayofweek < 5]
+    n = len(timestamps)
+    hours = timestamps.hour.values
+    
+    # Time-based volatility (higher during London/NY overlap)
+    overlap = (hours >= 13) & (hours <= 17)
+    volatility = np.select(
+        [overlap,                           # London/NY overlap
+         (hours >= 8) & (hours <= 12),      # London session
+         (hours >= 18) & (hours <= 22)],    # NY session
+        [0.0015, 0.0010, 0.0012],
+        default=0.0005                      # Asian session
+    )
+    
+    # Random walk with drift (slight upward drift)
+    changes = rng.normal(0.00001, volatility)
+    growth = 1 + changes
+    
+    # Add some spikes (news events, 0.1% chance per candle)
+    spikes = rng.random(n) < 0.001
+    growth[spikes] *= 1 + rng.choice([-1, 1], spikes.sum()) * volatility[spikes] * 5
+    
+    # Ensure price stays in reasonable range (clamped at every step)
+    prices = clamped_walk(growth, start_price, 1950.0, 2100.0)
+    
+    # Create realistic candle ranges: 70% normal (0.03%), 30% wider (0.08%)
+    candle_range = prices * np.where(rng.random(n) < 0.7, 0.0003, 0.0008)
+    
+    # Generate OHLC: wicks above/below the walk price, then open/close
+    # drawn in the middle 30-70% of the candle (one batched draw each)
+    wicks = np.abs(rng.standard_normal((n, 2))) * (candle_range / 2)[:, None]
+    high_price = prices + wicks[:, 0]
+    low_price = prices - wicks[:, 1]
+    span = high_price - low_price
+    oc = low_price[:, None] + span[:, None] * (0.3 + 0.4 * rng.random((n, 2)))
+    open_price, close_price = oc[:, 0], oc[:, 1]
+    
+    # Volume (tick volume), higher during overlap
+    tick_vol = np.where(overlap, rng.integers(100, 301, n), rng.integers(20, 151, n))
+    
+    # Spread (typical XAUUSD spread)
+    spread = rng.choice([10, 15, 20, 25, 30], n)
+    
+    # float32 holds 2-decimal gold prices exactly enough (~7 significant
+    # digits); volume and spread fit in small unsigned ints
+    return pd.DataFrame({
+        'timestamp': timestamps,
+        'open': open_price.round(2).astype(np.float32),
+        'high': high_price.round(2).astype(np.float32),
+        'low': low_price.round(2).astype(np.float32),
+        'close': close_price.round(2).astype(np.float32),
+        'tick_vol': tick_vol.astype(np.uint16),
+        'real_vol': np.zeros(n, dtype=np.uint8),  # MT5 often has 0 for real volume in forex
+        'spread': spread.astype(np.uint8)
+    })
 
 def save_mt5_format(df, filename):
     """
@@ -124,22 +104,20 @@ def save_mt5_format(df, filename):
     """
     
     # Format timestamp as MT5 expects
-    df['timestamp_str'] = df['timestamp'].dt.strftime('"%Y.%m.%d %H:%M"')
-    
-    # Create the CSV content
-    mt5_lines = []
-    
-    # Header
-    mt5_lines.append('<TICKER>;<PER>;<DATE>;<TIME>;<OPEN>;<HIGH>;<LOW>;<CLOSE>;<VOL>')
-    
-    # Data rows
-    for _, row in df.iterrows():
-        line = f'{row["timestamp_str"]};{row["open"]};{row["high"]};{row["low"]};{row["close"]};{row["tick_vol"]};{row["real_vol"]};{row["spread"]}'
-        mt5_lines.append(line)
-    
-    # Write to file
-    with open(filename, 'w') as f:
-        f.write('\n'.join(mt5_lines))
+    timestamp_str = df['timestamp'].dt.strftime('"%Y.%m.%d %H:%M"')
+    
+    # Build all data rows in one vectorized string concat
+    rows = timestamp_str
+    for col in ['open', 'high', 'low', 'close', 'tick_vol', 'real_vol', 'spread']:
+        rows = rows + ';' + df[col].astype(str)
+    
+    # Header, then the rows, in a single buffered write
+    header = '<TICKER>;<PER>;<DATE>;<TIME>;<OPEN>;<HIGH>;<LOW>;<CLOSE>;<VOL>'
+    with open(filename, 'w', buffering=1 << 20) as f:
+        f.write(header)
+        if len(rows):
+            f.write('\n')
+            f.write('\n'.join(rows.tolist()))
     
     print(f"✅ Generated {len(df)} candles")
     print(f"📁 Saved to: {filename}")
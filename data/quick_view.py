@@ -7,7 +7,10 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import numpy as np
 from core.market import MT5MarketData
+from core._fast import ema_mt5
+from data.view_data import find_crossings
 import matplotlib.pyplot as plt
 
 def quick_view():
@@ -15,9 +18,12 @@ def quick_view():
     
     data_path = "data/historical_xauusd_m1.csv"
     market = MT5MarketData(data_path)
-    market.load_data()
-    market.calculate_ema_mt5()
-    df = market.get_dataframe()
+    
+    # The EMA at bar i only depends on closes[0..i], so the first 1200
+    # closes (read from the Parquet cache) are all this view needs
+    df = market.load_columns(['close'], nrows=1200)
+    close = df['close'].to_numpy(dtype=np.float64)
+    df['ema_200'] = ema_mt5(close, market.ema_period, 2 / (market.ema_period + 1)).astype(np.float32)
     
     # Take first 1000 candles for quick view
     df_sample = df.iloc[200:1200]  # Skip first 200 for EMA
@@ -27,10 +33,9 @@ def quick_view():
     plt.plot(df_sample.index, df_sample['ema_200'], label='EMA 200', linewidth=1.5, color='red')
     
     # Mark crossings
-    above = df_sample['close'] > df_sample['ema_200']
-    crossings = (above != above.shift(1))
-    buy_points = df_sample[crossings & above]
-    sell_points = df_sample[crossings & ~above]
+    buy_idx, sell_idx = find_crossings(df_sample['close'].values, df_sample['ema_200'].values)
+    buy_points = df_sample.iloc[buy_idx]
+    sell_points = df_sample.iloc[sell_idx]
     
     plt.scatter(buy_points.index, buy_points['close'], color='green', 
                 s=40, marker='^', label='Buy Signal', zorder=5)
@@ -7,9 +7,26 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import numpy as np
 from core.market import MT5MarketData
 import matplotlib.pyplot as plt
 
+def find_crossings(close, ema):
+    """
+    Find where close crosses EMA, on the raw arrays.
+    
+    Args:
+        close: Close prices
+        ema: EMA values (same length)
+    
+    Returns:
+        Tuple of (cross-above positions, cross-below positions)
+    """
+    above = np.asarray(close) > np.asarray(ema)
+    cross = np.zeros_like(above)
+    np.not_equal(above[1:], above[:-1], out=cross[1:])
+    return np.flatnonzero(cross & above), np.flatnonzero(cross & ~above)
+
 def visualize_data():
     """Load and visualize the synthetic data"""
     
@@ -45,12 +62,9 @@ def visualize_data():
     
     # Add buy/sell signals example
     # Find where price crosses EMA
-    df_valid['above_ema'] = df_valid['close'] > df_valid['ema_200']
-    df_valid['cross_above'] = (df_valid['above_ema'] == True) & (df_valid['above_ema'].shift(1) == False)
-    df_valid['cross_below'] = (df_valid['above_ema'] == False) & (df_valid['above_ema'].shift(1) == True)
-    
-    buy_signals = df_valid[df_valid['cross_above']]
-    sell_signals = df_valid[df_valid['cross_below']]
+    buy_idx, sell_idx = find_crossings(df_valid['close'].values, df_valid['ema_200'].values)
+    buy_signals = df_valid.iloc[buy_idx]
+    sell_signals = df_valid.iloc[sell_idx]
     
     ax1.scatter(buy_signals.index, buy_signals['close'], 
                 color='green', s=30, marker='^', label='Potential Buy', zorder=5)
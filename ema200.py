@@ -7,12 +7,21 @@ One trade per cross, cooldown protected.
 
 import time
 import os
-from datetime import datetime
+from datetime import datetime, timedelta
 from collections import deque
-from typing import Tuple, Optional, List
+from typing import Tuple, Optional
+
+try:
+    from nur_fast import ema_step_and_signal  # AOT build (python build_aot.py)
+except ImportError:
+    from core._fast import ema_step_and_signal
+
+from utils.file_watch import FileWatcher
+from utils.market_frame import MarketFrameReader, frame_file_exists, NS_PER_MINUTE
 
 # ================= PATHS =================
 MARKET_FILE = r"C:\Users\Abusahil\AppData\Roaming\MetaQuotes\Terminal\Common\Files\market.csv"
+MARKET_BIN = r"C:\Users\Abusahil\AppData\Roaming\MetaQuotes\Terminal\Common\Files\market.bin"
 COMMANDS_FILE = r"C:\Users\Abusahil\AppData\Roaming\MetaQuotes\Terminal\Common\Files\commands.csv"
 
 # ================= CONFIG =================
@@ -35,8 +44,12 @@ last_trade_time: Optional[float] = None
 trend: Optional[str] = None  # "BULLISH" / "BEARISH"
 
 ema: Optional[float] = None
-current_minute: Optional[datetime] = None
-minute_prices: List[float] = []
+current_minute: Optional[int] = None  # minutes since epoch
+
+# Running OHLC of the forming candle (no per-tick list)
+minute_close: Optional[float] = None
+minute_high: float = 0.0
+minute_low: float = 0.0
 
 prev_close: Optional[float] = None
 prev_ema: Optional[float] = None
@@ -44,6 +57,7 @@ prev_high: Optional[float] = None
 prev_low: Optional[float] = None
 
 last_seen: str = ""
+last_ts: int = 0
 
 recent_highs: deque = deque(maxlen=5)
 recent_lows: deque = deque(maxlen=5)
@@ -64,46 +78,81 @@ def parse_line(line: str) -> Tuple[datetime, float]:
     return ts, (bid + ask) / 2
 
 
+_EPOCH = datetime(1970, 1, 1)
+
+
+def minute_key(ts: datetime) -> int:
+    return (ts - _EPOCH) // timedelta(minutes=1)
+
+
+def minute_label(key: int) -> str:
+    return (_EPOCH + timedelta(minutes=key)).strftime('%H:%M')
+
+
 def write_command(action: str, sl: float, tp: float) -> None:
     with open(COMMANDS_FILE, "w") as f:
         f.write(f"{action},{SYMBOL},{sl:.2f},{tp:.2f}")
     print(f"📤 COMMAND SENT → {action} | SL={sl:.2f} TP={tp:.2f}")
 
 
+# Compile (or load from cache) the EMA kernel before the first candle
+# (a no-op cost with the AOT build)
+ema_step_and_signal(0.0, 0.0, 0.0, 0.0, ALPHA)
+
 print("🔴 EMA200 ENGINE STARTED (CANDLE CLOSE)")
 print("Waiting for market data...\n")
 
+# Binary frames when the EA publishes market.bin, else the legacy CSV line
+frames = MarketFrameReader(MARKET_BIN) if frame_file_exists(MARKET_BIN) else None
+print(f"📡 Feed: {'market.bin' if frames else 'market.csv'}")
+
+# Wakes up when MT5 rewrites the feed file (mtime polling without watchdog)
+watcher = FileWatcher(MARKET_BIN if frames else MARKET_FILE, poll_interval=SLEEP_TIME)
+
 while True:
     try:
-        if not os.path.exists(MARKET_FILE):
-            time.sleep(SLEEP_TIME)
-            continue
+        watcher.wait(timeout=1.0)
 
-        with open(MARKET_FILE, "r", encoding="utf-16") as f:
-            data = f.read().strip()
+        if frames is not None:
+            frame = frames.read()
+            if frame is None or frame[2] == last_ts:
+                continue
+            bid, ask, last_ts = frame
+            price = (bid + ask) / 2
+            minute = last_ts // NS_PER_MINUTE
+        else:
+            if not os.path.exists(MARKET_FILE):
+                continue
 
-        if not data or data == last_seen:
-            time.sleep(SLEEP_TIME)
-            continue
+            with open(MARKET_FILE, "r", encoding="utf-16") as f:
+                data = f.read().strip()
 
-        last_seen = data
-        ts, price = parse_line(data)
-        minute = ts.replace(second=0)
+            if not data or data == last_seen:
+                continue
+
+            last_seen = data
+            ts, price = parse_line(data)
+            minute = minute_key(ts)
 
         # ================= NEW CANDLE =================
         if current_minute and minute != current_minute:
-            close_price = minute_prices[-1]
-            high_price = max(minute_prices)
-            low_price = min(minute_prices)
+            close_price = minute_close
+            high_price = minute_high
+            low_price = minute_low
 
-            # EMA UPDATE
+            # EMA UPDATE (+ cross signal vs the previous candle)
             if ema is None:
                 ema = close_price
+                cross = 0
             else:
-                ema = ALPHA * close_price + (1 - ALPHA) * ema
+                ema, cross = ema_step_and_signal(
+                    prev_close if prev_close is not None else float("nan"),
+                    prev_ema if prev_ema is not None else float("nan"),
+                    close_price, ema, ALPHA
+                )
 
             print(
-                f"[{current_minute.strftime('%H:%M')}] "
+                f"[{minute_label(current_minute)}] "
                 f"CLOSE={close_price:.2f} EMA200={ema:.2f} "
                 f"STATE={state} TREND={trend}"
             )
@@ -119,7 +168,7 @@ while True:
                 and prev_ema is not None
             ):
                 # BUY CROSS
-                if close_price > ema and prev_close <= prev_ema and trend != "BULLISH":
+                if cross == 1 and trend != "BULLISH":
                     sl = prev_low
                     tp = max(recent_highs)
                     print("✅ BUY → EMA200 CROSS (CONFIRMED)")
@@ -130,7 +179,7 @@ while True:
                     last_trade_time = time.time()
 
                 # SELL CROSS
-                elif close_price < ema and prev_close >= prev_ema and trend != "BEARISH":
+                elif cross == -1 and trend != "BEARISH":
                     sl = prev_high
                     tp = min(recent_lows)
                     print("❌ SELL → EMA200 CROSS (CONFIRMED)")
@@ -146,7 +195,7 @@ while True:
             prev_high = high_price
             prev_low = low_price
 
-            minute_prices.clear()
+            minute_close = None
 
         # ================= COOLDOWN =================
         if state == STATE_COOLDOWN and can_trade_again():
@@ -154,10 +203,18 @@ while True:
             state = STATE_WAITING
 
         current_minute = minute
-        minute_prices.append(price)
-
-        time.sleep(SLEEP_TIME)
+        if minute_close is None:
+            minute_high = minute_low = price
+        elif price > minute_high:
+            minute_high = price
+        elif price < minute_low:
+            minute_low = price
+        minute_close = price
 
     except KeyboardInterrupt:
         print("\nStopped")
         break
+
+watcher.stop()
+if frames is not None:
+    frames.close()
@@ -5,20 +5,23 @@ Integrate learning system into backtest engine.
 
 import sys
 import os
+import contextlib
+import tempfile
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from backtest.engine_fixed import FixedBacktestEngine
+from core import _fast
 from core.learner import NurLearner
-from chat.nur_chat import NurChat
 
 class LearningBacktestEngine(FixedBacktestEngine):
     """Backtest engine with integrated learning"""
     
-    def __init__(self, config=None):
-        super().__init__(config)
+    def __init__(self, config=None, state_file="learning_integration.pkl",
+                 log_file="logs/fixed_backtest.csv"):
+        super().__init__(config, log_file)
         
         # Initialize learner
-        self.learner = NurLearner()
+        self.learner = NurLearner(state_file=state_file)
         
         # Track states for learning
         self.current_state = None
@@ -33,10 +36,10 @@ class LearningBacktestEngine(FixedBacktestEngine):
             'total_reward': 0,
         }
     
-    def _enter_trade(self, signal, current_candle, previous_candle):
+    def _enter_trade(self, signal, i):
         """Enter a new trade with learning influence"""
         # Get market state for learning
-        self.current_state = self.learner.get_state(self.market, current_candle['timestamp'])
+        self.current_state = self.learner.get_state(self.market, i)
         
         # Available actions based on signal
         if signal == 'BUY':
@@ -61,7 +64,7 @@ class LearningBacktestEngine(FixedBacktestEngine):
             return  # Don't enter trade
         
         # Proceed with trade entry
-        super()._enter_trade(signal, current_candle, previous_candle)
+        super()._enter_trade(signal, i)
         
         self.learning_stats['learner_decisions'] += 1
     
@@ -71,10 +74,10 @@ class LearningBacktestEngine(FixedBacktestEngine):
             return
         
         # Calculate reward based on trade outcome
-        reward = self._calculate_reward(exit_reason)
+        reward = self._calculate_reward(exit_reason, exit_price)
         
-        # Get next state (state after trade closes)
-        next_state = self.learner.get_state(self.market, exit_time)
+        # Get next state (state after trade closes); get_state takes a candle index
+        next_state = self.learner.get_state(self.market, self.market.df.index.get_loc(exit_time))
         
         # Update learner
         self.learner.update(
@@ -99,29 +102,20 @@ class LearningBacktestEngine(FixedBacktestEngine):
         self.current_state = None
         self.current_action = None
     
-    def _calculate_reward(self, exit_reason):
+    def _calculate_reward(self, exit_reason, exit_price):
         """Calculate reward based on trade outcome"""
         if 'TP hit' in exit_reason:
-            return 1.0  # Good outcome
+            code = _fast.EXIT_TP
         elif 'SL hit' in exit_reason:
-            return -1.0  # Bad outcome
+            code = _fast.EXIT_SL
         elif 'Early:' in exit_reason:
-            # Early exit - small penalty if it was a loss
-            if self.open_trade:
-                # Check if early exit saved us from bigger loss
-                entry = self.open_trade['entry_price']
-                current = self.open_trade.get('current_price', entry)
-                
-                if self.open_trade['direction'] == 'BUY':
-                    pnl_pct = (current - entry) / entry * 100
-                else:
-                    pnl_pct = (entry - current) / entry * 100
-                
-                if pnl_pct < 0:
-                    return -0.2  # Small penalty for early exit loss
-                else:
-                    return 0.5   # Reward for taking profit early
-        return 0.0  # Neutral outcome
+            code = _fast.EXIT_EARLY
+        else:
+            code = _fast.EXIT_NONE
+        
+        trade = self.open_trade
+        direction = 1 if trade['direction'] == 'BUY' else -1
+        return _fast.terminal_reward(direction, trade['entry_price'], exit_price, code)
     
     def print_results(self):
         """Print results including learning statistics"""
@@ -145,14 +139,44 @@ class LearningBacktestEngine(FixedBacktestEngine):
         # Print learner stats
         self.learner.print_stats()
         
-        # Save learning state
-        self.learner.save("learning_integration.pkl")
+        # Fold this run's Q-value deltas into the pickle
+        self.learner.compact()
         
         print("\n💡 Learning integrated successfully!")
 
 
+def run_self_test(data_path="data/historical_xauusd_m1.csv"):
+    """
+    Quick, quiet smoke test of the learning engine (used by test_phase2_complete).
+    
+    Runs a short backtest with the learner state and trade log in a
+    temporary directory. The only file it may write outside it is
+    load_data's parquet cache (<data_path>.parquet, with pyarrow), which is
+    rebuilt whenever it is older than the CSV.
+    
+    Returns:
+        bool: True if the engine loaded data, traded and updated the learner
+    """
+    with tempfile.TemporaryDirectory() as tmp, \
+            open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        engine = LearningBacktestEngine(
+            state_file=os.path.join(tmp, "learning.pkl"),
+            log_file=os.path.join(tmp, "trades.csv")
+        )
+        
+        if not engine.load_data(data_path):
+            return False
+        engine.run(start_idx=200, end_idx=700)
+        engine.tracker.close()
+        engine.learner.compact()
+    
+    return engine.learning_stats['learner_decisions'] > 0
+
+
 def test_learning_integration():
     """Test the integrated learning system"""
+    from chat.nur_chat import NurChat
+    
     print("🧪 Testing Learning Integration")
     print("=" * 60)
     
@@ -199,4 +223,6 @@ def test_learning_integration():
     return engine
 
 if __name__ == "__main__":
+    if '--test' in sys.argv:
+        sys.exit(0 if run_self_test() else 1)
     test_learning_integration()
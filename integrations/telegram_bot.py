@@ -65,7 +65,7 @@ async def last_trade(update: Update, context: ContextTypes.DEFAULT_TYPE):
         f"Side: {t['direction']}\n"
         f"Entry: {t['entry_price']}\n"
         f"Exit: {t['exit_price']}\n"
-        f"PnL: {t['pnl']} ({t['pnl_pct']})\n"
+        f"PnL: {float(t['pnl']):.2f} ({float(t['pnl_pct']):.2f})\n"
         f"Reason: {t['exit_reason']}\n"
         f"Entry Time: {t['entry_time']}\n"
         f"Exit Time: {t['exit_time']}\n"
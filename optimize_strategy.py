@@ -7,9 +7,91 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from core.strategy import TradingStrategy
+import contextlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from core.market import MT5MarketData
 from backtest.engine_fixed import FixedBacktestEngine
 
+DATA_PATH = "data/historical_xauusd_m1.csv"
+
+# One row per config in the comparison table (float64 so the printed
+# figures match the tracker's statistics exactly)
+RESULT_DTYPE = np.dtype([
+    ('name', 'U20'), ('trades', 'i4'), ('win_rate', 'f8'), ('profit_factor', 'f8'),
+    ('expectancy', 'f8'), ('net_profit', 'f8'), ('return_pct', 'f8'),
+    ('avg_win', 'f8'), ('avg_loss', 'f8'),
+])
+
+# Engine settings shared by every config in the sweep (module constant, so
+# spawned workers get it from the import rather than with each task)
+BASE_CONFIG = {
+    'initial_balance': 10000.0,
+    'risk_per_trade': 1.0,
+    'max_daily_loss': -200.0,
+    'commission_per_lot': 3.5,
+    'spread': 0.20,
+}
+
+# Market data loaded once per worker process (see _init_worker)
+_market = None
+
+
+def _init_worker(data_path):
+    """Pool initializer: map the data once; every config in this worker reuses it"""
+    global _market
+    market = MT5MarketData(data_path, verbose=False)
+    if market.load_data() and market.calculate_ema_mt5():
+        _market = market
+
+
+def _run_one(config):
+    """Backtest one config in a worker process; returns its results row (None if data failed to load)"""
+    engine_config = {
+        **BASE_CONFIG,
+        'risk_reward_ratio': config['risk_reward_ratio'],
+        'position_size': config['position_size'],
+        'max_trades_per_day': config['max_trades_per_day'],
+    }
+    
+    # Per-trade prints from parallel workers would interleave; the parent
+    # prints a summary per config in order instead. The trade log is
+    # discarded too (workers would interleave rows in one file); the sweep
+    # only needs the tracker's statistics
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        engine = FixedBacktestEngine(engine_config, log_file=os.devnull)
+        
+        if _market is None or not engine.load_market(_market):
+            return None
+        
+        # Run quick backtest
+        engine.run(start_idx=200, end_idx=5200)  # 5000 candles
+        
+        # Get stats
+        stats = engine.tracker.get_statistics()
+        engine.tracker.close()
+    
+    # Calculate metrics
+    initial_balance = BASE_CONFIG['initial_balance']
+    net_profit = engine.balance - initial_balance
+    return_pct = ((engine.balance / initial_balance) - 1) * 100
+    
+    return {
+        'name': config['name'],
+        'trades': stats['total_trades'],
+        'win_rate': stats['win_rate'],
+        'profit_factor': stats['profit_factor'],
+        'expectancy': stats['expectancy'],
+        'net_profit': net_profit,
+        'return_pct': return_pct,
+        'avg_win': stats['avg_win'],
+        'avg_loss': stats['avg_loss'],
+    }
+
+
 def optimize_parameters():
     """Test different parameter configurations"""
     print("🔧 Optimizing Strategy Parameters")
@@ -49,55 +131,33 @@ def optimize_parameters():
         },
     ]
     
-    results = []
+    # Parse the CSV once; workers then map the binary cache instead
+    market = MT5MarketData(DATA_PATH, verbose=False)
+    if not market.load_data() or not market.calculate_ema_mt5():
+        return []
+    if not market.bin_is_fresh():
+        market.write_bin()
+    
+    # One process per config; spawned workers (the Windows default
+    # everywhere) so no numba thread pool is inherited from this process
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=min(len(configs), os.cpu_count() or 1), mp_context=ctx,
+                             initializer=_init_worker, initargs=(DATA_PATH,)) as pool:
+        outcomes = list(pool.map(_run_one, configs))
     
-    for config in configs:
+    rows = []
+    for config, r in zip(configs, outcomes):
         print(f"\n🧪 Testing: {config['name']}")
         print("-" * 40)
-        
-        # Create engine with config
-        engine_config = {
-            'initial_balance': 10000.0,
-            'risk_per_trade': 1.0,
-            'risk_reward_ratio': config['risk_reward_ratio'],
-            'position_size': config['position_size'],
-            'max_trades_per_day': config['max_trades_per_day'],
-            'max_daily_loss': -200.0,
-            'commission_per_lot': 3.5,
-            'spread': 0.20,
-        }
-        
-        engine = FixedBacktestEngine(engine_config)
-        
-        # Load data
-        data_path = "data/historical_xauusd_m1.csv"
-        if not engine.load_data(data_path):
+        if r is None:
+            print("   ❌ Could not load data")
             continue
         
-        # Run quick backtest
-        engine.run(start_idx=200, end_idx=5200)  # 5000 candles
-        
-        # Get stats
-        stats = engine.tracker.get_statistics()
-        
-        # Calculate metrics
-        net_profit = engine.balance - 10000.0
-        return_pct = ((engine.balance / 10000.0) - 1) * 100
-        
-        results.append({
-            'name': config['name'],
-            'trades': stats['total_trades'],
-            'win_rate': stats['win_rate'],
-            'profit_factor': stats['profit_factor'],
-            'expectancy': stats['expectancy'],
-            'net_profit': net_profit,
-            'return_pct': return_pct,
-            'avg_win': stats['avg_win'],
-            'avg_loss': stats['avg_loss'],
-        })
-        
-        print(f"   Trades: {stats['total_trades']}, Win Rate: {stats['win_rate']}%")
-        print(f"   Net Profit: ${net_profit:.2f}, Return: {return_pct:.2f}%")
+        rows.append(tuple(r[field] for field in RESULT_DTYPE.names))
+        print(f"   Trades: {r['trades']}, Win Rate: {r['win_rate']}%")
+        print(f"   Net Profit: ${r['net_profit']:.2f}, Return: {r['return_pct']:.2f}%")
+    
+    results = np.array(rows, dtype=RESULT_DTYPE)
     
     # Print comparison
     print("\n" + "="*60)
@@ -121,9 +181,9 @@ def optimize_parameters():
         ))
     
     # Find best configuration
-    best_by_profit = max(results, key=lambda x: x['net_profit'])
-    best_by_winrate = max(results, key=lambda x: x['win_rate'])
-    best_by_pf = max(results, key=lambda x: x['profit_factor'])
+    best_by_profit = results[results['net_profit'].argmax()]
+    best_by_winrate = results[results['win_rate'].argmax()]
+    best_by_pf = results[results['profit_factor'].argmax()]
     
     print("\n🏆 Best Performers:")
     print(f"   By Net Profit: {best_by_profit['name']} (${best_by_profit['net_profit']:.2f})")
@@ -134,7 +194,10 @@ def optimize_parameters():
     print("\n💡 Recommendations:")
     
     # Analyze average win/loss ratio
-    avg_win_loss_ratio = sum(r['avg_win'] / abs(r['avg_loss']) for r in results if r['avg_loss'] != 0) / len(results)
+    # (configs without losses add nothing but still count in the average)
+    avg_loss = np.abs(results['avg_loss'])
+    ratios = np.divide(results['avg_win'], avg_loss, out=np.zeros(len(results)), where=avg_loss != 0)
+    avg_win_loss_ratio = ratios.sum() / len(results)
     print(f"   1. Average win/loss ratio: {avg_win_loss_ratio:.2f}")
     
     # Check if we need to adjust risk/reward
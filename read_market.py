@@ -5,28 +5,76 @@ This utility reads and displays real-time market data from MT5 terminal
 for debugging and monitoring purposes.
 """
 
-import time
 import os
 
+from utils.file_watch import FileWatcher
+
 FILE_PATH = r"C:\Users\Abusahil\AppData\Roaming\MetaQuotes\Terminal\Common\Files\market.csv"
 
 print("=== MT5 MARKET READER (LIVE) ===")
 print("Reading:", FILE_PATH)
 print("Press CTRL+C to stop\n")
 
-last_seen: str = ""
+# Bytes just before the read position; if they still match after a change
+# the EA appended, otherwise it rewrote the file and we start over
+TAIL_BYTES = 16
+
+
+def read_new(f, pos: int, tail: bytes):
+    """
+    Read what changed since pos from the UTF-16 file f (binary mode).
+
+    Returns:
+        (new text, new position, new tail)
+    """
+    size = os.fstat(f.fileno()).st_size
+    # Changed without growing means rewritten (e.g. same-length tick line)
+    appended = 0 < pos < size
+    if appended:
+        f.seek(pos - len(tail))
+        appended = f.read(len(tail)) == tail
+
+    start = pos if appended else 0
+    f.seek(start)
+    raw = f.read((size - start) & ~1)  # whole UTF-16 code units only
+
+    new_pos = start + len(raw)
+    new_tail = ((tail if appended else b"") + raw)[-TAIL_BYTES:]
+    encoding = "utf-16" if raw.startswith((b"\xff\xfe", b"\xfe\xff")) else "utf-16-le"
+    return raw.decode(encoding, errors="replace"), new_pos, new_tail
+
+
+# Sleeps until the file changes (watchdog), or polls its mtime without it
+watcher = FileWatcher(FILE_PATH)
+last_mtime: int = 0
+
+f = None
+pos: int = 0
+tail: bytes = b""
 
 while True:
     try:
-        if os.path.exists(FILE_PATH):
-            with open(FILE_PATH, "r", encoding="utf-16") as f:
-                data = f.read().strip()
+        if not watcher.wait(timeout=1.0):
+            continue
 
-            if data and data != last_seen:
-                print(data)
-                last_seen = data
+        # Editors/EA can raise several events per write; read once per mtime
+        try:
+            mtime = os.stat(FILE_PATH).st_mtime_ns
+        except FileNotFoundError:
+            continue
+        if mtime == last_mtime:
+            continue
+        last_mtime = mtime
 
-        time.sleep(0.5)
+        # One handle for the session; only the new bytes are read and decoded
+        if f is None:
+            f = open(FILE_PATH, "rb")
+            pos, tail = 0, b""
+        data, pos, tail = read_new(f, pos, tail)
+
+        data = data.strip()
+        if data:
+            print(data)
 
     except KeyboardInterrupt:
         print("\nStopped by user")
@@ -34,4 +82,12 @@ while True:
 
     except Exception as e:
         print("Error:", e)
-        time.sleep(1)
+        # Reopen next time (the file may have been replaced)
+        if f is not None:
+            f.close()
+            f = None
+        watcher.wait(timeout=1.0)
+
+if f is not None:
+    f.close()
+watcher.stop()
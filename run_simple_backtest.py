@@ -7,11 +7,14 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+
+from core import _fast
 from core.market import MT5MarketData
 from core.strategy import TradingStrategy
-from core.risk_manager import RiskManager
 from core.observer import TradeObserver
 from core.tracker import TradeTracker
+from backtest._loop import _run_loop
+from backtest.batch import observer_cfg
 
 def simple_backtest():
     """Simple backtest on 1000 candles"""
@@ -25,8 +28,7 @@ def simple_backtest():
     market.calculate_ema_mt5()
     
     # Initialize components
-    strategy = TradingStrategy()
-    risk_manager = RiskManager()
+    observer = TradeObserver()
     tracker = TradeTracker("logs/simple_backtest.csv")
     
     # Configuration
@@ -34,11 +36,7 @@ def simple_backtest():
     balance = initial_balance
     position_size = 0.01  # Micro lot
     spread = 0.20  # 20 pips
-    
-    # State
-    open_trade = None
-    observer = None
-    trade_counter = 0
+    risk_reward = 1.5
     
     # Run on first 1000 candles after EMA
     start_idx = 200
@@ -46,116 +44,63 @@ def simple_backtest():
     
     print(f"Running on candles {start_idx} to {end_idx}")
     
-    for i in range(start_idx, end_idx):
-        current = market.get_candle(i)
-        previous = market.get_candle(i-1)
+    # Whole candle loop in one compiled pass; only the trades come back
+    arr = market.as_arrays()  # float64, prices at the CSV's 2 decimals
+    (entry_idx, exit_idx, direction, entry_px, stop_loss, take_profit,
+     exit_px, exit_code, exit_pnl_pct, pnl) = _run_loop(
+        arr['open'], arr['high'], arr['low'], arr['close'], arr['ema_200'],
+        start_idx, end_idx,
+        spread, position_size, risk_reward, TradingStrategy.TOUCH_THRESHOLD,
+        observer_cfg(observer)
+    )
+    
+    for t in range(len(entry_idx)):
+        signal = 'BUY' if direction[t] == 1 else 'SELL'
+        trade_id = f"T{t + 1:03d}"
+        entry_price = float(entry_px[t])
+        sl = float(stop_loss[t])
+        tp = float(take_profit[t])
         
-        # Manage open trade
-        if open_trade:
-            # Update observer
-            exit_recommendation = observer.update(current, current.get('ema_200'))
-            
-            # Check SL/TP
-            current_price = current['close']
-            exit_reason = None
-            exit_price = None
-            
-            if open_trade['direction'] == 'BUY':
-                if current_price <= open_trade['sl']:
-                    exit_reason = "SL hit"
-                    exit_price = open_trade['sl']
-                elif current_price >= open_trade['tp']:
-                    exit_reason = "TP hit"
-                    exit_price = open_trade['tp']
-            else:  # SELL
-                if current_price >= open_trade['sl']:
-                    exit_reason = "SL hit"
-                    exit_price = open_trade['sl']
-                elif current_price <= open_trade['tp']:
-                    exit_reason = "TP hit"
-                    exit_price = open_trade['tp']
-            
-            # Check observer recommendation
-            if not exit_reason and exit_recommendation:
-                exit_reason = f"Early: {exit_recommendation['exit_reason']}"
-                exit_price = exit_recommendation['exit_price']
-            
-            # Close trade if needed
-            if exit_reason:
-                # Calculate PnL
-                if open_trade['direction'] == 'BUY':
-                    pnl = (exit_price - open_trade['entry_price']) * position_size * 100
-                else:
-                    pnl = (open_trade['entry_price'] - exit_price) * position_size * 100
-                
-                balance += pnl
-                
-                # Close in tracker
-                tracker.close_trade(
-                    exit_price=exit_price,
-                    exit_reason=exit_reason,
-                    exit_time=current['timestamp']
-                )
-                
-                print(f"  Closed {open_trade['direction']}: PnL ${pnl:.2f}, Balance: ${balance:.2f}")
-                open_trade = None
-                observer = None
+        tracker.start_trade(
+            trade_id=trade_id,
+            direction=signal,
+            entry_price=entry_price,
+            stop_loss=sl,
+            take_profit=tp,
+            position_size=position_size,
+            entry_time=market.get_timestamp(entry_idx[t])
+        )
+        
+        print(f"\n📈 {signal} #{trade_id} at {entry_price:.2f}")
+        print(f"   SL: {sl:.2f}, TP: {tp:.2f}")
+        
+        code = int(exit_code[t])
+        if code == _fast.EXIT_END:
+            # Close any remaining trade
+            tracker.close_trade(
+                exit_price=float(exit_px[t]),
+                exit_reason="End of backtest",
+                exit_time=market.get_timestamp(end_idx-1)
+            )
+            print(f"\n⚠️  Closed open trade at end of backtest")
+            continue
+        
+        if code == _fast.EXIT_SL:
+            exit_reason = "SL hit"
+        elif code == _fast.EXIT_TP:
+            exit_reason = "TP hit"
+        else:
+            exit_reason = f"Early: {observer.reason_for_code(code, float(exit_pnl_pct[t]))}"
+        
+        balance += float(pnl[t])
         
-        # Check for new signal (if no open trade)
-        if not open_trade:
-            signal = strategy.get_signal(current, previous)
-            
-            if signal != 'HOLD':
-                trade_counter += 1
-                
-                # Calculate entry with spread
-                entry_price = current['close']
-                if signal == 'BUY':
-                    entry_price += spread / 100
-                else:
-                    entry_price -= spread / 100
-                
-                # Calculate SL/TP
-                sl = risk_manager.calculate_stop_loss(signal, entry_price, previous)
-                tp = risk_manager.calculate_take_profit(signal, entry_price, sl, risk_reward=1.5)
-                
-                # Start trade
-                open_trade = {
-                    'id': f"T{trade_counter:03d}",
-                    'direction': signal,
-                    'entry_price': entry_price,
-                    'entry_time': current['timestamp'],
-                    'sl': sl,
-                    'tp': tp,
-                }
-                
-                # Start observer
-                observer = TradeObserver()
-                observer.start_trade(signal, entry_price, current['timestamp'])
-                
-                # Start tracker
-                tracker.start_trade(
-                    trade_id=open_trade['id'],
-                    direction=signal,
-                    entry_price=entry_price,
-                    stop_loss=sl,
-                    take_profit=tp,
-                    position_size=position_size,
-                    entry_time=current['timestamp']
-                )
-                
-                print(f"\n📈 {signal} #{open_trade['id']} at {entry_price:.2f}")
-                print(f"   SL: {sl:.2f}, TP: {tp:.2f}")
-    
-    # Close any remaining trade
-    if open_trade:
-        last_candle = market.get_candle(end_idx-1)
         tracker.close_trade(
-            exit_price=last_candle['close'],
-            exit_reason="End of backtest",
-            exit_time=last_candle['timestamp']
+            exit_price=float(exit_px[t]),
+            exit_reason=exit_reason,
+            exit_time=market.get_timestamp(exit_idx[t])
         )
-        print(f"\n⚠️  Closed open trade at end of backtest")
+        
+        print(f"  Closed {signal}: PnL ${pnl[t]:.2f}, Balance: ${balance:.2f}")
     
     # Print results
     print("\n" + "="*60)
@@ -163,6 +108,7 @@ def simple_backtest():
     print("="*60)
     
     stats = tracker.get_statistics()
+    tracker.close()
     
     print(f"\n💰 Balance: ${balance:.2f}")
     print(f"   Initial: ${initial_balance:.2f}")
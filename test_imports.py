@@ -1,36 +1,24 @@
 #!/usr/bin/env python3
 """Test all imports"""
 
-print("Testing imports...")
-
-try:
-    from core.market import MT5MarketData
-    print("✅ core.market")
-except ImportError as e:
-    print(f"❌ core.market: {e}")
+import importlib
 
-try:
-    from core.strategy import TradingStrategy
-    print("✅ core.strategy")
-except ImportError as e:
-    print(f"❌ core.strategy: {e}")
+# (module, class it must provide)
+MODULES = (
+    ("core.market", "MT5MarketData"),
+    ("core.strategy", "TradingStrategy"),
+    ("core.risk_manager", "RiskManager"),
+    ("core.observer", "TradeObserver"),
+    ("core.tracker", "TradeTracker"),
+)
 
-try:
-    from core.risk_manager import RiskManager
-    print("✅ core.risk_manager")
-except ImportError as e:
-    print(f"❌ core.risk_manager: {e}")
-
-try:
-    from core.observer import TradeObserver
-    print("✅ core.observer")
-except ImportError as e:
-    print(f"❌ core.observer: {e}")
+print("Testing imports...")
 
-try:
-    from core.tracker import TradeTracker
-    print("✅ core.tracker")
-except ImportError as e:
-    print(f"❌ core.tracker: {e}")
+for module_name, class_name in MODULES:
+    try:
+        getattr(importlib.import_module(module_name), class_name)
+        print(f"✅ {module_name}")
+    except (ImportError, AttributeError) as e:
+        print(f"❌ {module_name}: {e}")
 
 print("\n✅ All imports tested")
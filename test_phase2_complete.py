@@ -5,6 +5,11 @@ Test Phase 2 Complete Setup
 import sys
 import os
 
+try:
+    import psutil
+except ImportError:  # psutil is optional - memory check is skipped
+    psutil = None
+
 def test_all():
     print("🚀 TESTING PHASE 2 COMPLETE SETUP")
     print("=" * 60)
@@ -57,34 +62,29 @@ def test_all():
     # Test 4: Integration
     print("\n4. Testing Learning Integration...")
     try:
-        # Check if integrate_learning.py works
-        import subprocess
-        result = subprocess.run(
-            [sys.executable, 'integrate_learning.py', '--test'],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        print("   ✅ Integration script: OK")
-    except:
+        # Run integrate_learning's self test in this interpreter
+        from integrate_learning import run_self_test
+        if run_self_test():
+            print("   ✅ Integration script: OK")
+        else:
+            print("   ⚠️  Integration script needs manual test")
+    except Exception:
         print("   ⚠️  Integration script needs manual test")
     
     # Test 5: Memory check
     print("\n5. Memory Check (4GB constraint)...")
-    try:
-        import psutil
-        memory = psutil.virtual_memory()
-        total_gb = memory.total / (1024**3)
-        available_gb = memory.available / (1024**3)
-        print(f"   Total RAM: {total_gb:.1f} GB")
+    if psutil is not None:
+        # This process's footprint is what has to fit in the 4GB budget
+        rss_gb = psutil.Process().memory_info().rss / (1024**3)
+        available_gb = psutil.virtual_memory().available / (1024**3)
+        print(f"   Process RSS: {rss_gb:.2f} GB")
         print(f"   Available: {available_gb:.1f} GB")
         
         if available_gb > 1.0:
             print("   ✅ Sufficient memory for trading")
         else:
             print("   ⚠️  Low memory - consider closing other applications")
-            
-    except ImportError:
+    else:
         print("   ⚠️  Install psutil for memory monitoring: pip install psutil")
     
     print("\n" + "=" * 60)
@@ -51,7 +51,7 @@ def test_learner():
     
     from core.learner import NurLearner
     
-    learner = NurLearner()
+    learner = NurLearner(state_file="test_phase2.pkl")
     
     # Test basic functionality
     print("1. Creating learner... OK")
@@ -74,12 +74,58 @@ def test_learner():
     print(f"4. Recommendation: {rec['action']} (confidence: {rec['confidence']:.2f})")
     
     # Test save/load
-    learner.save("test_phase2.pkl")
+    learner.save()
     print("5. Save/load: OK")
     
     # Print stats
     learner.print_stats()
 
+def test_quantized_policy():
+    """int8 Q-table must pick the same greedy actions as fp32"""
+    print("\n🔢 Testing int8 Q-table policy stability")
+    print("=" * 50)
+    
+    import contextlib
+    import io
+    import tempfile
+    import numpy as np
+    from core.learner import NurLearner
+    
+    states = [f"state_{i}" for i in range(500)]
+    actions = ['enter_long', 'enter_short', 'hold', 'exit_early']
+    
+    def train(learner, seed):
+        # Same seed for both learners: identical updates and batch samples
+        np.random.seed(seed)
+        rng = np.random.default_rng(seed)
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(2000):
+                state = states[rng.integers(len(states))]
+                next_state = states[rng.integers(len(states))]
+                learner.update(state, actions[rng.integers(len(actions))],
+                               float(rng.choice([1.0, -1.0, 0.5, -0.2])),
+                               next_state, is_terminal=rng.random() < 0.2)
+        # Greedy action per state (first one on ties, as in get_action)
+        policy = {}
+        for state in states:
+            values = learner._action_values(state)
+            if values:
+                policy[state] = max(values, key=values.get)
+        return policy
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        fp32 = NurLearner(state_file=os.path.join(tmp, "fp32.pkl"))
+        config = dict(fp32.config, quantize_q=True)
+        int8 = NurLearner(config=config, state_file=os.path.join(tmp, "int8.pkl"))
+        policy_fp32 = train(fp32, seed=42)
+        policy_int8 = train(int8, seed=42)
+    
+    differ = sum(policy_fp32[s] != policy_int8.get(s) for s in policy_fp32)
+    divergence = differ / len(policy_fp32)
+    print(f"1. 2000 updates, {len(policy_fp32)} states: {differ} greedy actions differ ({divergence:.1%})")
+    assert divergence <= 0.01, f"int8 policy diverges from fp32 by {divergence:.1%}"
+    print("2. Policy within 1% of fp32: OK")
+
 def test_chat():
     """Test chat interface"""
     print("\n💬 Testing Chat Interface")
@@ -109,6 +155,7 @@ def main():
     
     test_imports()
     test_learner()
+    test_quantized_policy()
     test_chat()
     
     print("\n" + "=" * 60)
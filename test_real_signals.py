@@ -7,6 +7,8 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+import numpy as np
+
 from core.market import MT5MarketData
 from core.strategy import TradingStrategy
 from core.risk_manager import RiskManager
@@ -27,26 +29,28 @@ def test_on_real_data():
     start_idx = 200  # Start after we have EMA
     end_idx = 700    # Look at 500 candles
     
-    signals = []
+    arr = market.as_arrays()  # float64, prices at the CSV's 2 decimals
+    close, ema = arr['close'], arr['ema_200']
     
-    for i in range(start_idx, end_idx):
-        current = market.get_candle(i)
-        previous = market.get_candle(i-1)
-        
-        signal = TradingStrategy.get_signal(current, previous)
-        
-        if signal != 'HOLD':
-            signals.append({
-                'index': i,
-                'timestamp': current['timestamp'],
-                'signal': signal,
-                'price': current['close'],
-                'ema': current['ema_200']
-            })
+    # All candles in one vectorized pass (the extra leading candle is only
+    # the "previous" of start_idx); +1 BUY, -1 SELL, 0 HOLD
+    direction = TradingStrategy.signals_vectorized(close[start_idx-1:end_idx], ema[start_idx-1:end_idx])[1:]
+    signal_idx = np.flatnonzero(direction) + start_idx
+    
+    signals = [
+        {
+            'index': i,
+            'timestamp': market.get_timestamp(i),
+            'signal': 'BUY' if direction[i - start_idx] == 1 else 'SELL',
+            'price': float(close[i]),
+            'ema': float(ema[i])
+        }
+        for i in signal_idx.tolist()
+    ]
     
     # Print results
     print(f"\n📊 Found {len(signals)} signals in {end_idx-start_idx} candles")
-    print(f"📅 Date range: {market.get_candle(start_idx)['timestamp']} to {market.get_candle(end_idx-1)['timestamp']}")
+    print(f"📅 Date range: {market.get_timestamp(start_idx)} to {market.get_timestamp(end_idx-1)}")
     
     if signals:
         print("\n🔍 Signal Details:")
@@ -68,21 +72,13 @@ def test_on_real_data():
         # Show SL/TP for first signal
         if signals:
             first_signal = signals[0]
-            prev_candle = market.get_candle(first_signal['index']-1)
-            rm = RiskManager()
-            
-            sl = rm.calculate_stop_loss(
-                first_signal['signal'], 
-                first_signal['price'], 
-                prev_candle
-            )
+            prev = first_signal['index'] - 1
+            rm = RiskManager(risk_reward=1.5)
             
-            tp = rm.calculate_take_profit(
-                first_signal['signal'], 
-                first_signal['price'], 
-                sl,
-                risk_reward=1.5
-            )
+            if first_signal['signal'] == 'BUY':
+                sl, tp = rm.sl_tp_buy(first_signal['price'], float(arr['low'][prev]))
+            else:
+                sl, tp = rm.sl_tp_sell(first_signal['price'], float(arr['high'][prev]))
             
             print(f"\n💰 Sample Trade for first signal:")
             print(f"   Entry: {first_signal['price']:.2f}")
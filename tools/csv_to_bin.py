@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Convert an MT5 CSV export into binary float32 column caches.
+
+MT5MarketData.load_data memory-maps the result instead of parsing the
+CSV (see MT5MarketData.write_bin for the layout).
+
+Usage: python tools/csv_to_bin.py [data/historical_xauusd_m1.csv]
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.market import MT5MarketData
+
+
+def main() -> None:
+    data_path = sys.argv[1] if len(sys.argv) > 1 else "data/historical_xauusd_m1.csv"
+    
+    market = MT5MarketData(data_path)
+    if not market.load_data() or not market.calculate_ema_mt5():
+        sys.exit(1)
+    
+    if not market.write_bin():
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
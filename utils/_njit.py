@@ -0,0 +1,23 @@
+"""
+Optional Numba support.
+
+Exposes ``njit`` and ``prange``. When numba is not installed ``njit`` is a
+pass-through decorator and ``prange`` is ``range``, so kernels written
+against this module still run as plain Python.
+"""
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba is optional
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit (supports bare and called forms)."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
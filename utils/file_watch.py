@@ -0,0 +1,101 @@
+"""
+File-change waits for the MT5 CSV bridge.
+
+Uses watchdog (inotify / FSEvents / ReadDirectoryChangesW) when it is
+installed, so a reader sleeps in the kernel until the file is rewritten.
+Without watchdog, or if the directory does not exist yet, it falls back to
+polling the file's mtime.
+"""
+
+import os
+import threading
+import time
+from typing import Optional
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    WATCHDOG_AVAILABLE = True
+except ImportError:  # watchdog is optional - poll instead
+    Observer = None
+    FileSystemEventHandler = object
+    WATCHDOG_AVAILABLE = False
+
+
+class _ChangeHandler(FileSystemEventHandler):
+    """Sets an event when the watched file is modified, created or moved in."""
+
+    def __init__(self, path: str, changed: threading.Event):
+        super().__init__()
+        self.path = path
+        self.changed = changed
+
+    def on_any_event(self, event):
+        for p in (event.src_path, getattr(event, "dest_path", "")):
+            if p and os.path.abspath(p) == self.path:
+                self.changed.set()
+                return
+
+
+class FileWatcher:
+    """
+    Block until a file changes.
+
+    Usage:
+        watcher = FileWatcher(MARKET_FILE)
+        while True:
+            if watcher.wait(timeout=1.0):
+                ...read the file...
+    """
+
+    def __init__(self, path: str, poll_interval: float = 0.5):
+        self.path = os.path.abspath(path)
+        self.poll_interval = poll_interval
+        self._changed = threading.Event()
+        self._changed.set()  # first wait() returns at once so existing data is read
+        self._observer = None
+        self._last_mtime: Optional[int] = None
+
+        directory = os.path.dirname(self.path)
+        if WATCHDOG_AVAILABLE and os.path.isdir(directory):
+            self._observer = Observer()
+            self._observer.schedule(_ChangeHandler(self.path, self._changed), directory)
+            self._observer.daemon = True
+            self._observer.start()
+
+    @property
+    def event_driven(self) -> bool:
+        return self._observer is not None
+
+    def wait(self, timeout: float = 1.0) -> bool:
+        """
+        Wait for the next change.
+
+        Returns:
+            True if the file changed, False if the timeout passed first
+        """
+        if self._observer is not None:
+            fired = self._changed.wait(timeout)
+            self._changed.clear()
+            return fired
+
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+            except OSError:
+                mtime = None
+            if mtime is not None and mtime != self._last_mtime:
+                self._last_mtime = mtime
+                return True
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(self.poll_interval, remaining))
+
+    def stop(self) -> None:
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
@@ -0,0 +1,96 @@
+"""
+Fixed-size binary tick frame for the MT5 file bridge.
+
+The EA overwrites market.bin with one 24-byte little-endian record:
+
+    bid (double) | ask (double) | time (uint64, ns since epoch, broker time)
+
+In MQL5 that is FileWriteDouble(h, bid); FileWriteDouble(h, ask);
+FileWriteLong(h, tick.time_msc * 1000000) after FileSeek(h, 0, SEEK_SET).
+
+Reading it back is readinto() into reused buffers and one
+struct.unpack_from(). Unlike the UTF-16 market.csv line, no string
+decoding, splitting or strptime is needed per tick.
+
+The EA's three writes are not atomic, so a read can catch a frame that
+is half old, half new. The reader reads the frame twice and only accepts
+it when both reads match.
+"""
+
+import os
+import struct
+from typing import Optional, Tuple
+
+FRAME = struct.Struct("<ddQ")
+NS_PER_MINUTE = 60 * 1_000_000_000
+MAX_READ_ATTEMPTS = 3  # Read pairs tried before giving up on a busy frame
+
+
+class MarketFrameReader:
+    """
+    Usage:
+        reader = MarketFrameReader(MARKET_BIN)
+        frame = reader.read()
+        if frame is not None:
+            bid, ask, ts_ns = frame
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._buf = bytearray(FRAME.size)
+        self._view = memoryview(self._buf)
+        self._check = bytearray(FRAME.size)
+        self._check_view = memoryview(self._check)
+        self._file = None
+
+    def _open(self) -> bool:
+        try:
+            # Unbuffered: every read goes straight to the OS, never a stale cache
+            self._file = open(self.path, "rb", buffering=0)
+        except OSError:
+            self._file = None
+        return self._file is not None
+
+    def read(self) -> Optional[Tuple[float, float, int]]:
+        """
+        Read the current frame.
+
+        Returns:
+            (bid, ask, ts_ns), or None if the file is missing or mid-write
+        """
+        if self._file is None and not self._open():
+            return None
+
+        for _ in range(MAX_READ_ATTEMPTS):
+            if not self._read_into(self._view):
+                return None
+            # A second identical read means the EA was not mid-write
+            if not self._read_into(self._check_view):
+                return None
+            if self._buf == self._check:
+                return FRAME.unpack_from(self._buf)
+        return None
+
+    def _read_into(self, view: memoryview) -> bool:
+        """Read the whole frame into view; False on a short or failed read"""
+        try:
+            self._file.seek(0)
+            n = self._file.readinto(view)
+        except OSError:
+            # The EA may have replaced the file - reopen on the next call
+            self.close()
+            return False
+        return n == FRAME.size
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def frame_file_exists(path: str) -> bool:
+    """True when the EA is publishing binary frames at path"""
+    try:
+        return os.path.getsize(path) >= FRAME.size
+    except OSError:
+        return False
@@ -1,8 +1,29 @@
+import atexit
 import json
+import os
+import threading
+import time
 from pathlib import Path
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # orjson is optional - fall back to the stdlib encoder
+    orjson = None
+
 STATUS_FILE = Path("logs/engine_status.json")
+_TMP_FILE = STATUS_FILE.with_suffix(".tmp")
+
+# Max file writes per second; updates in between collapse into one write
+FLUSH_HZ = 10
+
+# Latest status (single slot, reused on every call) and its flusher thread
+_payload = {"market": None, "state": None, "ema200": None, "timestamp": None}
+_lock = threading.Lock()
+_write_lock = threading.Lock()  # flusher thread vs. the exit-time flush
+_dirty = threading.Event()
+_flusher = None
+
 
 def write_status(
     market: str,
@@ -10,12 +31,46 @@ def write_status(
     ema200,
     timestamp=None,
 ):
-    payload = {
-        "market": market,
-        "state": state,
-        "ema200": None if ema200 is None else round(float(ema200), 2),
-        "timestamp": timestamp or datetime.utcnow().isoformat(),
-    }
-
-    STATUS_FILE.parent.mkdir(exist_ok=True)
-    STATUS_FILE.write_text(json.dumps(payload, indent=2))
+    """Record the latest status; a background thread writes it at most FLUSH_HZ times a second"""
+    global _flusher
+
+    with _lock:
+        _payload["market"] = market
+        _payload["state"] = state
+        _payload["ema200"] = None if ema200 is None else round(float(ema200), 2)
+        _payload["timestamp"] = timestamp or datetime.utcnow().isoformat()
+    _dirty.set()
+
+    if _flusher is None:
+        _flusher = threading.Thread(target=_flush_loop, name="status-writer", daemon=True)
+        _flusher.start()
+        atexit.register(flush_status)
+
+
+def flush_status() -> None:
+    """Write the latest status now (also runs at exit so the last update is kept)"""
+    with _write_lock:
+        if not _dirty.is_set():
+            return
+        _dirty.clear()
+
+        with _lock:
+            if orjson is not None:
+                data = orjson.dumps(_payload)
+            else:
+                data = json.dumps(_payload, separators=(",", ":")).encode()
+
+        # Write aside and rename so readers never see a half-written file
+        STATUS_FILE.parent.mkdir(exist_ok=True)
+        _TMP_FILE.write_bytes(data)
+        os.replace(_TMP_FILE, STATUS_FILE)
+
+
+def _flush_loop() -> None:
+    while True:
+        _dirty.wait()
+        try:
+            flush_status()
+        except OSError as e:
+            print(f"⚠️  Status write failed: {e}")
+        time.sleep(1 / FLUSH_HZ)
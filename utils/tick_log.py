@@ -0,0 +1,59 @@
+"""
+Bounded, non-blocking tick logger for the live loops.
+
+log() only enqueues the raw values; a daemon thread formats and writes
+them, so a slow terminal or a redirected log never stalls the tick loop.
+When the queue is full the line is dropped and counted instead of
+blocking.
+"""
+
+import queue
+import sys
+import threading
+from typing import Any, Callable, Optional, TextIO
+
+
+class TickLogger:
+    """
+    Usage:
+        tick_log = TickLogger(lambda now, price: f"{now} | PRICE={price:.2f}")
+        tick_log.log(now, price)
+    """
+
+    def __init__(
+        self,
+        fmt: Callable[..., str],
+        stream: Optional[TextIO] = None,
+        maxsize: int = 1024
+    ):
+        self.fmt = fmt
+        self.stream = stream or sys.stdout
+        self.dropped = 0
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue(maxsize=maxsize)
+        self._thread = threading.Thread(target=self._drain, name="tick-log", daemon=True)
+        self._thread.start()
+
+    def log(self, *values: Any) -> None:
+        """Queue one line's values (formatting happens on the drain thread)"""
+        try:
+            self._queue.put_nowait(values)
+        except queue.Full:
+            self.dropped += 1
+
+    def _drain(self) -> None:
+        while True:
+            values = self._queue.get()
+            if values is None:
+                break
+            try:
+                self.stream.write(self.fmt(*values) + "\n")
+                # Flush once per burst rather than once per line
+                if self._queue.empty():
+                    self.stream.flush()
+            except Exception as e:
+                print(f"⚠️  Tick log error: {e}")
+
+    def close(self) -> None:
+        """Write out queued lines and stop the drain thread"""
+        self._queue.put(None)
+        self._thread.join()
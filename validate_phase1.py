@@ -12,6 +12,161 @@ from core.strategy import TradingStrategy
 from core.risk_manager import RiskManager
 import pandas as pd
 import numpy as np
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from core import _fast
+
+try:
+    from nur_fast import simulate_signals  # AOT build (python build_aot.py)
+except ImportError:
+    from core._fast import simulate_signals, NUMBA_AVAILABLE
+    
+    if not NUMBA_AVAILABLE:
+        def simulate_signals(close, sig_idx, sig_dir, stop_loss, take_profit, max_hold):
+            """Vectorized first-hit scan per trade (the kernel's loops would run in Python)."""
+            m = len(sig_idx)
+            exit_idx = np.full(m, -1, dtype=np.int64)
+            codes = np.zeros(m, dtype=np.int8)
+            exit_price = np.full(m, np.nan)
+            for k, (i, d) in enumerate(zip(sig_idx.tolist(), sig_dir.tolist())):
+                window = close[i + 1:min(i + max_hold, len(close))]
+                sl_hit = (window <= stop_loss[k]) if d == 1 else (window >= stop_loss[k])
+                tp_hit = (window >= take_profit[k]) if d == 1 else (window <= take_profit[k])
+                hit = sl_hit | tp_hit
+                if not hit.any():
+                    continue
+                j = int(np.argmax(hit))
+                exit_idx[k] = i + 1 + j
+                if sl_hit[j]:
+                    codes[k], exit_price[k] = _fast.EXIT_SL, stop_loss[k]
+                else:
+                    codes[k], exit_price[k] = _fast.EXIT_TP, take_profit[k]
+            return exit_idx, codes, exit_price
+
+DATA_PATH = "data/historical_xauusd_m1.csv"
+
+# Defaults for simulate_window (matches the Test 5 simulation)
+SIM_PARAMS = {
+    'max_signals': 50,  # First N signals per window (None = all)
+    'max_hold': 100,
+    'risk_reward': 1.5,
+    'position_size': 0.01,
+    'balance': 10000.0,
+}
+
+
+def simulate_window(closes_arr, ema_arr, lows_arr, highs_arr, start, end, params=None):
+    """
+    Signal + SL/TP simulation over candles [start, end).
+    
+    Pure function of NumPy arrays so it can run in a worker process.
+    Exits are searched up to params['max_hold'] candles past each entry,
+    even beyond `end`; SL is resolved first on the exit candle.
+    
+    Returns:
+        Dict with signals, trades, wins, losses, gross_profit, gross_loss, balance
+    """
+    p = dict(SIM_PARAMS, **(params or {}))
+    
+    # Candle i needs candle i-1, so the slice starts one bar early
+    lo = max(start - 1, 0)
+    sig = TradingStrategy.signals_vectorized(closes_arr[lo:end], ema_arr[lo:end])
+    idx = lo + np.flatnonzero(sig[start - lo:]) + (start - lo)
+    n_signals = len(idx)
+    idx = idx[:p['max_signals']]
+    
+    directions = sig[idx - lo]
+    entries = closes_arr[idx]
+    sl = RiskManager.calculate_stop_loss_batch(directions, entries, lows_arr[idx - 1], highs_arr[idx - 1])
+    tp = RiskManager.calculate_take_profit_batch(directions, entries, sl, p['risk_reward'])
+    
+    exit_idx, codes, exit_price = simulate_signals(
+        closes_arr, idx.astype(np.int64), directions.astype(np.int64),
+        sl, tp, p['max_hold']
+    )
+    
+    done = exit_idx >= 0
+    wins = int(np.count_nonzero(codes == _fast.EXIT_TP))
+    losses = int(np.count_nonzero(codes == _fast.EXIT_SL))
+    pnl = (exit_price[done] - entries[done]) * directions[done] * p['position_size'] * 100
+    gross_profit = float(pnl[pnl > 0].sum())
+    gross_loss = float(-pnl[pnl <= 0].sum())
+    
+    return {
+        'start': start,
+        'end': end,
+        'signals': n_signals,
+        'trades': wins + losses,
+        'wins': wins,
+        'losses': losses,
+        'gross_profit': gross_profit,
+        'gross_loss': gross_loss,
+        'balance': p['balance'] + gross_profit - gross_loss,
+    }
+
+
+# (close, ema, low, high) float64 arrays loaded once per worker process
+# (see _init_worker)
+_arrays = None
+
+
+def _init_worker(data_path):
+    """Pool initializer: load the data once; every window in this worker reuses it"""
+    global _arrays
+    market = MT5MarketData(data_path, verbose=False)
+    if market.load_data() and market.calculate_ema_mt5():
+        _arrays = tuple(market.as_arrays()[col] for col in ('close', 'ema_200', 'low', 'high'))
+
+
+def _run_window(start, end, params):
+    """simulate_window on the worker's arrays (None if data failed to load)"""
+    if _arrays is None:
+        return None
+    return simulate_window(*_arrays, start, end, params)
+
+
+def run_windows_parallel(windows, data_path=DATA_PATH, params=None, max_workers=None):
+    """
+    Run simulate_window over many (start, end) windows in worker processes.
+    
+    Each worker loads data_path once (mapping the binary cache if one was
+    written with MT5MarketData.write_bin); tasks only carry their window.
+    
+    Args:
+        windows: List of (start, end) candle ranges
+        data_path: MT5 CSV export to simulate on
+        params: simulate_window parameter overrides
+        max_workers: Pool size (default: os.cpu_count())
+        
+    Returns:
+        Tuple of (per-window stats list, aggregate stats dict)
+    """
+    starts = [w[0] for w in windows]
+    ends = [w[1] for w in windows]
+    # Spawned workers (the Windows default everywhere): forking after numba's
+    # parallel thread pool has started can deadlock
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=ctx,
+                             initializer=_init_worker, initargs=(data_path,)) as pool:
+        results = [r for r in pool.map(_run_window, starts, ends, repeat(params)) if r is not None]
+    
+    wins = sum(r['wins'] for r in results)
+    trades = sum(r['trades'] for r in results)
+    gross_profit = sum(r['gross_profit'] for r in results)
+    gross_loss = sum(r['gross_loss'] for r in results)
+    aggregate = {
+        'windows': len(results),
+        'trades': trades,
+        'wins': wins,
+        'losses': trades - wins,
+        'win_rate': (wins / trades * 100) if trades else 0.0,
+        'profit_factor': (gross_profit / gross_loss) if gross_loss > 0 else float('inf'),
+        'net_profit': gross_profit - gross_loss,
+    }
+    return results, aggregate
+
 
 def comprehensive_validation():
     """Run comprehensive validation of all components"""
@@ -24,8 +179,7 @@ def comprehensive_validation():
     print("\n1. 📊 DATA SYSTEM VALIDATION")
     print("-" * 40)
     
-    data_path = "data/historical_xauusd_m1.csv"
-    market = MT5MarketData(data_path)
+    market = MT5MarketData(DATA_PATH)
     
     if not market.load_data():
         print("❌ FAILED: Cannot load data")
@@ -121,24 +275,15 @@ def comprehensive_validation():
     print("\n4. 📈 REAL DATA VALIDATION")
     print("-" * 40)
     
-    # Test on 1000 candles of real data
-    signals = []
+    # Test on 1000 candles of real data (one vectorized pass over the
+    # market's column arrays; candle i also needs candle i-1)
     start_idx = 200
     end_idx = 1200
     
-    for i in range(start_idx, end_idx):
-        current = market.get_candle(i)
-        previous = market.get_candle(i-1)
-        
-        signal = strategy.get_signal(current, previous)
-        if signal != 'HOLD':
-            signals.append({
-                'index': i,
-                'timestamp': current['timestamp'],
-                'signal': signal,
-                'price': current['close'],
-                'ema': current['ema_200']
-            })
+    sig = TradingStrategy.signals_vectorized(
+        market.close[start_idx - 1:end_idx], market.ema_200[start_idx - 1:end_idx]
+    )[1:]
+    signals = np.flatnonzero(sig) + start_idx
     
     print(f"Found {len(signals)} signals in {end_idx-start_idx} candles")
     
@@ -154,66 +299,14 @@ def comprehensive_validation():
     print("\n5. 💰 PROFITABILITY SIMULATION")
     print("-" * 40)
     
-    # Simple simulation
-    balance = 10000.0
-    position_size = 0.01
-    trade_count = 0
-    win_count = 0
-    loss_count = 0
-    
     print("Running simple simulation on first 50 signals...")
     
-    for i, sig in enumerate(signals[:50]):
-        current = market.get_candle(sig['index'])
-        previous = market.get_candle(sig['index']-1)
-        
-        # Get SL/TP
-        sl = rm.calculate_stop_loss(sig['signal'], sig['price'], previous)
-        tp = rm.calculate_take_profit(sig['signal'], sig['price'], sl, risk_reward=1.5)
-        
-        # Find exit (next time price hits SL or TP)
-        exit_found = False
-        exit_price = sig['price']
-        exit_reason = "No exit found"
-        
-        for j in range(sig['index']+1, min(sig['index']+100, len(df))):
-            price = market.get_candle(j)['close']
-            
-            if sig['signal'] == 'BUY':
-                if price <= sl:
-                    exit_price = sl
-                    exit_reason = "SL"
-                    loss_count += 1
-                    exit_found = True
-                    break
-                elif price >= tp:
-                    exit_price = tp
-                    exit_reason = "TP"
-                    win_count += 1
-                    exit_found = True
-                    break
-            else:  # SELL
-                if price >= sl:
-                    exit_price = sl
-                    exit_reason = "SL"
-                    loss_count += 1
-                    exit_found = True
-                    break
-                elif price <= tp:
-                    exit_price = tp
-                    exit_reason = "TP"
-                    win_count += 1
-                    exit_found = True
-                    break
-        
-        if exit_found:
-            trade_count += 1
-            if sig['signal'] == 'BUY':
-                pnl = (exit_price - sig['price']) * position_size * 100
-            else:
-                pnl = (sig['price'] - exit_price) * position_size * 100
-            
-            balance += pnl
+    arrays = tuple(market.as_arrays()[col] for col in ('close', 'ema_200', 'low', 'high'))
+    stats = simulate_window(*arrays, start_idx, end_idx, SIM_PARAMS)
+    trade_count = stats['trades']
+    win_count = stats['wins']
+    loss_count = stats['losses']
+    balance = stats['balance']
     
     if trade_count > 0:
         win_rate = (win_count / trade_count) * 100
@@ -267,6 +360,17 @@ if __name__ == "__main__":
         print("\n" + "="*70)
         print("✅ PHASE 1 COMPLETE AND VALIDATED")
         print("="*70)
+        
+        # Walk-forward check: same simulation over the whole file, windows
+        # spread over workers, every signal in each window simulated
+        market = MT5MarketData(DATA_PATH)
+        if market.load_data() and market.calculate_ema_mt5():
+            n = market.get_candle_count()
+            windows = [(s, min(s + 5000, n)) for s in range(200, n, 5000)]
+            _, agg = run_windows_parallel(windows, params={'max_signals': None})
+            print(f"\n📊 {agg['windows']} windows (all signals): {agg['trades']} trades, "
+                  f"Win Rate {agg['win_rate']:.1f}%, Profit Factor {agg['profit_factor']:.2f}, "
+                  f"Net ${agg['net_profit']:.2f}")
     else:
         print("\n" + "="*70)
         print("❌ PHASE 1 NEEDS FIXES BEFORE CONTINUING")
@@ -3,8 +3,14 @@
 Verify the synthetic data matches MT5 format and structure.
 """
 
-import pandas as pd
+import csv
+import math
 import os
+from datetime import datetime
+from itertools import islice
+
+COLUMNS = ['timestamp', 'open', 'high', 'low', 'close', 'tick_vol', 'real_vol', 'spread']
+
 
 def verify_mt5_format():
     """Verify the CSV is in correct MT5 format"""
@@ -15,68 +21,128 @@ def verify_mt5_format():
         print("❌ File not found:", filepath)
         return
     
-    # Read the file to check format
-    with open(filepath, 'r') as f:
-        lines = f.readlines()
+    with open(filepath, 'r', newline='') as f:
+        # Show first 3 lines
+        head = list(islice(f, 3))
+        f.seek(0)
+        
+        try:
+            stats = _scan_rows(csv.reader(f, delimiter=';'))
+            n_lines, error = stats['lines'], None
+        except Exception as e:
+            stats, error = None, e
+            f.seek(0)
+            n_lines = sum(1 for _ in f)
     
     print("📄 File Structure Verification")
     print("=" * 50)
     print(f"File: {filepath}")
     print(f"Size: {os.path.getsize(filepath) / 1024:.1f} KB")
-    print(f"Lines: {len(lines)}")
+    print(f"Lines: {n_lines}")
     
-    # Show first 3 lines
     print("\nFirst 3 lines of file:")
-    for i in range(min(3, len(lines))):
-        print(f"  {i+1}: {lines[i].strip()}")
-    
-    # Try to load with pandas
-    try:
-        df = pd.read_csv(filepath, delimiter=';', skiprows=1,
-                        names=['timestamp', 'open', 'high', 'low', 'close', 
-                               'tick_vol', 'real_vol', 'spread'])
-        
-        print("\n✅ Successfully parsed as MT5 format")
-        print(f"   Candles: {len(df)}")
-        print(f"   Columns: {list(df.columns)}")
-        
-        # Check data ranges
-        print("\n📊 Data Ranges:")
-        print(f"   Timestamp range: {df['timestamp'].iloc[0]} to {df['timestamp'].iloc[-1]}")
-        print(f"   Price range: ${df['low'].min():.2f} - ${df['high'].max():.2f}")
-        print(f"   Average spread: {df['spread'].mean():.1f}")
-        
-        # Check for any issues
-        print("\n🔍 Data Quality Check:")
-        
-        # Check for NaN values
-        nan_count = df.isna().sum().sum()
-        if nan_count == 0:
-            print("   ✅ No NaN values found")
-        else:
-            print(f"   ⚠️  Found {nan_count} NaN values")
-        
-        # Check for zero or negative prices
-        invalid_prices = df[(df['open'] <= 0) | (df['high'] <= 0) | 
-                           (df['low'] <= 0) | (df['close'] <= 0)]
-        if len(invalid_prices) == 0:
-            print("   ✅ All prices are positive")
-        else:
-            print(f"   ⚠️  Found {len(invalid_prices)} invalid prices")
+    for i, line in enumerate(head):
+        print(f"  {i+1}: {line.strip()}")
+    
+    if stats is None:
+        print(f"\n❌ Failed to parse file: {error}")
+        return False
+    
+    print("\n✅ Successfully parsed as MT5 format")
+    print(f"   Candles: {stats['candles']}")
+    print(f"   Columns: {COLUMNS}")
+    
+    # Check data ranges
+    print("\n📊 Data Ranges:")
+    print(f"   Timestamp range: {stats['first_ts']} to {stats['last_ts']}")
+    print(f"   Price range: ${stats['min_low']:.2f} - ${stats['max_high']:.2f}")
+    print(f"   Average spread: {stats['avg_spread']:.1f}")
+    
+    # Check for any issues
+    print("\n🔍 Data Quality Check:")
+    
+    if stats['nan_count'] == 0:
+        print("   ✅ No NaN values found")
+    else:
+        print(f"   ⚠️  Found {stats['nan_count']} NaN values")
+    
+    if stats['invalid_prices'] == 0:
+        print("   ✅ All prices are positive")
+    else:
+        print(f"   ⚠️  Found {stats['invalid_prices']} invalid prices")
+    
+    if stats['is_sorted']:
+        print("   ✅ Timestamps are in chronological order")
+    else:
+        print("   ⚠️  Timestamps are not sorted")
+    
+    return True
+
+
+def _scan_rows(reader):
+    """
+    One streaming pass over the candle rows with running counters.
+    
+    Memory stays constant however large the export is. Missing fields
+    count as NaN; NaN prices are skipped by the min/max/<= 0 checks.
+    
+    Returns:
+        Dictionary of counters and ranges for verify_mt5_format
+    """
+    next(reader, None)  # header line
+    
+    candles = nan_count = invalid_prices = spread_count = 0
+    spread_sum = 0.0
+    min_low, max_high = math.inf, -math.inf
+    first_ts = last_ts = None
+    prev_dt = None
+    is_sorted = True
+    
+    for row in reader:
+        if not row:
+            continue  # blank line
+        candles += 1
+        row += [''] * (len(COLUMNS) - len(row))
         
-        # Check chronological order
-        timestamps = pd.to_datetime(df['timestamp'].str.strip('"'), format='%Y.%m.%d %H:%M')
-        is_sorted = all(timestamps[i] <= timestamps[i+1] for i in range(len(timestamps)-1))
-        if is_sorted:
-            print("   ✅ Timestamps are in chronological order")
+        ts = row[0]
+        if ts == '':
+            nan_count += 1
+            is_sorted = False
         else:
-            print("   ⚠️  Timestamps are not sorted")
+            if first_ts is None:
+                first_ts = ts
+            last_ts = ts
+            dt = datetime.strptime(ts, '%Y.%m.%d %H:%M')
+            if prev_dt is not None and dt < prev_dt:
+                is_sorted = False
+            prev_dt = dt
         
-        return True
+        values = [float(v) if v != '' else math.nan for v in row[1:len(COLUMNS)]]
+        nan_count += sum(1 for v in values if v != v)
         
-    except Exception as e:
-        print(f"\n❌ Failed to parse file: {e}")
-        return False
+        open_, high, low, close, _, _, spread = values
+        if open_ <= 0 or high <= 0 or low <= 0 or close <= 0:
+            invalid_prices += 1
+        if low < min_low:
+            min_low = low
+        if high > max_high:
+            max_high = high
+        if spread == spread:
+            spread_sum += spread
+            spread_count += 1
+    
+    return {
+        'lines': reader.line_num,
+        'candles': candles,
+        'first_ts': first_ts,
+        'last_ts': last_ts,
+        'min_low': min_low,
+        'max_high': max_high,
+        'avg_spread': spread_sum / spread_count if spread_count else math.nan,
+        'nan_count': nan_count,
+        'invalid_prices': invalid_prices,
+        'is_sorted': is_sorted,
+    }
 
 if __name__ == "__main__":
     verify_mt5_format()